@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["kind", "status", "owner", "attempts", "progress_done", "progress_total", "created_at", "finished_at"]
+    list_filter = ["status", "kind"]
+    list_select_related = ["owner"]
+    search_fields = ["kind", "owner__email"]
@@ -0,0 +1,33 @@
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.worker import run_pool, work
+from apps.tasks import cache as list_cache
+from task_manager import caching
+
+
+class Command(BaseCommand):
+    help = "Run background jobs. Stops after the running jobs finish on SIGINT/SIGTERM."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, help="Worker processes (default: JOBS_WORKER_PROCESSES)")
+        parser.add_argument("--poll-interval", type=float, help="Seconds between polls when idle (default: JOBS_POLL_INTERVAL)")
+        parser.add_argument("--once", action="store_true", help="Run the runnable jobs in this process, then exit")
+
+    def handle(self, *args, **options):
+        if list_cache.is_enabled() and not caching.is_shared():
+            # Jobs change tasks; their page invalidations must reach the web workers.
+            raise CommandError(
+                "The task list page cache is on, but the default cache is local to each process, so "
+                "web workers would keep serving pages from before a job. Set REDIS_URL or TASK_LIST_CACHE_TIMEOUT=0."
+            )
+        poll_interval = options["poll_interval"] or settings.JOBS_POLL_INTERVAL
+        if options["once"]:
+            count = work(threading.Event(), once=True)
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} job(s)."))
+            return
+        processes = options["processes"] or settings.JOBS_WORKER_PROCESSES
+        self.stdout.write(f"Running jobs with {processes} process(es); Ctrl-C to stop.")
+        run_pool(processes, poll_interval)
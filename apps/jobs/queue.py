@@ -0,0 +1,124 @@
+"""
+A small database-backed job queue.
+
+Handlers are registered by name with `@register("app.action")` and receive
+a `JobContext` plus the job's JSON payload as keyword arguments. Whatever
+they return (JSON-serializable) becomes `Job.result`. `enqueue()` inserts a
+row in the caller's transaction, so a worker never sees a job whose request
+rolled back.
+
+Workers (`manage.py run_jobs`) claim a job with a conditional UPDATE, so two
+workers never run the same job. This needs no row locking and works on every
+backend. A claimed job holds a lease. `JobContext.progress()` renews the
+lease, and a worker that dies leaves it to expire, after which the job is
+claimed again. A handler that raises is retried with exponential backoff
+until `max_attempts` is used up. Handlers must therefore be safe to re-run.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+_handlers = {}
+
+
+def register(kind):
+    """Decorator: make a function the handler for jobs of `kind`."""
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def get_handler(kind):
+    return _handlers.get(kind)
+
+
+def enqueue(kind, owner_id=None, max_attempts=None, **payload):
+    if kind not in _handlers:
+        raise LookupError(f"No job handler registered for {kind!r}")
+    return Job.objects.create(
+        kind=kind,
+        owner_id=owner_id,
+        payload=payload,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+class JobContext:
+    def __init__(self, job):
+        self.job = job
+
+    def progress(self, done, total=None):
+        """Record progress and renew the lease; call it at least once per JOBS_LEASE_SECONDS."""
+        fields = {"progress_done": done, "lease_expires_at": lease_expiry()}
+        if total is not None:
+            fields["progress_total"] = total
+        Job.objects.filter(pk=self.job.pk, worker=self.job.worker).update(**fields)
+
+
+def lease_expiry():
+    return timezone.now() + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+
+
+def claimable(now):
+    return Q(status=Job.QUEUED, run_after__lte=now) | Q(status=Job.RUNNING, lease_expires_at__lt=now)
+
+
+def claim(worker, candidates=10):
+    """Take the oldest runnable job for `worker`, or return None."""
+    now = timezone.now()
+    for pk in Job.objects.filter(claimable(now)).order_by("run_after", "pk").values_list("pk", flat=True)[:candidates]:
+        claimed = Job.objects.filter(claimable(now), pk=pk).update(
+            status=Job.RUNNING,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            lease_expires_at=lease_expiry(),
+            worker=worker,
+        )
+        if not claimed:
+            # Another worker got there first.
+            continue
+        job = Job.objects.get(pk=pk)
+        if job.attempts > job.max_attempts:
+            # Reclaimed after its worker died on the last attempt.
+            finish(job, Job.FAILED, error="Worker lost while running the job.")
+            continue
+        return job
+    return None
+
+
+def finish(job, status, result=None, error=""):
+    Job.objects.filter(pk=job.pk, worker=job.worker).update(
+        status=status, result=result, error=error, finished_at=timezone.now(), lease_expires_at=None
+    )
+
+
+def retry_or_fail(job, error):
+    if job.attempts < job.max_attempts:
+        delay = settings.JOBS_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+        Job.objects.filter(pk=job.pk, worker=job.worker).update(
+            status=Job.QUEUED,
+            error=error,
+            run_after=timezone.now() + timedelta(seconds=delay),
+            lease_expires_at=None,
+        )
+    else:
+        finish(job, Job.FAILED, error=error)
+
+
+def run(job):
+    """Run a claimed job to completion, recording its result, a retry, or its failure."""
+    handler = get_handler(job.kind)
+    if handler is None:
+        finish(job, Job.FAILED, error=f"No handler registered for {job.kind!r}.")
+        return
+    try:
+        result = handler(JobContext(job), **job.payload)
+    except Exception as exc:
+        retry_or_fail(job, f"{type(exc).__name__}: {exc}")
+        raise
+    finish(job, Job.SUCCEEDED, result=result)
@@ -0,0 +1,23 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id", "kind", "status", "attempts", "max_attempts", "progress", "result", "error",
+            "created_at", "started_at", "finished_at", "url",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, job):
+        return {"done": job.progress_done, "total": job.progress_total}
+
+    def get_url(self, job):
+        return reverse("job-detail", args=[job.pk])
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import JobDetailView, JobListView, JobResultView
+
+urlpatterns = [
+    path("jobs/", JobListView.as_view(), name="job-list"),
+    path("jobs/<int:pk>/", JobDetailView.as_view(), name="job-detail"),
+    path("jobs/<int:pk>/result/", JobResultView.as_view(), name="job-result"),
+]
@@ -0,0 +1,76 @@
+import os
+
+from django.conf import settings
+from django.http import FileResponse
+from rest_framework import generics, status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+
+from apps.tasks.permissions import IsOwnerOrAdmin
+from .models import Job
+from .serializers import JobSerializer
+
+
+def accepted(job):
+    """202 response for an operation handed to a background job; poll `Location` for its status."""
+    data = JobSerializer(job).data
+    return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": data["url"]})
+
+
+class JobQuerysetMixin:
+    """Admins see every job; regular users only the jobs they started."""
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == "admin":
+            return Job.objects.all()
+        return Job.objects.filter(owner_id=user.pk)
+
+
+class JobListView(JobQuerysetMixin, generics.ListAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="List your background jobs, newest first. Admins see every job.",
+        responses={200: JobSerializer(many=True)},
+        tags=["Jobs"],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class JobDetailView(JobQuerysetMixin, generics.RetrieveAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Status and progress of a background job: `queued`, `running`, `succeeded` (see `result`) or `failed` (see `error`).",
+        responses={200: JobSerializer, 404: "Not Found"},
+        tags=["Jobs"],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class JobResultView(JobQuerysetMixin, generics.GenericAPIView):
+    """Download the file written by a finished job (e.g. a task export)."""
+
+    permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Download the file produced by a succeeded job, such as an export.",
+        responses={200: "The file", 404: "Not Found", 409: "The job has not succeeded"},
+        tags=["Jobs"],
+    )
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != Job.SUCCEEDED:
+            return Response({"detail": f"Job is {job.status}."}, status=status.HTTP_409_CONFLICT)
+        name = (job.result or {}).get("file")
+        path = os.path.join(settings.JOB_RESULT_DIR, name) if name else None
+        if not path or not os.path.exists(path):
+            raise NotFound("This job has no result file.")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=name, content_type=job.result.get("content_type"))
@@ -0,0 +1,81 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+
+from django.db import close_old_connections, connections
+
+from . import queue
+
+logger = logging.getLogger(__name__)
+
+
+def work(stop, once=False, poll_interval=1.0):
+    """
+    Claim and run jobs until `stop` is set or, with `once`, until none are
+    runnable. Returns the number of jobs run.
+    """
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    count = 0
+    while not stop.is_set():
+        close_old_connections()
+        job = queue.claim(name)
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+        try:
+            queue.run(job)
+        except Exception:
+            logger.exception("Job %s (%s) failed on attempt %s of %s", job.pk, job.kind, job.attempts, job.max_attempts)
+        count += 1
+    return count
+
+
+def _child(stop, poll_interval):
+    # The parent turns Ctrl-C / SIGTERM into `stop`, so a running job gets to finish.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    work(stop, poll_interval=poll_interval)
+
+
+def run_pool(processes, poll_interval=1.0):
+    """
+    Run `processes` forked worker processes until SIGINT/SIGTERM, replacing
+    any that die. A job lost with a dead worker is claimed again when its
+    lease expires.
+    """
+    if processes <= 1:
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        work(stop, poll_interval=poll_interval)
+        return
+
+    # Forked children inherit the loaded project; they must not share the parent's sockets.
+    context = multiprocessing.get_context("fork")
+    stop = context.Event()
+    connections.close_all()
+
+    def start():
+        process = context.Process(target=_child, args=(stop, poll_interval), daemon=True)
+        process.start()
+        return process
+
+    # Setting a multiprocessing Event takes a semaphore, which can deadlock inside
+    # a signal handler; the handler only flips a local flag.
+    stopping = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *args: stopping.set())
+    children = [start() for _ in range(processes)]
+    while not stopping.wait(poll_interval):
+        for index, process in enumerate(children):
+            if not process.is_alive():
+                logger.warning("Job worker %s exited with %s; starting a replacement", process.pid, process.exitcode)
+                children[index] = start()
+    stop.set()
+    for process in children:
+        process.join()
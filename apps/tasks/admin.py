@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Task
+from .models import Task, TaskCounter, TaskDailyRollup
 
 
 @admin.register(Task)
@@ -7,3 +7,34 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ["title", "owner", "completed", "created_at"]
     list_filter = ["completed"]
     search_fields = ["title", "owner__email"]
+
+
+@admin.register(TaskCounter)
+class TaskCounterAdmin(admin.ModelAdmin):
+    """Read-only: the rows are written by database triggers (see `counters.py`)."""
+
+    list_display = ["owner", "open_count", "completed_count"]
+    list_select_related = ["owner"]
+    search_fields = ["owner__email"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TaskDailyRollup)
+class TaskDailyRollupAdmin(admin.ModelAdmin):
+    """Read-only: the rows are rebuilt from the tasks table (see `analytics.py`)."""
+
+    list_display = ["day", "owner", "created", "completed"]
+    list_select_related = ["owner"]
+    date_hierarchy = "day"
+    search_fields = ["owner__email"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,239 @@
+"""
+Per-day task rollups for the admin analytics endpoint.
+
+`TaskDailyRollup` holds, per owner and UTC day, the tasks created and
+completed and how long the completed ones took. A completed task counts on
+the day it was last updated. `refresh()` brings the rollups up to date
+incrementally. It recomputes every day that the tasks updated since the last
+refresh were created or last updated on. An insert or an edit both touch
+`updated_at`, so these cover the days a task now counts on. Writes that
+bypass `save()` must set `updated_at` themselves, as the bulk endpoints and
+jobs do.
+
+The days a task stops counting on are recorded by database triggers in
+`StaleRollupDay` (installed by migration 0008): its created day when it is
+deleted, and its old completion day when a completed task is deleted or
+updated on a later day. The refresh recomputes those too, so a completed task
+edited later moves to its new day instead of counting on both.
+
+Refreshes run in the background: the analytics endpoint queues the
+"tasks.refresh_rollups" job (see `jobs.py`) when the rollups are stale, and
+`manage.py backfill_task_rollups --incremental` does the same from cron.
+"""
+import datetime
+from datetime import timedelta
+
+from django.db import router, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import RollupWatermark, StaleRollupDay, Task, TaskDailyRollup
+
+WATERMARK = "tasks.daily"
+
+# Each refresh rescans this much before the last watermark. A transaction that
+# stamps updated_at before a refresh but commits after it is still picked up.
+# Recomputing a day is idempotent, so the overlap costs nothing but time.
+LATE_COMMIT_MARGIN = timedelta(minutes=1)
+
+# (rollup column, completed within). The last bucket is open-ended.
+COMPLETION_BUCKETS = (
+    ("completed_within_hour", timedelta(hours=1)),
+    ("completed_within_day", timedelta(days=1)),
+    ("completed_within_week", timedelta(weeks=1)),
+    ("completed_within_month", timedelta(days=30)),
+    ("completed_after_month", None),
+)
+COUNT_FIELDS = ("created", "completed", *(column for column, _ in COMPLETION_BUCKETS))
+
+
+def day_bounds(first, last):
+    """`[start, end)` datetimes covering the UTC days `first` through `last`."""
+    start = datetime.datetime.combine(first, datetime.time.min, tzinfo=datetime.timezone.utc)
+    end = datetime.datetime.combine(last + timedelta(days=1), datetime.time.min, tzinfo=datetime.timezone.utc)
+    return start, end
+
+
+def _completion_counts():
+    counts, lower = {"completed": Count("pk")}, None
+    for column, upper in COMPLETION_BUCKETS:
+        bucket = Q()
+        if lower is not None:
+            bucket &= Q(time_to_complete__gte=lower)
+        if upper is not None:
+            bucket &= Q(time_to_complete__lt=upper)
+        counts[column] = Count("pk", filter=bucket)
+        lower = upper
+    return counts
+
+
+def aggregate(first, last, using="default"):
+    """`{(day, owner_id): {count field: value}}` computed from the tasks table for days `first`..`last`."""
+    start, end = day_bounds(first, last)
+    tasks = Task.objects.using(using).order_by()
+    rows = {}
+
+    created = (
+        tasks.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(day=TruncDate("created_at", tzinfo=datetime.timezone.utc))
+        .values("day", "owner_id")
+        .annotate(created=Count("pk"))
+    )
+    for row in created:
+        rows.setdefault((row["day"], row["owner_id"]), dict.fromkeys(COUNT_FIELDS, 0))["created"] = row["created"]
+
+    completed = (
+        tasks.filter(completed=True, updated_at__gte=start, updated_at__lt=end)
+        .annotate(
+            day=TruncDate("updated_at", tzinfo=datetime.timezone.utc),
+            time_to_complete=ExpressionWrapper(F("updated_at") - F("created_at"), output_field=DurationField()),
+        )
+        .values("day", "owner_id")
+        .annotate(**_completion_counts())
+    )
+    for row in completed:
+        counts = rows.setdefault((row["day"], row["owner_id"]), dict.fromkeys(COUNT_FIELDS, 0))
+        counts.update({field: row[field] for field in COUNT_FIELDS if field != "created"})
+    return rows
+
+
+def rebuild_days(first, last, using="default"):
+    """Replace the rollup rows for days `first`..`last` with fresh counts; returns the number of rows written."""
+    rows = aggregate(first, last, using)
+    with transaction.atomic(using=using):
+        TaskDailyRollup.objects.using(using).filter(day__gte=first, day__lte=last).delete()
+        TaskDailyRollup.objects.using(using).bulk_create(
+            [TaskDailyRollup(day=day, owner_id=owner_id, **counts) for (day, owner_id), counts in rows.items()],
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+def changed_days(since, using="default"):
+    """The days that tasks updated after `since` were created or last updated on."""
+    changed = Task.objects.using(using).filter(updated_at__gt=since).order_by()
+    days = set()
+    for field in ("created_at", "updated_at"):
+        days.update(
+            changed.annotate(day=TruncDate(field, tzinfo=datetime.timezone.utc))
+            .values_list("day", flat=True)
+            .distinct()
+        )
+    return sorted(days)
+
+
+def stale_days(since, using="default"):
+    """The days marked stale by task deletes and moves after `since`."""
+    marked = StaleRollupDay.objects.using(using).filter(marked_at__gt=since).order_by()
+    return set(marked.values_list("day", flat=True).distinct())
+
+
+def _prune_stale_days(through, using, days=None):
+    # Marks older than the next refresh's rescan window have been handled.
+    marks = StaleRollupDay.objects.using(using).filter(marked_at__lte=through - LATE_COMMIT_MARGIN)
+    if days is not None:
+        marks = marks.filter(day__gte=days[0], day__lte=days[1])
+    marks.delete()
+
+
+def backfill(first=None, last=None, using="default"):
+    """
+    Rebuild the rollups for days `first`..`last` (default: every day with
+    tasks or rollups) and move the watermark to now. Returns the number of
+    rows written.
+    """
+    now = timezone.now()
+    today = now.astimezone(datetime.timezone.utc).date()
+    if first is None:
+        oldest = Task.objects.using(using).order_by("created_at").values_list("created_at", flat=True).first()
+        first = oldest.astimezone(datetime.timezone.utc).date() if oldest else today
+        # Days whose tasks are all gone still have rows to clear.
+        oldest_rollup = TaskDailyRollup.objects.using(using).order_by("day").values_list("day", flat=True).first()
+        first = min(first, oldest_rollup or first)
+    last = last or today
+    with transaction.atomic(using=using):
+        watermark = _lock_watermark(using)
+        written = rebuild_days(first, last, using)
+        _prune_stale_days(now, using, (first, last))
+        watermark.refreshed_through = now
+        watermark.save(using=using, update_fields=["refreshed_through"])
+    return written
+
+
+def refresh(using="default"):
+    """
+    Recompute the days touched since the last refresh and return them. The
+    first refresh is a full `backfill()`.
+    """
+    with transaction.atomic(using=using):
+        # Concurrent refreshes queue here; the later one finds little left to do.
+        watermark = _lock_watermark(using)
+        now = timezone.now()
+        if watermark.refreshed_through is None:
+            backfill(using=using)
+            return None
+        since = watermark.refreshed_through - LATE_COMMIT_MARGIN
+        days = sorted(set(changed_days(since, using)) | stale_days(since, using))
+        for day in days:
+            rebuild_days(day, day, using)
+        _prune_stale_days(now, using)
+        watermark.refreshed_through = now
+        watermark.save(using=using, update_fields=["refreshed_through"])
+    return days
+
+
+def _lock_watermark(using):
+    RollupWatermark.objects.using(using).get_or_create(name=WATERMARK)
+    return RollupWatermark.objects.using(using).select_for_update().get(name=WATERMARK)
+
+
+def refreshed_through(using=None):
+    using = using or router.db_for_read(RollupWatermark)
+    return RollupWatermark.objects.using(using).filter(name=WATERMARK).values_list("refreshed_through", flat=True).first()
+
+
+def is_stale(max_age, using="default"):
+    through = refreshed_through(using)
+    return through is None or timezone.now() - through >= timedelta(seconds=max_age)
+
+
+def report(first, last, users=50, using=None):
+    """
+    Read the rollups for days `first`..`last`: totals, one entry per day
+    (zeros included), the `users` owners with the most activity, and the
+    completion-time distribution.
+    """
+    using = using or router.db_for_read(TaskDailyRollup)
+    rollups = TaskDailyRollup.objects.using(using).filter(day__gte=first, day__lte=last).order_by()
+    sums = {field: Sum(field) for field in COUNT_FIELDS}
+
+    totals = {field: value or 0 for field, value in rollups.aggregate(**sums).items()}
+    by_day = {row["day"]: row for row in rollups.values("day").annotate(created=Sum("created"), completed=Sum("completed"))}
+    per_day = []
+    day = first
+    while day <= last:
+        row = by_day.get(day, {})
+        per_day.append({"day": day, "created": row.get("created", 0), "completed": row.get("completed", 0)})
+        day += timedelta(days=1)
+
+    per_user = list(
+        rollups.values("owner_id", "owner__email")
+        .annotate(created=Sum("created"), completed=Sum("completed"))
+        .order_by("-created", "-completed", "owner_id")[:users]
+    )
+    return {
+        "since": first,
+        "until": last,
+        "refreshed_through": refreshed_through(using),
+        "totals": {"created": totals["created"], "completed": totals["completed"]},
+        "per_day": per_day,
+        "per_user": [
+            {"owner_id": row["owner_id"], "owner": row["owner__email"], "created": row["created"], "completed": row["completed"]}
+            for row in per_user
+        ],
+        "completion_time": [
+            {"bucket": column.removeprefix("completed_"), "max_seconds": upper.total_seconds() if upper else None, "count": totals[column]}
+            for column, upper in COMPLETION_BUCKETS
+        ],
+    }
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.tasks"
+
+    def ready(self):
+        from task_manager.metrics import registry
+        from . import cache, jobs, signals  # noqa: F401
+
+        registry.register_collector(cache.metrics_lines)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .async_views import AsyncTaskListCreateView, AsyncTaskDetailView
+
+urlpatterns = [
+    path("tasks/", AsyncTaskListCreateView.as_view(), name="async-task-list-create"),
+    path("tasks/<int:pk>/", AsyncTaskDetailView.as_view(), name="async-task-detail"),
+]
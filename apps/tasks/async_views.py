@@ -0,0 +1,186 @@
+"""
+ASGI-native versions of the task list and detail endpoints (`/api/async/`).
+
+Authentication, permissions, filtering and rendering run on the event loop;
+only the queries themselves go through Django's async ORM (`aaggregate`, `afirst`,
+`async for`), instead of the whole request being handed to a worker thread.
+Filtering, ordering, search, page-number pagination, ETags and the response
+bodies (including `fields` and `compact`) match the DRF views; keyset
+pagination and the list page cache are only offered by the sync list.
+"""
+import math
+
+from asgiref.sync import sync_to_async
+from django.db import connections, transaction
+from django.utils.cache import get_conditional_response
+from rest_framework import exceptions, filters
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django_filters.rest_framework import DjangoFilterBackend
+
+from task_manager.async_api import AsyncAPIView
+from task_manager.routers import replica_reads
+from .conditional import alist_stats, list_etag, set_validators, task_validators
+from .models import Task
+from .pagination import TaskPagination
+from .permissions import IsOwnerOrAdmin
+from .search import TaskSearchFilter, sqlite_fts_available
+from .serializers import (
+    TASK_COLUMNS,
+    TASK_VALUE_FIELDS,
+    TaskSerializer,
+    compact_requested,
+    only_fields,
+    requested_fields,
+    task_representation,
+    task_rows_representation,
+    value_columns,
+)
+
+
+class AsyncTaskQuerysetMixin:
+    """Same visibility rules as `views.TaskQuerysetMixin`."""
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = Task.objects.select_related("owner")
+        if user.role == "admin":
+            return queryset
+        return queryset.filter(owner_id=user.pk)
+
+    async def aget_object(self, pk, fields=None):
+        task = await only_fields(self.get_queryset(), fields).filter(pk=pk).afirst()
+        if task is None:
+            raise exceptions.NotFound()
+        self.check_object_permissions(self.request, task)
+        return task
+
+
+class AsyncReplicaReadMixin:
+    """Async counterpart of `views.ReplicaReadMixin`."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            with replica_reads():
+                return await super().dispatch(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncTaskListCreateView(AsyncReplicaReadMixin, AsyncTaskQuerysetMixin, AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, filters.OrderingFilter]
+    filterset_fields = ["completed"]
+    search_fields = ["title", "description"]
+    ordering_fields = ["created_at", "updated_at"]
+    pagination = TaskPagination
+
+    async def filter_queryset(self, queryset):
+        if self.request.query_params.get("search"):
+            # The FTS probe is cached per alias; run it off the event loop once.
+            alias = queryset.db
+            await sync_to_async(lambda: connections[alias].vendor == "sqlite" and sqlite_fts_available(connections[alias]))()
+        # Filter backends only build the query; nothing is executed here.
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def get_page_size(self, request):
+        pagination = self.pagination
+        try:
+            page_size = int(request.query_params[pagination.page_size_query_param])
+        except (KeyError, ValueError):
+            return pagination.page_size
+        if page_size <= 0:
+            return pagination.page_size
+        return min(page_size, pagination.max_page_size)
+
+    async def get(self, request, *args, **kwargs):
+        fields, compact = requested_fields(request.query_params), compact_requested(request.query_params)
+        queryset = await self.filter_queryset(self.get_queryset())
+        stats = await alist_stats(queryset)
+        etag = list_etag(request, stats)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            # The ETag query already counted the rows; the page reuses it.
+            response = await self.get_page(request, queryset, stats["total"], fields, compact)
+        return set_validators(response, etag)
+
+    async def get_page(self, request, queryset, count, fields=None, compact=False):
+        page_size = self.get_page_size(request)
+        num_pages = max(1, math.ceil(count / page_size))
+        try:
+            page = int(request.query_params.get(self.pagination.page_query_param, 1))
+        except ValueError:
+            page = 0
+        if not 1 <= page <= num_pages:
+            raise exceptions.NotFound("Invalid page.")
+
+        offset = (page - 1) * page_size
+        rows = [row async for row in queryset.values(*value_columns(fields))[offset:offset + page_size]]
+        url = request.build_absolute_uri()
+        previous_link = None
+        if page > 1:
+            previous_link = remove_query_param(url, "page") if page == 2 else replace_query_param(url, "page", page - 1)
+        data = {
+            "count": count,
+            "next": replace_query_param(url, "page", page + 1) if page < num_pages else None,
+            "previous": previous_link,
+        }
+        if compact:
+            data["columns"] = list(fields or TASK_COLUMNS)
+        data["results"] = task_rows_representation(rows, fields, compact)
+        return self.respond(data)
+
+    async def post(self, request, *args, **kwargs):
+        serializer = TaskSerializer(data=self.get_data(request))
+        serializer.is_valid(raise_exception=True)
+        task = await Task.objects.acreate(owner_id=request.user.pk, **serializer.validated_data)
+        row = await Task.objects.values(*TASK_VALUE_FIELDS).aget(pk=task.pk)
+        return self.respond(task_rows_representation([row])[0], status=201)
+
+
+class AsyncTaskDetailView(AsyncReplicaReadMixin, AsyncTaskQuerysetMixin, AsyncAPIView):
+    """
+    Detail endpoint with the same ETag / conditional request handling as
+    `views.TaskDetailView`. Updates run in one worker thread: the async ORM
+    has no transactions, and the If-Match check must hold the row lock.
+    """
+
+    permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+
+    async def get(self, request, pk):
+        fields = requested_fields(request.query_params)
+        task = await self.aget_object(pk, fields)
+        etag, last_modified = task_validators(task, fields)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.respond(task_representation(task, fields))
+        return set_validators(response, etag, last_modified)
+
+    async def put(self, request, pk):
+        return await sync_to_async(self.update)(request, pk, self.get_data(request), partial=False)
+
+    async def patch(self, request, pk):
+        return await sync_to_async(self.update)(request, pk, self.get_data(request), partial=True)
+
+    def update(self, request, pk, data, partial):
+        queryset = self.get_queryset()
+        if "HTTP_IF_MATCH" in request.META:
+            queryset = queryset.select_for_update(of=("self",))
+        with transaction.atomic():
+            task = queryset.filter(pk=pk).first()
+            if task is None:
+                raise exceptions.NotFound()
+            self.check_object_permissions(request, task)
+            response = get_conditional_response(request, *task_validators(task))
+            if response is not None:
+                return response
+            serializer = TaskSerializer(task, data=data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return set_validators(self.respond(task_representation(task)), *task_validators(task))
+
+    async def delete(self, request, pk):
+        task = await self.aget_object(pk)
+        await task.adelete()
+        return self.respond(status=204)
@@ -0,0 +1,128 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db import transaction
+
+from task_manager import caching
+
+ADMIN_SCOPE = "admin"
+
+
+class CacheStats:
+    """Process-local hit/miss counters for the task list cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+stats = CacheStats()
+
+
+def metrics_lines():
+    """Prometheus exposition of `stats`; registered with the request metrics registry."""
+    snapshot = stats.snapshot()
+    lines = []
+    for name in ("hits", "misses"):
+        metric = f"task_list_cache_{name}_total"
+        lines += [f"# HELP {metric} Task list page cache {name}.", f"# TYPE {metric} counter", f"{metric} {snapshot[name]}"]
+    return lines
+
+
+def is_enabled():
+    return settings.TASK_LIST_CACHE_TIMEOUT > 0
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Pages cached per process outlive writes made by every other process."""
+    if is_enabled() and not caching.is_shared():
+        return [
+            checks.Warning(
+                "The task list page cache is on, but the default cache is local to each process. "
+                "Writes from other workers, jobs and commands will not invalidate its pages.",
+                hint="Set REDIS_URL, or TASK_LIST_CACHE_TIMEOUT=0.",
+                id="tasks.W001",
+            )
+        ]
+    return []
+
+
+def scope_for(user):
+    return ADMIN_SCOPE if user.role == "admin" else f"owner:{user.pk}"
+
+
+def generation_key(scope):
+    return f"tasks:list-gen:{scope}"
+
+
+def get_generation(scope):
+    key = generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses an old generation.
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(scope):
+    try:
+        cache.incr(generation_key(scope))
+    except ValueError:
+        get_generation(scope)
+
+
+def invalidate_owners(owner_ids):
+    """
+    Invalidate cached list pages for these owners and for admins.
+
+    Bumps once now and once after the surrounding transaction commits, so a
+    page rendered from pre-commit data under the new generation is orphaned.
+    """
+    scopes = {f"owner:{owner_id}" for owner_id in owner_ids} | {ADMIN_SCOPE}
+
+    def bump():
+        for scope in scopes:
+            bump_generation(scope)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def page_key(request):
+    """Cache key for a list page: caller scope, its current generation, host and normalized query."""
+    scope = scope_for(request.user)
+    params = sorted(request.query_params.lists())
+    digest = hashlib.md5(f"{request.get_host()}:{params}".encode("utf-8")).hexdigest()
+    return f"tasks:list:{scope}:{get_generation(scope)}:{digest}"
+
+
+def get_page(key):
+    page = cache.get(key)
+    stats.record(page is not None)
+    return page
+
+
+def set_page(key, etag, data):
+    cache.set(key, (etag, data), settings.TASK_LIST_CACHE_TIMEOUT)
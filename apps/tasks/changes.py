@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Task, TaskChange
+from .serializers import TASK_VALUE_FIELDS, task_rows_representation
+
+# Triggers (migration 0006) append a TaskChange row for every task insert, update
+# and delete (including bulk and queryset writes and cascades). Moving a task to
+# another owner also writes a tombstone for the previous owner, so it drops out of
+# that owner's feed.
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def format_token(position):
+    return "%d.%d" % position
+
+
+def parse_token(token):
+    """`"<transaction>.<id>"` -> `(transaction, id)`."""
+    try:
+        transaction_id, change_id = (int(part) for part in token.split("."))
+    except ValueError:
+        raise InvalidToken("Invalid sync token.")
+    if transaction_id < 0 or change_id < 0:
+        raise InvalidToken("Invalid sync token.")
+    return transaction_id, change_id
+
+
+def stable_changes(using):
+    """
+    Changes that can be handed out without a later commit landing before them.
+
+    Change ids are drawn when a row is written, not when its transaction
+    commits. SQLite runs one writer at a time, so ids follow commit order. On
+    PostgreSQL a transaction holding a lower id can commit after a higher
+    one has been read. So feed positions are `(transaction_id, id)`, and only
+    changes from transactions older than every running one are served.
+    """
+    queryset = TaskChange.objects.using(using)
+    if connections[using].vendor == "postgresql":
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+            horizon = cursor.fetchone()[0]
+        queryset = queryset.filter(transaction_id__lt=horizon)
+    return queryset
+
+
+def scoped(queryset, user, owner_field):
+    return queryset if user.role == "admin" else queryset.filter(**{owner_field: user.pk})
+
+
+def current_token(using=None):
+    using = using or router.db_for_read(TaskChange)
+    last = stable_changes(using).order_by("-transaction_id", "-id").values_list("transaction_id", "id").first()
+    return format_token(last or (0, 0))
+
+
+def changes_since(user, token, limit, using=None):
+    """
+    The tasks `user` can see that changed after `token`, as
+    `{"sync_token", "has_more", "changes", "deleted"}`.
+
+    Each touched task is reported once with its current state: in `changes`
+    if the user can still see it, otherwise its id is in `deleted`.
+    """
+    using = using or router.db_for_read(TaskChange)
+    transaction_id, change_id = parse_token(token)
+    entries = list(
+        scoped(stable_changes(using), user, "owner_id")
+        .filter(Q(transaction_id__gt=transaction_id) | Q(transaction_id=transaction_id, id__gt=change_id))
+        .order_by("transaction_id", "id")
+        .values_list("transaction_id", "id", "task_id")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return {"sync_token": token, "has_more": False, "changes": [], "deleted": []}
+
+    task_ids = list(dict.fromkeys(task_id for _, _, task_id in entries))
+    rows = (
+        scoped(Task.objects.using(using), user, "owner_id")
+        .filter(pk__in=task_ids)
+        .order_by("pk")
+        .values(*TASK_VALUE_FIELDS)
+    )
+    changes = task_rows_representation(rows)
+    present = {task["id"] for task in changes}
+    return {
+        "sync_token": format_token(entries[-1][:2]),
+        "has_more": has_more,
+        "changes": changes,
+        "deleted": [task_id for task_id in task_ids if task_id not in present],
+    }
+
+
+def compact(using="default"):
+    """Delete entries superseded by a later entry for the same task and owner; returns the count."""
+    later = TaskChange.objects.using(using).filter(
+        Q(transaction_id__gt=OuterRef("transaction_id")) | Q(transaction_id=OuterRef("transaction_id"), id__gt=OuterRef("id")),
+        task_id=OuterRef("task_id"),
+        owner_id=OuterRef("owner_id"),
+    )
+    deleted, _ = TaskChange.objects.using(using).filter(Exists(later)).delete()
+    return deleted
+
+
+def page_size(requested=None):
+    limit = settings.TASK_CHANGES_PAGE_SIZE
+    return min(requested, limit) if requested else limit
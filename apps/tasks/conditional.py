@@ -0,0 +1,71 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .serializers import TASK_COLUMNS
+
+
+def task_validators(task, fields=None):
+    """
+    ETag and Last-Modified (epoch seconds) for a single task, derived from `updated_at`.
+
+    The ETag is strong, so If-Match on writes can compare it. A sparse
+    `fields` representation is a different body and gets its own tag;
+    writes always compare against the full one.
+    """
+    etag = f"{task.pk}.{int(task.updated_at.timestamp() * 1_000_000)}"
+    if fields is not None and len(fields) < len(TASK_COLUMNS):
+        # Not commas: If-None-Match parsing splits on them.
+        etag = f"{etag}.{'+'.join(fields)}"
+    return quote_etag(etag), int(task.updated_at.timestamp())
+
+
+def list_stats(queryset):
+    """`MAX(updated_at)` and `COUNT(*)` of a filtered task list, in one query."""
+    return queryset.order_by().aggregate(last=Max("updated_at"), total=Count("pk"))
+
+
+async def alist_stats(queryset):
+    """Async version of `list_stats`."""
+    return await queryset.order_by().aaggregate(last=Max("updated_at"), total=Count("pk"))
+
+
+def list_etag(request, stats):
+    """
+    Weak ETag for a filtered task list, from its `list_stats`.
+
+    Creating or updating a task moves the max timestamp and deleting one
+    changes the count, so any write to the visible set changes the tag. The
+    caller's identity and query string are mixed in because the same numbers
+    render differently for other users or pages.
+    """
+    last = stats["last"].timestamp() if stats["last"] else 0
+    return _etag(request, f"{last}:{stats['total']}")
+
+
+def page_etag(request, rows, has_next, has_previous):
+    """
+    Weak ETag for one keyset page, from the `id` and `updated_at` of its rows.
+
+    A cursor page never counts the whole list, so the tag only covers what
+    the page shows: its rows, their versions and whether it links onwards.
+    """
+    versions = ",".join(f"{row['id']}.{row['updated_at'].timestamp()}" for row in rows)
+    return _etag(request, f"{versions}:{has_next:d}{has_previous:d}")
+
+
+def _etag(request, state):
+    params = sorted(request.query_params.lists())
+    key = f"{request.user.pk}:{request.user.role}:{params}:{state}"
+    return "W/" + quote_etag(hashlib.md5(key.encode("utf-8")).hexdigest())
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Representations differ per caller; shared caches must key on the token.
+    patch_vary_headers(response, ["Authorization"])
+    return response
@@ -0,0 +1,83 @@
+from django.db import connections, router, transaction
+from django.db.models import Count, Q, Sum
+
+from .models import Task, TaskCounter
+
+# Database triggers (migration 0005) keep tasks_taskcounter in step with tasks_task
+# on every write path (save, bulk_create, bulk_update, queryset update/delete,
+# cascades), inside the writing statement's transaction. Other databases fall back
+# to live counts.
+MAINTAINED_VENDORS = ("sqlite", "postgresql")
+
+
+def is_maintained(using):
+    return connections[using].vendor in MAINTAINED_VENDORS
+
+
+def counts_for(owner_id, using=None):
+    """`{"open", "completed", "total"}` for one owner: a primary-key lookup when triggers maintain the table."""
+    using = using or router.db_for_read(TaskCounter)
+    if is_maintained(using):
+        row = TaskCounter.objects.using(using).filter(owner_id=owner_id).values("open_count", "completed_count").first()
+        open_count, completed = (row["open_count"], row["completed_count"]) if row else (0, 0)
+    else:
+        live = actual_counts(Task.objects.using(using).filter(owner_id=owner_id)).get(owner_id, (0, 0))
+        open_count, completed = live
+    return {"open": open_count, "completed": completed, "total": open_count + completed}
+
+
+def totals(using=None):
+    """Counts across every owner, plus the number of owners with at least one task."""
+    using = using or router.db_for_read(TaskCounter)
+    if is_maintained(using):
+        result = TaskCounter.objects.using(using).aggregate(
+            open=Sum("open_count"),
+            completed=Sum("completed_count"),
+            owners=Count("pk", filter=Q(open_count__gt=0) | Q(completed_count__gt=0)),
+        )
+        open_count, completed, owners = result["open"] or 0, result["completed"] or 0, result["owners"]
+    else:
+        live = actual_counts(Task.objects.using(using))
+        open_count = sum(counts[0] for counts in live.values())
+        completed = sum(counts[1] for counts in live.values())
+        owners = len(live)
+    return {"open": open_count, "completed": completed, "total": open_count + completed, "owners": owners}
+
+
+def actual_counts(queryset):
+    """`{owner_id: (open, completed)}` computed from the tasks table."""
+    rows = (
+        queryset.order_by()
+        .values("owner_id")
+        .annotate(open=Count("pk", filter=Q(completed=False)), done=Count("pk", filter=Q(completed=True)))
+    )
+    return {row["owner_id"]: (row["open"], row["done"]) for row in rows}
+
+
+def find_drift(using="default"):
+    """`[(owner_id, stored, actual)]` for every owner whose stored counts are wrong."""
+    actual = actual_counts(Task.objects.using(using))
+    stored = {
+        row["owner_id"]: (row["open_count"], row["completed_count"])
+        for row in TaskCounter.objects.using(using).values("owner_id", "open_count", "completed_count")
+    }
+    return [
+        (owner_id, stored.get(owner_id, (0, 0)), actual.get(owner_id, (0, 0)))
+        for owner_id in sorted(set(actual) | set(stored))
+        if stored.get(owner_id, (0, 0)) != actual.get(owner_id, (0, 0))
+    ]
+
+
+def rebuild(using="default"):
+    """Rewrite the counters from the tasks table; returns the drift that was fixed."""
+    with transaction.atomic(using=using):
+        # Lock out concurrent task writes so the recount and the rewrite agree.
+        if connections[using].vendor == "postgresql":
+            with connections[using].cursor() as cursor:
+                cursor.execute("LOCK TABLE tasks_task IN SHARE MODE")
+        drift = find_drift(using)
+        for owner_id, _, (open_count, completed) in drift:
+            TaskCounter.objects.using(using).update_or_create(
+                owner_id=owner_id, defaults={"open_count": open_count, "completed_count": completed}
+            )
+    return drift
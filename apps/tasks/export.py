@@ -0,0 +1,37 @@
+import csv
+import json
+from itertools import islice
+
+from .serializers import TASK_VALUE_FIELDS, task_rows_representation
+
+CSV_COLUMNS = ["id", "title", "description", "completed", "created_at", "updated_at", "owner"]
+
+
+def iter_tasks(queryset, chunk_size):
+    """Yield task dicts (same shape as the API) while holding at most one chunk of rows in memory."""
+    rows = queryset.values(*TASK_VALUE_FIELDS).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from task_rows_representation(chunk)
+
+
+def stream_ndjson(queryset, chunk_size):
+    for task in iter_tasks(queryset, chunk_size):
+        yield json.dumps(task, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(queryset, chunk_size):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for task in iter_tasks(queryset, chunk_size):
+        task["completed"] = "true" if task["completed"] else "false"
+        yield writer.writerow([task[column] for column in CSV_COLUMNS])
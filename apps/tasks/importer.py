@@ -0,0 +1,158 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from . import cache as list_cache
+from .models import Task
+from .serializers import TaskSerializer
+
+FORMATS = ("ndjson", "csv")
+
+
+class ImportReport:
+    """Running totals for an import; keeps at most `max_errors` error details."""
+
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+        self.total = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def guess_format(name, default="ndjson"):
+    name = (name or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return default
+
+
+def decode_lines(stream):
+    """
+    Yield `(line, error)` for each line of a binary `stream`: the decoded text,
+    and the reason it is not valid UTF-8 (None if it is). An undecodable line
+    comes through with replacement characters so a parser can still skip it.
+    """
+    for number, raw in enumerate(stream, start=1):
+        if number == 1 and raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        try:
+            yield raw.decode("utf-8"), None
+        except UnicodeDecodeError as exc:
+            yield raw.decode("utf-8", errors="replace"), exc.reason
+
+
+def not_utf8(reason):
+    return {"non_field_errors": [f"Row is not valid UTF-8: {reason}"]}
+
+
+def parse_ndjson(lines):
+    """Yield `(row number, dict or error, parsed)` for each non-blank line."""
+    for number, (line, bad_encoding) in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if bad_encoding:
+            yield number, not_utf8(bad_encoding), False
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, {"non_field_errors": [f"Invalid JSON: {exc}"]}, False
+            continue
+        if not isinstance(record, dict):
+            yield number, {"non_field_errors": ["Expected a JSON object."]}, False
+            continue
+        yield number, record, True
+
+
+def parse_csv(lines):
+    """
+    Like `parse_ndjson`, numbering records rather than lines (a quoted field
+    may span several). A record is an error if any of its lines is not UTF-8.
+    """
+    bad_lines = {}
+
+    def text():
+        for line_number, (line, bad_encoding) in enumerate(lines, start=1):
+            if bad_encoding:
+                bad_lines[line_number] = bad_encoding
+            yield line
+
+    reader = csv.DictReader(text())
+    number = last_line = 0
+    while True:
+        try:
+            record, parsed = next(reader), True
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            record, parsed = {"non_field_errors": [f"Malformed CSV: {exc}"]}, False
+        number += 1
+        bad_encoding = next(
+            (bad_lines.pop(line) for line in range(last_line + 1, reader.line_num + 1) if line in bad_lines), None
+        )
+        last_line = reader.line_num
+        if bad_encoding:
+            yield number, not_utf8(bad_encoding), False
+        else:
+            yield number, record, parsed
+
+
+def import_tasks(stream, owner, fmt="ndjson", batch_size=None, max_errors=None):
+    """
+    Validate and insert tasks read from a binary `stream` of NDJSON or CSV.
+
+    Rows are validated one by one with TaskSerializer and inserted with
+    `bulk_create` every `batch_size` valid rows, each batch in its own
+    transaction, so a bad row (or a failure late in a huge file) never
+    discards earlier batches. Memory is bounded by the batch size and the
+    number of reported errors. Returns an ImportReport.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    batch_size = batch_size or settings.TASK_IMPORT_BATCH_SIZE
+    report = ImportReport(max_errors if max_errors is not None else settings.TASK_IMPORT_MAX_REPORTED_ERRORS)
+
+    lines = decode_lines(stream)
+    records = parse_csv(lines) if fmt == "csv" else parse_ndjson(lines)
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        pending = []
+        for number, record, parsed in chunk:
+            report.total += 1
+            if not parsed:
+                report.add_error(number, record)
+                continue
+            serializer = TaskSerializer(data=record)
+            if serializer.is_valid():
+                pending.append(Task(owner_id=owner.pk, **serializer.validated_data))
+            else:
+                report.add_error(number, serializer.errors)
+        if pending:
+            with transaction.atomic():
+                Task.objects.bulk_create(pending)
+                list_cache.invalidate_owners([owner.pk])
+            report.created += len(pending)
+    return report
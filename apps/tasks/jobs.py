@@ -0,0 +1,97 @@
+"""Background job handlers for task operations too large to run inside a request."""
+import os
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.jobs.models import Job
+from apps.jobs.queue import enqueue, register
+from . import analytics
+from . import cache as list_cache
+from .export import stream_csv, stream_ndjson
+from .models import Task
+from .renderers import CSVRenderer, NDJSONRenderer
+from .search import search_tasks
+
+EXPORT_FORMATS = {"ndjson": (stream_ndjson, NDJSONRenderer.media_type), "csv": (stream_csv, CSVRenderer.media_type)}
+
+
+def visible_tasks(user, completed=None, search=None):
+    """The tasks `user` can see, filtered like the list endpoint's `completed` and `search`."""
+    queryset = Task.objects.all()
+    if user.role != "admin":
+        queryset = queryset.filter(owner_id=user.pk)
+    if completed is not None:
+        queryset = queryset.filter(completed=completed)
+    if search:
+        queryset = search_tasks(queryset, search)
+    return queryset
+
+
+@register("tasks.export")
+def export_tasks(context, user_id, format="ndjson", completed=None, search=None):
+    user = get_user_model().objects.get(pk=user_id)
+    queryset = visible_tasks(user, completed, search)
+    total = queryset.count()
+    context.progress(0, total)
+
+    stream, content_type = EXPORT_FORMATS[format]
+    chunk_size = settings.TASK_EXPORT_CHUNK_SIZE
+    name = f"tasks-{context.job.pk}.{format}"
+    path = os.path.join(settings.JOB_RESULT_DIR, name)
+    os.makedirs(settings.JOB_RESULT_DIR, exist_ok=True)
+    rows = 0
+    with open(path + ".tmp", "w", encoding="utf-8", newline="") as handle:
+        for line in stream(queryset, chunk_size):
+            handle.write(line)
+            rows += 1
+            if rows % chunk_size == 0:
+                context.progress(rows, total)
+    os.replace(path + ".tmp", path)
+    if format == "csv":
+        rows -= 1  # header
+    context.progress(rows, total)
+    return {"file": name, "content_type": content_type, "rows": rows}
+
+
+@register("tasks.set_completed")
+def set_completed(context, user_id, completed, search=None):
+    """Set `completed` on every visible task matching `search`, one batch per transaction."""
+    user = get_user_model().objects.get(pk=user_id)
+    queryset = visible_tasks(user, completed=not completed, search=search)
+    total = queryset.count()
+    context.progress(0, total)
+
+    updated, last_pk = 0, 0
+    while True:
+        ids = list(queryset.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:settings.JOBS_BATCH_SIZE])
+        if not ids:
+            break
+        with transaction.atomic():
+            batch = Task.objects.filter(pk__in=ids, completed=not completed)
+            owners = set(batch.values_list("owner_id", flat=True).distinct())
+            updated += batch.update(completed=completed, updated_at=timezone.now())
+            list_cache.invalidate_owners(owners)
+        last_pk = ids[-1]
+        context.progress(updated, total)
+    return {"updated": updated}
+
+
+@register("tasks.refresh_rollups")
+def refresh_rollups(context):
+    """Bring the analytics rollups up to date (see `analytics.refresh`)."""
+    days = analytics.refresh()
+    if days is None:
+        return {"backfilled": True}
+    return {"days": [day.isoformat() for day in days]}
+
+
+def schedule_rollup_refresh():
+    """Queue a rollup refresh unless one is already waiting or running. Returns the new job, if any."""
+    # Two requests racing past this check queue two refreshes; they serialize
+    # on the watermark lock and the second finds little to do.
+    if Job.objects.filter(kind="tasks.refresh_rollups", status__in=[Job.QUEUED, Job.RUNNING]).exists():
+        return None
+    return enqueue("tasks.refresh_rollups")
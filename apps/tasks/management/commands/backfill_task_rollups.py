@@ -0,0 +1,43 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks import analytics
+
+
+def parse_day(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}; use YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily task analytics rollups from the tasks table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day to rebuild, YYYY-MM-DD (default: the oldest task's day)")
+        parser.add_argument("--until", help="Last day to rebuild, YYYY-MM-DD (default: today)")
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Only recompute the days touched since the last refresh (for a periodic job)",
+        )
+        parser.add_argument("--database", default="default", help="Database alias (default: default)")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["incremental"]:
+            if options["since"] or options["until"]:
+                raise CommandError("--incremental cannot be combined with --since/--until.")
+            days = analytics.refresh(using)
+            if days is None:
+                self.stdout.write(self.style.SUCCESS("No earlier refresh; rebuilt every day."))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Refreshed {len(days)} day(s)."))
+            return
+        since = parse_day(options["since"]) if options["since"] else None
+        until = parse_day(options["until"]) if options["until"] else None
+        if since and until and since > until:
+            raise CommandError("--since must not be after --until.")
+        rows = analytics.backfill(since, until, using)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task rollups; wrote {rows} row(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.changes import compact
+
+
+class Command(BaseCommand):
+    help = "Delete task change entries superseded by a later entry for the same task and owner."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias (default: default)")
+
+    def handle(self, *args, **options):
+        deleted = compact(options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} superseded change entries."))
@@ -0,0 +1,42 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.importer import FORMATS, guess_format, import_tasks
+
+
+class Command(BaseCommand):
+    help = "Import tasks for a user from an NDJSON or CSV file (use - for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - to read stdin")
+        parser.add_argument("--owner", required=True, help="Email of the user who will own the tasks")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension, else ndjson")
+        parser.add_argument("--batch-size", type=int, help="Valid rows per insert transaction")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            owner = User.objects.get(email=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['owner']}")
+
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+        if path == "-":
+            report = import_tasks(sys.stdin.buffer, owner=owner, fmt=fmt, batch_size=options["batch_size"])
+        else:
+            try:
+                with open(path, "rb") as stream:
+                    report = import_tasks(stream, owner=owner, fmt=fmt, batch_size=options["batch_size"])
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        result = report.as_dict()
+        for error in result["errors"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} of {result['total']} rows ({result['failed']} failed)."
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks import counters
+
+
+class Command(BaseCommand):
+    help = "Recount tasks per owner and repair the precomputed task counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only report drift; exit non-zero if any is found")
+        parser.add_argument("--database", default="default", help="Database alias (default: default)")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        drift = counters.find_drift(using) if options["check"] else counters.rebuild(using)
+        for owner_id, (stored_open, stored_done), (open_count, completed) in drift:
+            self.stderr.write(
+                f"owner {owner_id}: stored {stored_open} open / {stored_done} completed, "
+                f"actual {open_count} open / {completed} completed"
+            )
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} owner(s) have wrong task counters.")
+            self.stdout.write(self.style.SUCCESS("Task counters match the tasks table."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt task counters; fixed {len(drift)} owner(s)."))
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# The SQL is kept here, not imported from apps.tasks.search, so the migration
+# keeps doing what it did when it was written.
+
+# SQLite: external-content FTS5 table over tasks_task(title, description), kept in
+# sync by triggers so every insert/update/delete path (save, bulk_create, queryset
+# update/delete, cascades) updates the index.
+SQLITE_FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts
+    USING fts5(title, description, content='tasks_task', content_rowid='id', tokenize='unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_fts_au",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_ad",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_ai",
+    "DROP TABLE IF EXISTS tasks_task_fts",
+]
+
+# PostgreSQL: a GIN expression index. Search queries must use the exact same
+# expression (search.POSTGRES_DOCUMENT) for the planner to pick the index.
+POSTGRES_FORWARD_SQL = [
+    "CREATE INDEX IF NOT EXISTS task_search_document_idx ON tasks_task USING gin "
+    "((to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))))",
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP INDEX IF EXISTS task_search_document_idx",
+]
+
+FORWARD = {"sqlite": SQLITE_FORWARD_SQL, "postgresql": POSTGRES_FORWARD_SQL}
+REVERSE = {"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRES_REVERSE_SQL}
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARD), run(REVERSE)),
+    ]
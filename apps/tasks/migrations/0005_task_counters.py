@@ -0,0 +1,126 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The SQL is kept here, not imported from apps.tasks.counters, so the
+# migration keeps doing what it did when it was written.
+
+SQLITE_FORWARD_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_counter_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT OR IGNORE INTO tasks_taskcounter (owner_id, open_count, completed_count) VALUES (new.owner_id, 0, 0);
+        UPDATE tasks_taskcounter SET
+            open_count = open_count + (CASE WHEN new.completed THEN 0 ELSE 1 END),
+            completed_count = completed_count + (CASE WHEN new.completed THEN 1 ELSE 0 END)
+        WHERE owner_id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_counter_ad AFTER DELETE ON tasks_task BEGIN
+        UPDATE tasks_taskcounter SET
+            open_count = open_count - (CASE WHEN old.completed THEN 0 ELSE 1 END),
+            completed_count = completed_count - (CASE WHEN old.completed THEN 1 ELSE 0 END)
+        WHERE owner_id = old.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_counter_au AFTER UPDATE OF completed, owner_id ON tasks_task
+    WHEN old.completed IS NOT new.completed OR old.owner_id IS NOT new.owner_id BEGIN
+        UPDATE tasks_taskcounter SET
+            open_count = open_count - (CASE WHEN old.completed THEN 0 ELSE 1 END),
+            completed_count = completed_count - (CASE WHEN old.completed THEN 1 ELSE 0 END)
+        WHERE owner_id = old.owner_id;
+        INSERT OR IGNORE INTO tasks_taskcounter (owner_id, open_count, completed_count) VALUES (new.owner_id, 0, 0);
+        UPDATE tasks_taskcounter SET
+            open_count = open_count + (CASE WHEN new.completed THEN 0 ELSE 1 END),
+            completed_count = completed_count + (CASE WHEN new.completed THEN 1 ELSE 0 END)
+        WHERE owner_id = new.owner_id;
+    END
+    """,
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_counter_au",
+    "DROP TRIGGER IF EXISTS tasks_task_counter_ad",
+    "DROP TRIGGER IF EXISTS tasks_task_counter_ai",
+]
+
+POSTGRES_FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tasks_task_counter() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE tasks_taskcounter SET
+                open_count = open_count - (CASE WHEN OLD.completed THEN 0 ELSE 1 END),
+                completed_count = completed_count - (CASE WHEN OLD.completed THEN 1 ELSE 0 END)
+            WHERE owner_id = OLD.owner_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO tasks_taskcounter (owner_id, open_count, completed_count)
+            VALUES (NEW.owner_id, CASE WHEN NEW.completed THEN 0 ELSE 1 END, CASE WHEN NEW.completed THEN 1 ELSE 0 END)
+            ON CONFLICT (owner_id) DO UPDATE SET
+                open_count = tasks_taskcounter.open_count + EXCLUDED.open_count,
+                completed_count = tasks_taskcounter.completed_count + EXCLUDED.completed_count;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_task_counter_insert_delete AFTER INSERT OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_counter()
+    """,
+    """
+    CREATE TRIGGER tasks_task_counter_update AFTER UPDATE OF completed, owner_id ON tasks_task
+    FOR EACH ROW WHEN (OLD.completed IS DISTINCT FROM NEW.completed OR OLD.owner_id IS DISTINCT FROM NEW.owner_id)
+    EXECUTE FUNCTION tasks_task_counter()
+    """,
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_counter_update ON tasks_task",
+    "DROP TRIGGER IF EXISTS tasks_task_counter_insert_delete ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_task_counter()",
+]
+
+# Seeds the table from existing rows once the triggers are in place.
+BACKFILL_SQL = """
+    INSERT INTO tasks_taskcounter (owner_id, open_count, completed_count)
+    SELECT owner_id, SUM(CASE WHEN tasks_task.completed THEN 0 ELSE 1 END), SUM(CASE WHEN tasks_task.completed THEN 1 ELSE 0 END)
+    FROM tasks_task GROUP BY owner_id
+"""
+
+FORWARD = {
+    "sqlite": SQLITE_FORWARD_SQL + [BACKFILL_SQL],
+    "postgresql": POSTGRES_FORWARD_SQL + [BACKFILL_SQL],
+}
+REVERSE = {"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRES_REVERSE_SQL}
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_search_index'),
+        ('users', '0002_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(run(FORWARD), run(REVERSE)),
+    ]
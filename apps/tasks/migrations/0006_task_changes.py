@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+# The SQL is kept here, not imported from apps.tasks.changes, so the
+# migration keeps doing what it did when it was written.
+
+SQLITE_FORWARD_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_change_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id) VALUES (new.id, new.owner_id, 0, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_change_au AFTER UPDATE ON tasks_task BEGIN
+        INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id)
+        SELECT old.id, old.owner_id, 1, 0 WHERE old.owner_id IS NOT new.owner_id;
+        INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id) VALUES (new.id, new.owner_id, 0, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_change_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id) VALUES (old.id, old.owner_id, 1, 0);
+    END
+    """,
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_change_ad",
+    "DROP TRIGGER IF EXISTS tasks_task_change_au",
+    "DROP TRIGGER IF EXISTS tasks_task_change_ai",
+]
+
+POSTGRES_FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tasks_task_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.owner_id IS DISTINCT FROM NEW.owner_id) THEN
+            INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id)
+            VALUES (OLD.id, OLD.owner_id, true, txid_current());
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id)
+            VALUES (NEW.id, NEW.owner_id, false, txid_current());
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_task_change AFTER INSERT OR UPDATE OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_change()
+    """,
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_change ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_task_change()",
+]
+
+# One entry per existing task, so a token taken right after the migration covers them.
+BACKFILL_SQL = {
+    "sqlite": "INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id) "
+              "SELECT id, owner_id, 0, 0 FROM tasks_task ORDER BY id",
+    "postgresql": "INSERT INTO tasks_taskchange (task_id, owner_id, deleted, transaction_id) "
+                  "SELECT id, owner_id, false, txid_current() FROM tasks_task ORDER BY id",
+}
+
+FORWARD = {
+    "sqlite": SQLITE_FORWARD_SQL + [BACKFILL_SQL["sqlite"]],
+    "postgresql": POSTGRES_FORWARD_SQL + [BACKFILL_SQL["postgresql"]],
+}
+REVERSE = {"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRES_REVERSE_SQL}
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('owner_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('transaction_id', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner_id', 'transaction_id', 'id'], name='taskchange_owner_pos_idx'), models.Index(fields=['transaction_id', 'id'], name='taskchange_pos_idx'), models.Index(fields=['task_id', 'owner_id'], name='taskchange_task_idx')],
+            },
+        ),
+        migrations.RunPython(run(FORWARD), run(REVERSE)),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+from django.db import migrations, models
+
+# Mark the UTC day a task was created on when the task is deleted or its
+# created_at moves, and the day it was last completed on when a completed task
+# is deleted or updated on another day. The SQL is kept here, not imported, so
+# the migration keeps doing what it did when it was written.
+SQLITE_FORWARD_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_rollup_stale_au AFTER UPDATE ON tasks_task BEGIN
+        INSERT INTO tasks_stalerollupday (day, marked_at)
+        SELECT date(old.created_at), strftime('%Y-%m-%d %H:%M:%f', 'now')
+        WHERE date(old.created_at) IS NOT date(new.created_at);
+        INSERT INTO tasks_stalerollupday (day, marked_at)
+        SELECT date(old.updated_at), strftime('%Y-%m-%d %H:%M:%f', 'now')
+        WHERE old.completed AND date(old.updated_at) IS NOT date(new.updated_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_rollup_stale_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_stalerollupday (day, marked_at)
+        VALUES (date(old.created_at), strftime('%Y-%m-%d %H:%M:%f', 'now'));
+        INSERT INTO tasks_stalerollupday (day, marked_at)
+        SELECT date(old.updated_at), strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE old.completed;
+    END
+    """,
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_rollup_stale_ad",
+    "DROP TRIGGER IF EXISTS tasks_task_rollup_stale_au",
+]
+
+POSTGRES_FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tasks_task_rollup_stale() RETURNS trigger AS $$
+    DECLARE
+        created_moved boolean := true;
+        updated_moved boolean := true;
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            created_moved := (OLD.created_at AT TIME ZONE 'UTC')::date <> (NEW.created_at AT TIME ZONE 'UTC')::date;
+            updated_moved := (OLD.updated_at AT TIME ZONE 'UTC')::date <> (NEW.updated_at AT TIME ZONE 'UTC')::date;
+        END IF;
+        IF created_moved THEN
+            INSERT INTO tasks_stalerollupday (day, marked_at) VALUES ((OLD.created_at AT TIME ZONE 'UTC')::date, now());
+        END IF;
+        IF OLD.completed AND updated_moved THEN
+            INSERT INTO tasks_stalerollupday (day, marked_at) VALUES ((OLD.updated_at AT TIME ZONE 'UTC')::date, now());
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_task_rollup_stale AFTER UPDATE OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_rollup_stale()
+    """,
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_rollup_stale ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_task_rollup_stale()",
+]
+
+FORWARD = {"sqlite": SQLITE_FORWARD_SQL, "postgresql": POSTGRES_FORWARD_SQL}
+REVERSE = {"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRES_REVERSE_SQL}
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleRollupDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('marked_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['marked_at'], name='stalerollupday_marked_idx')],
+            },
+        ),
+        migrations.RunPython(run(FORWARD), run(REVERSE)),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
 
+# Largest primary key a BigAutoField can hold; ids past it cannot match a row.
+MAX_ID = 2 ** 63 - 1
+
 
 class Task(models.Model):
     title = models.CharField(max_length=255)
@@ -16,6 +19,120 @@ class Task(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "created_at"], name="task_owner_created_idx"),
+            models.Index(fields=["owner", "completed", "created_at"], name="task_owner_done_created_idx"),
+            models.Index(fields=["owner", "updated_at"], name="task_owner_updated_idx"),
+            # Day-range scans across all owners, for the analytics rollups.
+            models.Index(fields=["created_at"], name="task_created_idx"),
+            models.Index(fields=["updated_at"], name="task_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class TaskCounter(models.Model):
+    """
+    Denormalized open/completed task counts per owner, kept current by
+    database triggers (see `counters.py`). Read these instead of counting
+    tasks; `manage.py rebuild_task_counters` repairs any drift.
+    """
+
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_counter",
+    )
+    # Plain integers: a CHECK constraint would make task writes fail on drift.
+    open_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.open_count} open, {self.completed_count} completed"
+
+
+class TaskChange(models.Model):
+    """
+    Append-only log of task changes, written by database triggers (see
+    `changes.py`) and read by the /api/tasks/changes/ sync feed. A row with
+    `deleted` set is a tombstone: the task was deleted, or moved to another
+    owner, as seen by `owner_id`.
+    """
+
+    # Plain integers: entries must outlive the task (and may outlive its owner).
+    task_id = models.BigIntegerField()
+    owner_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    # PostgreSQL transaction id of the write (0 on SQLite, where writers are
+    # serialized and `id` alone orders commits).
+    transaction_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner_id", "transaction_id", "id"], name="taskchange_owner_pos_idx"),
+            models.Index(fields=["transaction_id", "id"], name="taskchange_pos_idx"),
+            models.Index(fields=["task_id", "owner_id"], name="taskchange_task_idx"),
+        ]
+
+    def __str__(self):
+        return f"{'delete' if self.deleted else 'upsert'} task {self.task_id} for {self.owner_id}"
+
+
+class TaskDailyRollup(models.Model):
+    """
+    Tasks created and completed per owner per (UTC) day, with a histogram of
+    how long the completed ones took. Refreshed from `Task.created_at` and
+    `updated_at` by `analytics.py`. The admin analytics endpoint reads these
+    rows instead of aggregating tasks.
+    """
+
+    day = models.DateField()
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    created = models.IntegerField(default=0)
+    # Completed tasks count on the day of their last update; the
+    # completed_* columns split them by time from creation to that update.
+    completed = models.IntegerField(default=0)
+    completed_within_hour = models.IntegerField(default=0)
+    completed_within_day = models.IntegerField(default=0)
+    completed_within_week = models.IntegerField(default=0)
+    completed_within_month = models.IntegerField(default=0)
+    completed_after_month = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "owner"], name="taskrollup_day_owner_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.owner_id}: {self.created} created, {self.completed} completed"
+
+
+class StaleRollupDay(models.Model):
+    """
+    A day whose rollups a task write may have left wrong without touching the
+    task's current days: the day a task was created or last completed on, when
+    that task is deleted or moved off it. Appended by database triggers (see
+    `analytics.py`); the next refresh recomputes the day.
+    """
+
+    day = models.DateField()
+    marked_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["marked_at"], name="stalerollupday_marked_idx")]
+
+    def __str__(self):
+        return f"{self.day} (marked {self.marked_at})"
+
+
+class RollupWatermark(models.Model):
+    """How far a rollup has been refreshed: task rows updated after `refreshed_through` are not in it yet."""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    # Null until the first backfill.
+    refreshed_through = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.refreshed_through}"
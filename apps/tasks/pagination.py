@@ -1,4 +1,26 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+from functools import partial
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import MAX_ID
+
+
+class CountedPaginator(Paginator):
+    """A Django paginator that is handed the row count instead of running `COUNT(*)`."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
 
 
 class TaskPagination(PageNumberPagination):
@@ -16,3 +38,147 @@ class TaskPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    # Row count the caller already knows (the list ETag query); None to count.
+    count = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(CountedPaginator, count=self.count)
+        return super().paginate_queryset(queryset, request, view)
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Opt-in keyset pagination for the task list endpoint.
+
+    Pages are addressed by an opaque cursor encoding the `(ordering field, id)`
+    of the last row seen, so every page is a single indexed range scan with no
+    `COUNT(*)` and no `OFFSET`. Honors the `ordering` query parameter for
+    `created_at` / `updated_at` in either direction.
+
+    Examples:
+        GET /api/tasks/?pagination=cursor
+        GET /api/tasks/?pagination=cursor&page_size=50&ordering=updated_at
+        GET /api/tasks/?cursor=<opaque>
+    """
+
+    mode_query_param = "pagination"
+    mode_query_value = "cursor"
+    cursor_query_param = "cursor"
+    page_size = TaskPagination.page_size
+    page_size_query_param = TaskPagination.page_size_query_param
+    max_page_size = TaskPagination.max_page_size
+    ordering_query_param = "ordering"
+    ordering_fields = ("created_at", "updated_at")
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def is_requested(cls, request):
+        """True if the client opted into keyset pagination for this request."""
+        if request is None:
+            return False
+        params = request.query_params
+        return params.get(cls.mode_query_param) == cls.mode_query_value or cls.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+        descending = self.descending != reverse
+
+        if cursor is not None:
+            op = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{op}": cursor["v"]}) | Q(**{self.field: cursor["v"], f"pk__{op}": cursor["id"]})
+            )
+
+        prefix = "-" if descending else ""
+        rows = list(queryset.order_by(f"{prefix}{self.field}", f"{prefix}pk")[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None if not reverse else has_more
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param, "")
+        for term in [t.strip() for t in ordering.split(",")]:
+            if term.lstrip("-") in self.ordering_fields:
+                return term.lstrip("-"), term.startswith("-")
+        return self.default_ordering.lstrip("-"), self.default_ordering.startswith("-")
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            # parse_datetime raises ValueError for well-formed but impossible dates.
+            value = parse_datetime(payload["v"])
+            pk = payload["id"]
+            if value is None or not isinstance(pk, int) or isinstance(pk, bool) or not 0 <= pk <= MAX_ID:
+                raise ValueError(encoded)
+            return {"v": value, "id": pk, "r": bool(payload.get("r"))}
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        # Rows may be model instances or `.values()` dicts.
+        if isinstance(obj, dict):
+            payload = {"v": obj[self.field].isoformat(), "id": obj["id"]}
+        else:
+            payload = {"v": getattr(obj, self.field).isoformat(), "id": obj.pk}
+        if reverse:
+            payload["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii")
+        url = remove_query_param(self.base_url, "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
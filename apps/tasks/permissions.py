@@ -7,7 +7,7 @@ class IsOwnerOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.role == "admin":
             return True
-        return obj.owner == request.user
+        return obj.owner_id == request.user.pk
 
 
 class IsAdminRole(BasePermission):
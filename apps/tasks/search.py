@@ -0,0 +1,126 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Exists, F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+# SQLite: external-content FTS5 table over tasks_task(title, description), kept in
+# sync by triggers (migration 0004) so every insert/update/delete path (save,
+# bulk_create, queryset update/delete, cascades) updates the index.
+SQLITE_FTS_TABLE = "tasks_task_fts"
+
+# PostgreSQL: a GIN expression index (migration 0004). The query below must use
+# the exact same expression for the planner to pick the index; it is always in
+# sync with the row.
+POSTGRES_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+_fts_available = {}
+
+
+def sqlite_fts_available(connection):
+    """True if the FTS5 table exists on this connection (cached per alias)."""
+    if connection.alias not in _fts_available:
+        with connection.cursor() as cursor:
+            _fts_available[connection.alias] = SQLITE_FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_available[connection.alias]
+
+
+def search_tokens(terms):
+    """Split search terms into word tokens, dropping query-syntax characters."""
+    return [token for term in terms for token in re.findall(r"\w+", term)]
+
+
+class SQLiteRank(Func):
+    """
+    bm25() of a task against a MATCH string, given the match string, the
+    queryset whose hits may be ranked, and the outer task's pk (an `F()`, so
+    it compiles to whatever alias the outer query gives the task table).
+
+    The hits are ranked once, in a derived table that `LIMIT -1` keeps SQLite
+    from flattening into a MATCH per task row, and each row looks its rank up
+    there. Per hit that is an EXISTS probe, bm25() and an index lookup, where
+    a join to the FTS table needs one pk lookup and bm25(); about 2.5x the
+    cost on words most tasks contain. The join cannot be written with the
+    ORM: without `+rowid` in its ON clause SQLite runs MATCH once per task.
+    Restricting the hits with `IN` over the listed pks instead of EXISTS is
+    faster for such words but costs a pass over all of the owner's tasks on
+    every search, which makes rare words several times slower.
+    """
+
+    template = (
+        f"(SELECT hits.rank FROM (SELECT rowid AS id, bm25({SQLITE_FTS_TABLE}) AS rank FROM {SQLITE_FTS_TABLE} "
+        f"WHERE {SQLITE_FTS_TABLE} MATCH %(match)s AND %(visible)s LIMIT -1) AS hits WHERE hits.id = %(pk)s)"
+    )
+    output_field = FloatField()
+
+    def __init__(self, match, visible, pk):
+        visible = visible.order_by().filter(pk=RawSQL(f"{SQLITE_FTS_TABLE}.rowid", []))
+        super().__init__(Value(match), Exists(visible), pk)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        parts, params = {}, []
+        for name, expression in zip(("match", "visible", "pk"), self.get_source_expressions()):
+            parts[name], expression_params = compiler.compile(expression)
+            params.extend(expression_params)
+        return self.template % parts, params
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the database's full-text index, ranked by relevance.
+
+    Every word must match (as a prefix) in the title or description. Results
+    are ordered best match first unless the client passes `ordering`. Falls
+    back to DRF's `icontains` search on databases without a full-text index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not self.get_search_fields(view, request) or not search_terms:
+            return queryset
+
+        filtered = self.filter_indexed(queryset, search_terms)
+        if filtered is None:
+            return super().filter_queryset(request, queryset, view)
+        return filtered
+
+    def filter_indexed(self, queryset, search_terms):
+        """Full-text filter and rank `queryset`; None if the database has no full-text index."""
+        connection = connections[queryset.db]
+        tokens = search_tokens(search_terms)
+        if connection.vendor == "sqlite" and sqlite_fts_available(connection):
+            if not tokens:
+                return queryset.none()
+            return self.filter_sqlite(queryset, tokens)
+        if connection.vendor == "postgresql":
+            if not tokens:
+                return queryset.none()
+            return self.filter_postgres(queryset, tokens)
+        return None
+
+    def filter_sqlite(self, queryset, tokens):
+        match = " ".join(f'"{token}"*' for token in tokens)
+        # The filter is a plain `IN` so the paginator's COUNT(*) runs MATCH once and
+        # nothing else. Only the page query ranks, and only the visible hits.
+        hits = RawSQL(f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [match])
+        rank = SQLiteRank(match, queryset, F("pk"))
+        return queryset.filter(pk__in=hits).annotate(search_rank=rank).order_by("search_rank", "-created_at")
+
+    def filter_postgres(self, queryset, tokens):
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        return (
+            queryset.filter(RawSQL(f"{POSTGRES_DOCUMENT} @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField()))
+            .annotate(search_rank=RawSQL(f"ts_rank({POSTGRES_DOCUMENT}, to_tsquery('english', %s))", [tsquery], output_field=FloatField()))
+            .order_by("-search_rank", "-created_at")
+        )
+
+
+def search_tasks(queryset, text):
+    """`?search=text` matching outside a request, e.g. in background jobs."""
+    filtered = TaskSearchFilter().filter_indexed(queryset, [text])
+    if filtered is not None:
+        return filtered
+    for token in search_tokens([text]):
+        queryset = queryset.filter(Q(title__icontains=token) | Q(description__icontains=token))
+    return queryset
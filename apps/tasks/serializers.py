@@ -1,4 +1,10 @@
-from rest_framework import serializers
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from task_manager.metrics import serialization_timer
 from .models import Task
 
 
@@ -9,3 +15,173 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = ["id", "title", "description", "completed", "created_at", "updated_at", "owner"]
         read_only_fields = ["id", "created_at", "updated_at", "owner"]
+
+
+class TaskBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+
+class TaskChangesQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+
+class TaskAnalyticsQuerySerializer(serializers.Serializer):
+    since = serializers.DateField(required=False, help_text="First day (UTC), default 29 days before `until`")
+    until = serializers.DateField(required=False, help_text="Last day (UTC), default today")
+    users = serializers.IntegerField(min_value=0, max_value=500, default=50, help_text="Number of owners in `per_user`")
+
+    def validate(self, attrs):
+        until = attrs.get("until") or timezone.now().date()
+        since = attrs.get("since") or until - datetime.timedelta(days=29)
+        if since > until:
+            raise serializers.ValidationError({"since": ["Must not be after `until`."]})
+        if (until - since).days >= settings.TASK_ANALYTICS_MAX_DAYS:
+            raise serializers.ValidationError({"since": [f"At most {settings.TASK_ANALYTICS_MAX_DAYS} days per request."]})
+        return {**attrs, "since": since, "until": until}
+
+
+class TaskExportJobSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    completed = serializers.BooleanField(required=False, allow_null=True, default=None)
+    search = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class TaskStatusJobSerializer(serializers.Serializer):
+    completed = serializers.BooleanField(help_text="Value to set on every matching task")
+    search = serializers.CharField(required=False, allow_blank=True, default="", help_text="Only tasks matching this search")
+
+
+class TaskImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=["ndjson", "csv"], required=False)
+
+
+# Read-only fast path. Produces exactly what TaskSerializer renders (enforced by
+# tests) without DRF's per-field machinery; `owner` relies on User.__str__ being
+# the email. List pages read `.values(*TASK_VALUE_FIELDS)` rows, skipping model
+# instantiation as well. `TASK_COLUMNS` maps each response field, in order, to
+# its `.values()` column.
+TASK_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "completed": "completed",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "owner": "owner__email",
+}
+TASK_VALUE_FIELDS = tuple(TASK_COLUMNS.values())
+DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def requested_fields(query_params):
+    """
+    The response fields named by `?fields=title,completed`, in response
+    order, or None for all of them. Unknown names are a 400.
+    """
+    names = {name.strip() for name in query_params.get("fields", "").split(",") if name.strip()}
+    unknown = names - TASK_COLUMNS.keys()
+    if unknown:
+        raise serializers.ValidationError(
+            {"fields": [f"Unknown field(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(TASK_COLUMNS)}."]}
+        )
+    return tuple(name for name in TASK_COLUMNS if name in names) or None
+
+
+def compact_requested(query_params):
+    """`?compact=true`: list rows as arrays under one `columns` header instead of objects."""
+    return query_params.get("compact", "").lower() in ("1", "true")
+
+
+def value_columns(fields=None, required=()):
+    """`.values()` columns that render `fields` (all when None), plus any `required` by the caller."""
+    columns = TASK_VALUE_FIELDS if fields is None else tuple(TASK_COLUMNS[name] for name in fields)
+    return tuple(dict.fromkeys((*columns, *required)))
+
+
+def only_fields(queryset, fields=None):
+    """
+    Defer the model fields `fields` does not need. The pk, `owner_id` and
+    `updated_at` always load: permissions and the ETag need them. The owner
+    is only joined in when `owner` is requested.
+    """
+    if fields is None:
+        return queryset
+    names = {"id", "owner", "updated_at", *(name for name in fields if name != "owner")}
+    if "owner" in fields:
+        return queryset.select_related("owner").only(*names, "owner__email")
+    return queryset.select_related(None).only(*names)
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+def datetime_formatter():
+    """
+    Return a callable with the same output as DRF's DateTimeField.to_representation.
+    The current-timezone lookup is done once here rather than per value.
+    """
+    if not settings.USE_TZ or api_settings.DATETIME_FORMAT != ISO_8601:
+        return _datetime_field.to_representation
+    tz = timezone.get_current_timezone()
+    in_utc = str(tz) == "UTC"
+
+    def format_datetime(value):
+        if not value:
+            return None
+        if not (in_utc and value.tzinfo is datetime.timezone.utc):
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def task_rows_representation(rows, fields=None, compact=False):
+    """
+    Serialize `.values(*value_columns(fields))` rows: objects with `fields`
+    (all when None), or with `compact`, lists of values in `fields` order.
+    """
+    # Evaluate a queryset first so its SQL is not timed as serialization.
+    rows = list(rows)
+    with serialization_timer():
+        format_datetime = datetime_formatter()
+        if fields is None and not compact:
+            return [
+                {
+                    "id": row["id"],
+                    "title": row["title"],
+                    "description": row["description"],
+                    "completed": row["completed"],
+                    "created_at": format_datetime(row["created_at"]),
+                    "updated_at": format_datetime(row["updated_at"]),
+                    "owner": row["owner__email"],
+                }
+                for row in rows
+            ]
+        columns = [
+            (name, TASK_COLUMNS[name], format_datetime if name in DATETIME_FIELDS else None)
+            for name in fields or TASK_COLUMNS
+        ]
+        if compact:
+            return [[row[column] if convert is None else convert(row[column]) for _, column, convert in columns] for row in rows]
+        return [{name: row[column] if convert is None else convert(row[column]) for name, column, convert in columns} for row in rows]
+
+
+def task_representation(task, fields=None):
+    """Serialize a Task instance (owner should be select_related), limited to `fields` when given."""
+    with serialization_timer():
+        format_datetime = datetime_formatter()
+        getters = {
+            "id": lambda: task.id,
+            "title": lambda: task.title,
+            "description": lambda: task.description,
+            "completed": lambda: task.completed,
+            "created_at": lambda: format_datetime(task.created_at),
+            "updated_at": lambda: format_datetime(task.updated_at),
+            "owner": lambda: str(task.owner),
+        }
+        return {name: getters[name]() for name in fields or getters}
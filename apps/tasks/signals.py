@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import Task
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_lists(sender, instance, **kwargs):
+    cache.invalidate_owners([instance.owner_id])
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_owner_lists(sender, instance, created, **kwargs):
+    # Cached pages render the owner's email.
+    if not created:
+        cache.invalidate_owners([instance.pk])
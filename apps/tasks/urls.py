@@ -1,7 +1,28 @@
 from django.urls import path
-from .views import TaskListCreateView, TaskDetailView
+from .views import (
+    TaskAnalyticsView,
+    TaskBulkStatusView,
+    TaskBulkView,
+    TaskChangesView,
+    TaskDetailView,
+    TaskExportJobView,
+    TaskExportView,
+    TaskImportView,
+    TaskListCreateView,
+    TaskStatsAllView,
+    TaskStatsView,
+)
 
 urlpatterns = [
     path("tasks/", TaskListCreateView.as_view(), name="task-list-create"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="task-bulk"),
+    path("tasks/bulk/status/", TaskBulkStatusView.as_view(), name="task-bulk-status"),
+    path("tasks/export/", TaskExportView.as_view(), name="task-export"),
+    path("tasks/export/jobs/", TaskExportJobView.as_view(), name="task-export-job"),
+    path("tasks/import/", TaskImportView.as_view(), name="task-import"),
+    path("tasks/changes/", TaskChangesView.as_view(), name="task-changes"),
+    path("tasks/stats/", TaskStatsView.as_view(), name="task-stats"),
+    path("tasks/stats/all/", TaskStatsAllView.as_view(), name="task-stats-all"),
+    path("tasks/analytics/", TaskAnalyticsView.as_view(), name="task-analytics"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
 ]
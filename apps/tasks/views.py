@@ -1,40 +1,166 @@
-from rest_framework import generics, filters
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from .models import Task
-from .serializers import TaskSerializer
-from .permissions import IsOwnerOrAdmin
-from .pagination import TaskPagination
+from apps.jobs.queue import enqueue
+from apps.jobs.views import accepted
+from task_manager.routers import replica_reads
+from .models import MAX_ID, Task
+from .serializers import (
+    TASK_COLUMNS,
+    TaskAnalyticsQuerySerializer,
+    TaskBulkDeleteSerializer,
+    TaskChangesQuerySerializer,
+    TaskExportJobSerializer,
+    TaskImportSerializer,
+    TaskSerializer,
+    TaskStatusJobSerializer,
+    compact_requested,
+    only_fields,
+    requested_fields,
+    task_representation,
+    task_rows_representation,
+    value_columns,
+)
+from .permissions import IsAdminRole, IsOwnerOrAdmin
+from .pagination import TaskPagination, TaskKeysetPagination
+from .search import TaskSearchFilter
+from .conditional import list_etag, list_stats, page_etag, set_validators, task_validators
+from . import cache as list_cache
+from .export import stream_csv, stream_ndjson
+from .importer import guess_format, import_tasks
+from .jobs import schedule_rollup_refresh
+from .renderers import CSVRenderer, NDJSONRenderer
+from . import analytics
+from . import changes as change_feed
+from . import counters
+
+
+class TaskQuerysetMixin:
+    """Admins see every task; regular users only their own. Owners are joined in."""
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = Task.objects.select_related("owner")
+        if user.role == "admin":
+            return queryset
+        return queryset.filter(owner_id=user.pk)
+
+
+class ReplicaReadMixin:
+    """Serve GET/HEAD from the read replica when one is configured (see task_manager.routers)."""
 
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            with replica_reads():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
 
-class TaskListCreateView(generics.ListCreateAPIView):
+
+FIELDS_PARAMETER = openapi.Parameter(
+    "fields", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+    description=f"Comma-separated fields to return (default all): {', '.join(TASK_COLUMNS)}. Only their columns are read.",
+)
+
+
+def with_columns(data, columns):
+    """A compact list body: `columns` names the values of each row in `results`."""
+    return OrderedDict([*((key, value) for key, value in data.items() if key != "results"), ("columns", columns), ("results", data["results"])])
+
+
+class TaskListCreateView(ReplicaReadMixin, TaskQuerysetMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = TaskPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, filters.OrderingFilter]
     filterset_fields = ["completed"]
     search_fields = ["title", "description"]
     ordering_fields = ["created_at", "updated_at"]
 
-    def get_queryset(self):
-        user = self.request.user
-        if user.role == "admin":
-            return Task.objects.all()
-        return Task.objects.filter(owner=user)
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in, page numbers otherwise."""
+        if not hasattr(self, "_paginator"):
+            if TaskKeysetPagination.is_requested(getattr(self, "request", None)):
+                self._paginator = TaskKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        serializer.save(owner_id=self.request.user.pk)
+
+    def list(self, request, *args, **kwargs):
+        cache_key = list_cache.page_key(request) if list_cache.is_enabled() else None
+        cached = list_cache.get_page(cache_key) if cache_key else None
+        if cached is not None:
+            etag, data = cached
+            response = get_conditional_response(request, etag=etag) or Response(data)
+            response["X-Cache"] = "HIT"
+            return set_validators(response, etag)
+
+        fields, compact = requested_fields(request.query_params), compact_requested(request.query_params)
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(self.paginator, TaskKeysetPagination):
+            # Keyset cursors are built from the id and the ordering columns. Counting
+            # the whole list for the ETag would undo keyset pagination, so the page
+            # is read first and tagged by its own rows.
+            rows = queryset.values(*value_columns(fields, ("id", *TaskKeysetPagination.ordering_fields)))
+            page = self.paginate_queryset(rows)
+            etag = page_etag(request, page, self.paginator.has_next, self.paginator.has_previous)
+            response = get_conditional_response(request, etag=etag)
+        else:
+            stats = list_stats(queryset)
+            etag = list_etag(request, stats)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                # The ETag query already counted the rows; the paginator reuses it.
+                self.paginator.count = stats["total"]
+                rows = queryset.values(*value_columns(fields))
+                page = self.paginate_queryset(rows)
+        if response is None:
+            if page is not None:
+                response = self.get_paginated_response(task_rows_representation(page, fields, compact))
+            elif compact:
+                response = Response({"results": task_rows_representation(rows, fields, compact)})
+            else:
+                response = Response(task_rows_representation(rows, fields))
+            if compact:
+                response.data = with_columns(response.data, list(fields or TASK_COLUMNS))
+            # A lagging replica can miss the write that bumped the generation; caching its
+            # page under the new generation would serve it to everyone, the writer included.
+            if cache_key and queryset.db == router.db_for_write(Task):
+                list_cache.set_page(cache_key, etag, response.data)
+        if cache_key:
+            response["X-Cache"] = "MISS"
+        return set_validators(response, etag)
 
     @swagger_auto_schema(
-        operation_description="Retrieve a paginated list of tasks. Admins see all tasks; regular users see only their own. Filter by `completed`, search by `title` or `description`.",
+        operation_description="Retrieve a paginated list of tasks. Admins see all tasks; regular users see only their own. Filter by `completed`, search by `title` or `description`. Pass `pagination=cursor` for keyset pagination (no total count, constant cost per page). `fields` limits the columns read and returned; `compact=true` returns each task as an array of values, named once in `columns`.",
         manual_parameters=[
             openapi.Parameter("completed", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description="Filter by completion status"),
-            openapi.Parameter("search", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Search in title and description"),
+            openapi.Parameter("search", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Full-text search in title and description (ranked by relevance)"),
             openapi.Parameter("page", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Page number"),
             openapi.Parameter("page_size", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Number of results per page"),
+            openapi.Parameter("pagination", openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["cursor"], description="Set to `cursor` for keyset pagination"),
+            openapi.Parameter("cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Opaque cursor from a previous `next`/`previous` link"),
+            FIELDS_PARAMETER,
+            openapi.Parameter("compact", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description="Return rows as arrays under a `columns` header"),
+            openapi.Parameter("If-None-Match", openapi.IN_HEADER, type=openapi.TYPE_STRING, description="ETag of a cached page; 304 if unchanged"),
         ],
+        responses={304: "Not Modified"},
         tags=["Tasks"],
     )
     def get(self, request, *args, **kwargs):
@@ -50,37 +176,70 @@ class TaskListCreateView(generics.ListCreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ReplicaReadMixin, TaskQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+    """
+    Responses carry an ETag and Last-Modified derived from `updated_at`.
+    GET honors If-None-Match / If-Modified-Since (304, nothing serialized);
+    PUT/PATCH honor If-Match / If-Unmodified-Since (412 on a stale version).
+    """
+
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+    # Response fields requested with `?fields=` on GET; None for all.
+    fields = None
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role == "admin":
-            return Task.objects.all()
-        return Task.objects.filter(owner=user)
+        queryset = super().get_queryset()
+        if self.request.method in ("PUT", "PATCH") and "HTTP_IF_MATCH" in self.request.META:
+            # Hold the row until the write so the If-Match check cannot race.
+            queryset = queryset.select_for_update(of=("self",))
+        if self.request.method in ("GET", "HEAD"):
+            queryset = only_fields(queryset, self.fields)
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        self.fields = requested_fields(request.query_params)
+        instance = self.get_object()
+        etag, last_modified = task_validators(instance, self.fields)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(task_representation(instance, self.fields))
+        return set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        with transaction.atomic():
+            instance = self.get_object()
+            response = get_conditional_response(request, *task_validators(instance))
+            if response is not None:
+                return response
+            serializer = self.get_serializer(instance, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+        return set_validators(Response(serializer.data), *task_validators(instance))
 
     @swagger_auto_schema(
-        operation_description="Retrieve a single task by ID.",
-        responses={200: TaskSerializer, 404: "Not Found"},
+        operation_description="Retrieve a single task by ID. Supports `If-None-Match` / `If-Modified-Since`. `fields` limits the columns read and returned.",
+        manual_parameters=[FIELDS_PARAMETER],
+        responses={200: TaskSerializer, 304: "Not Modified", 404: "Not Found"},
         tags=["Tasks"],
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
     @swagger_auto_schema(
-        operation_description="Fully update a task. Only the owner or an admin can do this.",
+        operation_description="Fully update a task. Only the owner or an admin can do this. Send `If-Match: <ETag>` to fail with 412 if the task changed since it was read.",
         request_body=TaskSerializer,
-        responses={200: TaskSerializer},
+        responses={200: TaskSerializer, 412: "Precondition Failed"},
         tags=["Tasks"],
     )
     def put(self, request, *args, **kwargs):
         return super().put(request, *args, **kwargs)
 
     @swagger_auto_schema(
-        operation_description="Partially update a task. Only the owner or an admin can do this.",
+        operation_description="Partially update a task. Only the owner or an admin can do this. Send `If-Match: <ETag>` to fail with 412 if the task changed since it was read.",
         request_body=TaskSerializer,
-        responses={200: TaskSerializer},
+        responses={200: TaskSerializer, 412: "Precondition Failed"},
         tags=["Tasks"],
     )
     def patch(self, request, *args, **kwargs):
@@ -93,3 +252,343 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     )
     def delete(self, request, *args, **kwargs):
         return super().delete(request, *args, **kwargs)
+
+
+class TaskBulkView(TaskQuerysetMixin, generics.GenericAPIView):
+    """
+    Create, update or delete up to `TASK_BULK_MAX_ITEMS` tasks in one request.
+
+    Every item gets its own result entry carrying an HTTP-style `status`.
+    Invalid or inaccessible items are reported and skipped; the valid ones are
+    written together in a single transaction. The response is 207 when any
+    item failed.
+    """
+
+    serializer_class = TaskSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return None, Response({"detail": "Expected a non-empty list of tasks."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = settings.TASK_BULK_MAX_ITEMS
+        if len(items) > limit:
+            return None, Response({"detail": f"At most {limit} tasks per request."}, status=status.HTTP_400_BAD_REQUEST)
+        return items, None
+
+    @staticmethod
+    def item_id(item):
+        """The integer `id` of an update item, or the error message for a missing or malformed one."""
+        if not isinstance(item, dict):
+            return "Expected an object with an `id`."
+        if "id" not in item:
+            return "This field is required."
+        # bool is an int subclass, but `true` is not task 1.
+        if not isinstance(item["id"], int) or isinstance(item["id"], bool):
+            return "A valid integer is required."
+        return item["id"]
+
+    def respond(self, results, success_status):
+        failed = any(result["status"] >= 400 for result in results)
+        return Response({"results": results}, status=status.HTTP_207_MULTI_STATUS if failed else success_status)
+
+    @swagger_auto_schema(
+        operation_description="Create several tasks at once. All are assigned to the authenticated user.",
+        request_body=TaskSerializer(many=True),
+        responses={201: "Per-item results", 207: "Some items failed", 400: "Bad Request"},
+        tags=["Tasks"],
+    )
+    def post(self, request, *args, **kwargs):
+        items, error = self.get_items(request)
+        if error:
+            return error
+
+        results, pending = [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                pending.append((index, serializer.validated_data))
+            else:
+                results.append({"index": index, "status": 400, "errors": serializer.errors})
+
+        if pending:
+            owner = get_user_model().objects.only("id", "email").get(pk=request.user.pk)
+            with transaction.atomic():
+                created = Task.objects.bulk_create([Task(owner=owner, **data) for _, data in pending])
+                list_cache.invalidate_owners([owner.pk])
+            results.extend(
+                {"index": index, "status": 201, "data": data}
+                for (index, _), data in zip(pending, self.get_serializer(created, many=True).data)
+            )
+        results.sort(key=lambda result: result["index"])
+        return self.respond(results, status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        operation_description="Partially update several tasks at once. Each item must include its `id`. Only the owner or an admin can update a task.",
+        request_body=TaskSerializer(many=True),
+        responses={200: "Per-item results", 207: "Some items failed", 400: "Bad Request"},
+        tags=["Tasks"],
+    )
+    def patch(self, request, *args, **kwargs):
+        items, error = self.get_items(request)
+        if error:
+            return error
+
+        ids = [self.item_id(item) for item in items]
+        results, changed, fields = [], [], set()
+        # Rows are read locked inside the same transaction that writes them,
+        # so a concurrent PATCH cannot be overwritten by stale field values.
+        with transaction.atomic():
+            tasks = (
+                self.get_queryset()
+                .select_for_update(of=("self",))
+                .in_bulk([pk for pk in ids if isinstance(pk, int) and 0 < pk <= MAX_ID])
+            )
+            for index, (item, pk) in enumerate(zip(items, ids)):
+                if not isinstance(pk, int):
+                    results.append({"index": index, "status": 400, "errors": {"id": [pk]}})
+                    continue
+                task = tasks.get(pk)
+                if task is None:
+                    results.append({"index": index, "status": 404, "errors": {"id": ["Not found."]}})
+                    continue
+                serializer = self.get_serializer(task, data=item, partial=True)
+                if not serializer.is_valid():
+                    results.append({"index": index, "status": 400, "errors": serializer.errors})
+                    continue
+                for field, value in serializer.validated_data.items():
+                    setattr(task, field, value)
+                fields.update(serializer.validated_data)
+                changed.append((index, task))
+
+            if changed:
+                now = timezone.now()
+                for _, task in changed:
+                    task.updated_at = now
+                Task.objects.bulk_update([task for _, task in changed], sorted(fields | {"updated_at"}))
+                list_cache.invalidate_owners({task.owner_id for _, task in changed})
+
+        if changed:
+            results.extend(
+                {"index": index, "status": 200, "data": data}
+                for (index, _), data in zip(changed, self.get_serializer([task for _, task in changed], many=True).data)
+            )
+        results.sort(key=lambda result: result["index"])
+        return self.respond(results, status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Delete several tasks at once. Only the owner or an admin can delete a task.",
+        request_body=TaskBulkDeleteSerializer,
+        responses={200: "Per-item results", 207: "Some items failed", 400: "Bad Request"},
+        tags=["Tasks"],
+    )
+    def delete(self, request, *args, **kwargs):
+        serializer = TaskBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        limit = settings.TASK_BULK_MAX_ITEMS
+        if len(ids) > limit:
+            return Response({"detail": f"At most {limit} tasks per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Ids past the bigint range cannot exist; report them as not found.
+            in_range = [pk for pk in ids if pk <= MAX_ID]
+            found = set(self.get_queryset().filter(pk__in=in_range).values_list("pk", flat=True))
+            Task.objects.filter(pk__in=found).delete()
+        results = [
+            {"id": pk, "status": 204} if pk in found else {"id": pk, "status": 404, "errors": {"id": ["Not found."]}}
+            for pk in ids
+        ]
+        return self.respond(results, status.HTTP_200_OK)
+
+
+class TaskExportView(TaskQuerysetMixin, generics.GenericAPIView):
+    """
+    Stream every visible task as NDJSON (default) or CSV in a single response.
+
+    Uses the same ownership rules and `completed` / `search` / `ordering`
+    filters as the list endpoint, reading rows in chunks of
+    `TASK_EXPORT_CHUNK_SIZE` so memory use does not grow with the row count.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    filter_backends = TaskListCreateView.filter_backends
+    filterset_fields = TaskListCreateView.filterset_fields
+    search_fields = TaskListCreateView.search_fields
+    ordering_fields = TaskListCreateView.ordering_fields
+    pagination_class = None
+
+    @swagger_auto_schema(
+        operation_description="Export all visible tasks without pagination. Choose the format with `?format=ndjson|csv` or the `Accept` header (`application/x-ndjson`, `text/csv`).",
+        manual_parameters=[
+            openapi.Parameter("format", openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["ndjson", "csv"], description="Export format (default ndjson)"),
+            openapi.Parameter("completed", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description="Filter by completion status"),
+            openapi.Parameter("search", openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Full-text search in title and description"),
+        ],
+        responses={200: "Streamed NDJSON or CSV"},
+        tags=["Tasks"],
+    )
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        chunk_size = settings.TASK_EXPORT_CHUNK_SIZE
+        renderer = request.accepted_renderer
+        if renderer.format == "csv":
+            stream = stream_csv(queryset, chunk_size)
+        else:
+            stream = stream_ndjson(queryset, chunk_size)
+        response = StreamingHttpResponse(stream, content_type=f"{renderer.media_type}; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+
+
+class TaskExportJobView(generics.GenericAPIView):
+    """Export in a background job; the file is downloaded from /api/jobs/<id>/result/ when done."""
+
+    serializer_class = TaskExportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Start a background export of all visible tasks (same filters as `GET /api/tasks/export/`). Returns 202 with the job; poll its `url`, then download `/api/jobs/<id>/result/`.",
+        request_body=TaskExportJobSerializer,
+        responses={202: "The queued job", 400: "Bad Request"},
+        tags=["Tasks"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue("tasks.export", owner_id=request.user.pk, user_id=request.user.pk, **serializer.validated_data)
+        return accepted(job)
+
+
+class TaskBulkStatusView(generics.GenericAPIView):
+    """Mark every visible task (optionally only those matching `search`) completed or open, in a background job."""
+
+    serializer_class = TaskStatusJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Set `completed` on all your tasks (admins: all tasks), or only those matching `search`. Runs in the background in batches; returns 202 with the job to poll.",
+        request_body=TaskStatusJobSerializer,
+        responses={202: "The queued job", 400: "Bad Request"},
+        tags=["Tasks"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue("tasks.set_completed", owner_id=request.user.pk, user_id=request.user.pk, **serializer.validated_data)
+        return accepted(job)
+
+
+class TaskImportView(generics.GenericAPIView):
+    """
+    Import tasks for the authenticated user from an uploaded NDJSON or CSV file.
+
+    Rows are validated like `POST /api/tasks/` and inserted in batches of
+    `TASK_IMPORT_BATCH_SIZE`; invalid rows are reported and skipped.
+    """
+
+    serializer_class = TaskImportSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Upload an NDJSON or CSV file (`file` field) of tasks with `title`, `description`, `completed`. The format is taken from `format` or the file extension. Returns per-row errors for rows that were skipped.",
+        request_body=TaskImportSerializer,
+        responses={200: "Import report", 400: "Bad Request"},
+        tags=["Tasks"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        fmt = serializer.validated_data.get("format") or guess_format(upload.name)
+        report = import_tasks(upload.file, owner=request.user, fmt=fmt)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+
+class TaskStatsView(ReplicaReadMixin, generics.GenericAPIView):
+    """Open/completed task counts for the current user, read from the precomputed counters table."""
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        operation_description="Number of open, completed and total tasks owned by the authenticated user. Served from per-user counters maintained on every write, so the cost does not grow with the number of tasks.",
+        responses={200: "`{open, completed, total}`"},
+        tags=["Tasks"],
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(counters.counts_for(request.user.pk))
+
+
+class TaskStatsAllView(ReplicaReadMixin, generics.GenericAPIView):
+    """Task counts summed over every user (admins only)."""
+
+    permission_classes = [IsAdminRole]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        operation_description="Number of open, completed and total tasks across all users, and how many users own at least one task. Admins only.",
+        responses={200: "`{open, completed, total, owners}`", 403: "Forbidden"},
+        tags=["Tasks"],
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(counters.totals())
+
+
+class TaskAnalyticsView(generics.GenericAPIView):
+    """
+    Tasks created and completed per day and per user, and how long completion
+    took (admins only). Read from the daily rollups as they are. When they are
+    older than TASK_ANALYTICS_REFRESH_INTERVAL, a "tasks.refresh_rollups" job
+    is queued to bring them up to date; the request does not wait for it.
+    """
+
+    permission_classes = [IsAdminRole]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        operation_description="Tasks created and completed per day (UTC) between `since` and `until`, the `users` owners with the most tasks created in that range, and the distribution of time from creation to completion. A completed task counts on the day it was last updated. Served from pre-aggregated daily rollups; `refreshed_through` says how current they are. Stale rollups are refreshed by a background job, so changes show up once it has run. Admins only.",
+        query_serializer=TaskAnalyticsQuerySerializer,
+        responses={200: "`{since, until, refreshed_through, totals, per_day, per_user, completion_time}`", 400: "Bad Request", 403: "Forbidden"},
+        tags=["Tasks"],
+    )
+    def get(self, request, *args, **kwargs):
+        query = TaskAnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        if analytics.is_stale(settings.TASK_ANALYTICS_REFRESH_INTERVAL):
+            schedule_rollup_refresh()
+        params = query.validated_data
+        return Response(analytics.report(params["since"], params["until"], users=params["users"]))
+
+
+class TaskChangesView(ReplicaReadMixin, generics.GenericAPIView):
+    """
+    Incremental sync: the tasks that changed since a sync token.
+
+    Without `since`, only the current token is returned; fetch the full list
+    after taking it, then poll with it. Each page returns the next token.
+    Keep requesting while `has_more` is true.
+    """
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    @swagger_auto_schema(
+        operation_description="Tasks created, updated or deleted since `since` (a `sync_token` from an earlier response). Changed tasks are in `changes` with their current state; ids of tasks deleted or no longer visible are in `deleted`. Admins see changes to every task; regular users only their own. Without `since`, returns the current `sync_token` only.",
+        query_serializer=TaskChangesQuerySerializer,
+        responses={200: "`{sync_token, has_more, changes, deleted}`", 400: "Invalid sync token"},
+        tags=["Tasks"],
+    )
+    def get(self, request, *args, **kwargs):
+        query = TaskChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since = query.validated_data.get("since")
+        if since is None:
+            return Response({"sync_token": change_feed.current_token(), "has_more": False, "changes": [], "deleted": []})
+        limit = change_feed.page_size(query.validated_data.get("limit"))
+        try:
+            return Response(change_feed.changes_since(request.user, since, limit))
+        except change_feed.InvalidToken as exc:
+            raise ValidationError({"since": [str(exc)]})
@@ -0,0 +1,7 @@
+from django.urls import path
+from .async_views import AsyncLoginView, AsyncRegisterView
+
+urlpatterns = [
+    path("register/", AsyncRegisterView.as_view(), name="async-auth-register"),
+    path("login/", AsyncLoginView.as_view(), name="async-auth-login"),
+]
@@ -0,0 +1,52 @@
+from asgiref.sync import sync_to_async
+from rest_framework.permissions import AllowAny
+
+from task_manager.async_api import AsyncAPIView
+from task_manager.throttling import LoginAccountThrottle, LoginRateThrottle, RegisterRateThrottle
+from . import hashing
+from .authentication import tokens_for_user
+from .backends import aauthenticate
+from .serializers import RegisterSerializer, UserSerializer
+
+
+class AsyncRegisterView(AsyncAPIView):
+    """
+    Async `register/`. Validation and saving query the database, so they run
+    in a worker thread; the password hash is awaited in the hashing pool.
+    """
+
+    permission_classes = [AllowAny]
+    throttle_classes = [RegisterRateThrottle]
+
+    async def post(self, request):
+        serializer = RegisterSerializer(data=self.get_data(request))
+        if not await sync_to_async(serializer.is_valid)():
+            return self.respond(serializer.errors, status=400)
+        encoded = await hashing.amake_password(serializer.validated_data["password"])
+        user = await sync_to_async(serializer.save)(encoded_password=encoded)
+        return self.respond(UserSerializer(user).data, status=201)
+
+
+class AsyncLoginView(AsyncAPIView):
+    """Async `login/`; the password check is awaited in the hashing pool."""
+
+    permission_classes = [AllowAny]
+    throttle_classes = [LoginRateThrottle, LoginAccountThrottle]
+
+    async def post(self, request):
+        data = self.get_data(request)
+        email = data.get("email", "")
+        password = data.get("password", "")
+
+        user = await aauthenticate(request._request, username=email, password=password)
+        if user is None:
+            return self.respond({"detail": "Invalid email or password."}, status=401)
+
+        refresh = tokens_for_user(user)
+        return self.respond(
+            {
+                "access": str(refresh.access_token),
+                "refresh": str(refresh),
+                "user": UserSerializer(user).data,
+            }
+        )
@@ -0,0 +1,161 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+ROLE_CLAIM = "role"
+EMAIL_CLAIM = "email"
+VERSION_CLAIM = "ver"
+
+
+def tokens_for_user(user):
+    """Issue a refresh token whose access tokens carry the claims StatelessJWTAuthentication needs."""
+    refresh = RefreshToken.for_user(user)
+    refresh[ROLE_CLAIM] = user.role
+    refresh[EMAIL_CLAIM] = user.email
+    refresh[VERSION_CLAIM] = user.token_version
+    return refresh
+
+
+def auth_state_cache_key(user_id):
+    return f"users:auth-state:{user_id}"
+
+
+def auth_state(user):
+    return {"is_active": user.is_active, "role": user.role, "ver": user.token_version}
+
+
+def get_auth_state(user_id):
+    """
+    Return the cached `{is_active, role, ver}` for a user, loading it with a
+    single narrow query on a miss. Returns None if the user no longer exists.
+    User saves and deletes rewrite the entry (see `signals.py`) in their own
+    process's cache; other processes see the change at once only through a
+    shared cache, and otherwise within AUTH_STATE_CACHE_TIMEOUT seconds.
+    """
+    key = auth_state_cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        row = User.objects.filter(pk=user_id).values_list("is_active", "role", "token_version").first()
+        if row is None:
+            return None
+        state = {"is_active": row[0], "role": row[1], "ver": row[2]}
+        cache.set(key, state, settings.AUTH_STATE_CACHE_TIMEOUT)
+    return state
+
+
+async def aget_auth_state(user_id):
+    """Async version of `get_auth_state` for ASGI views."""
+    key = auth_state_cache_key(user_id)
+    state = await cache.aget(key)
+    if state is None:
+        row = await User.objects.filter(pk=user_id).values_list("is_active", "role", "token_version").afirst()
+        if row is None:
+            return None
+        state = {"is_active": row[0], "role": row[1], "ver": row[2]}
+        await cache.aset(key, state, settings.AUTH_STATE_CACHE_TIMEOUT)
+    return state
+
+
+class StatelessUser(TokenUser):
+    """Request user built from token claims; exposes what the API views read."""
+
+    @cached_property
+    def id(self):
+        # simplejwt stores the id claim as a string; compare like a real User.pk.
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @cached_property
+    def email(self):
+        return self.token.get(EMAIL_CLAIM, "")
+
+    def is_admin(self):
+        return self.role == "admin"
+
+    def __str__(self):
+        return self.email
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that does not load the User row on each request.
+
+    The user is rebuilt from the `role`/`ver` claims issued by `LoginView` and
+    checked against a small cached auth state, so deactivation, role changes
+    and `User.revoke_tokens()` still take effect: at once in the process that
+    made them and, with a shared cache, everywhere; otherwise within
+    AUTH_STATE_CACHE_TIMEOUT seconds. Queryset `.update()`s skip the refresh
+    and are always bounded by the timeout. Tokens issued without these claims
+    fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not self.has_state_claims(validated_token):
+            return super().get_user(validated_token)
+        state = get_auth_state(self.get_user_id(validated_token))
+        return self.check_state(state, validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of `authenticate()` for the ASGI views in
+        `task_manager.async_api`. Token parsing is pure CPU work; only the
+        auth state (or legacy user) lookup awaits the cache or database.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        if not self.has_state_claims(validated_token):
+            try:
+                user = await User.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            if not user.is_active:
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            return user
+        state = await aget_auth_state(user_id)
+        return self.check_state(state, validated_token)
+
+    @staticmethod
+    def has_state_claims(validated_token):
+        return ROLE_CLAIM in validated_token and VERSION_CLAIM in validated_token
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, ValidationError):
+            raise InvalidToken("Token contained no recognizable user identification")
+
+    @staticmethod
+    def check_state(state, validated_token):
+        if state is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not state["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if state["ver"] != validated_token[VERSION_CLAIM] or state["role"] != validated_token[ROLE_CLAIM]:
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+        return StatelessUser(validated_token)
@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model, load_backend
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+
+from . import hashing
+
+User = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that hashes in the bounded pool from `hashing.py` rather than
+    on the request thread. Behaves like ModelBackend otherwise: unknown users
+    still cost one hash, inactive users are rejected, and passwords stored
+    with an outdated hasher are re-hashed after a successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Same cost as a real check, so response time does not reveal which emails exist.
+            hashing.make_password(password)
+            return None
+        if not hashing.check_password(password, user.password):
+            return None
+        if hashing.needs_rehash(user.password):
+            user.password = hashing.make_password(password)
+            user.save(update_fields=["password"])
+        return user if self.user_can_authenticate(user) else None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """`authenticate` for async views: queries run on the ORM's thread, hashes are awaited in the pool."""
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await sync_to_async(User._default_manager.get_by_natural_key)(username)
+        except User.DoesNotExist:
+            await hashing.amake_password(password)
+            return None
+        if not await hashing.acheck_password(password, user.password):
+            return None
+        if hashing.needs_rehash(user.password):
+            user.password = await hashing.amake_password(password)
+            await user.asave(update_fields=["password"])
+        return user if self.user_can_authenticate(user) else None
+
+
+async def aauthenticate(request=None, **credentials):
+    """
+    Async `django.contrib.auth.authenticate`. Backends with an `aauthenticate`
+    coroutine are awaited; `sync_to_async(authenticate)` would instead run every
+    login on the one thread shared with the async ORM, blocked for each hash.
+    """
+    for path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(path)
+        try:
+            if hasattr(backend, "aauthenticate"):
+                user = await backend.aauthenticate(request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate)(request, **credentials)
+        except PermissionDenied:
+            break
+        if user is not None:
+            user.backend = path
+            return user
+    cleaned = {key: "********************" if key == "password" else value for key, value in credentials.items()}
+    await sync_to_async(user_login_failed.send)(sender=__name__, credentials=cleaned, request=request)
+    return None
@@ -0,0 +1,109 @@
+"""
+Bounded worker pool for password hashing.
+
+Hashing a password is deliberately slow CPU work. Login and registration run
+it through a small shared pool, so a burst of logins uses at most
+`PASSWORD_HASHING_WORKERS` cores and leaves the rest for everything else.
+At most `PASSWORD_HASHING_MAX_PENDING` hashes may be running or queued at
+once. Past that, callers get an immediate 503 instead of waiting in a
+growing queue.
+
+Only hashing runs in the pool. Database reads and writes stay on the request
+thread and its connection. Async views await the pool's futures through the
+`a`-prefixed helpers, so a login waiting on a hash holds no thread at all.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in requests. Please retry shortly."
+    default_code = "hashing_unavailable"
+    # Picked up by DRF's exception handler as the Retry-After header.
+    wait = 1
+
+
+class HashingPool:
+    def __init__(self, workers, max_pending):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule `fn`; raises HashingUnavailable at once if the pool is saturated."""
+        if not self._slots.acquire(blocking=False):
+            raise HashingUnavailable()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        return self.submit(fn, *args, **kwargs).result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_MAX_PENDING)
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_pool(setting, **kwargs):
+    global _pool
+    if setting in ("PASSWORD_HASHING_WORKERS", "PASSWORD_HASHING_MAX_PENDING"):
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = None
+
+
+def make_password(password):
+    """Hash a new password in the pool."""
+    return get_pool().run(hashers.make_password, password)
+
+
+def check_password(password, encoded):
+    """Verify a password against a stored hash in the pool. Never re-hashes; see `needs_rehash`."""
+    return get_pool().run(hashers.check_password, password, encoded)
+
+
+async def amake_password(password):
+    """Async `make_password`."""
+    return await asyncio.wrap_future(get_pool().submit(hashers.make_password, password))
+
+
+async def acheck_password(password, encoded):
+    """Async `check_password`."""
+    return await asyncio.wrap_future(get_pool().submit(hashers.check_password, password, encoded))
+
+
+def needs_rehash(encoded):
+    """True if `encoded` was made by another hasher or with other parameters than the preferred one."""
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
@@ -0,0 +1,26 @@
+"""Background job handlers for user operations too large to run inside a request."""
+from django.conf import settings
+from django.db import transaction
+
+from apps.jobs.queue import register
+from apps.tasks.models import Task
+from .models import User
+
+
+@register("users.delete")
+def delete_user(context, user_id):
+    """Delete a user's tasks in batches, then the user (instead of one long cascade)."""
+    tasks = Task.objects.filter(owner_id=user_id)
+    total = tasks.count()
+    context.progress(0, total)
+    deleted = 0
+    while True:
+        ids = list(tasks.order_by("pk").values_list("pk", flat=True)[:settings.JOBS_BATCH_SIZE])
+        if not ids:
+            break
+        with transaction.atomic():
+            deleted += Task.objects.filter(pk__in=ids).delete()[1].get(Task._meta.label, 0)
+        context.progress(deleted, total)
+    # A retry after the user is gone has nothing left to do.
+    User.objects.filter(pk=user_id).delete()
+    return {"deleted_tasks": deleted}
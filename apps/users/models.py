@@ -9,6 +9,8 @@ class User(AbstractUser):
     ]
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default="user")
     email = models.EmailField(unique=True)
+    # Embedded in issued JWTs; bumping it invalidates every outstanding token.
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
@@ -16,5 +18,10 @@ class User(AbstractUser):
     def is_admin(self):
         return self.role == "admin"
 
+    def revoke_tokens(self):
+        """Invalidate every JWT issued to this user so far."""
+        self.token_version += 1
+        self.save(update_fields=["token_version"])
+
     def __str__(self):
         return self.email
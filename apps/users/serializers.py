@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from . import hashing
 
 User = get_user_model()
 
@@ -13,11 +14,15 @@ class RegisterSerializer(serializers.ModelSerializer):
         extra_kwargs = {"role": {"read_only": True}}
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data["email"],
-            password=validated_data["password"],
+        # Same as `create_user`, but the password is hashed in the bounded pool.
+        # The async view hashes first and passes the result as `encoded_password`.
+        encoded = validated_data.get("encoded_password") or hashing.make_password(validated_data["password"])
+        user = User(
+            username=User.normalize_username(validated_data["username"]),
+            email=User.objects.normalize_email(validated_data["email"]),
+            password=encoded,
         )
+        user.save()
         return user
 
 
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import auth_state, auth_state_cache_key
+from .models import User
+
+
+# Only saves and deletes through the model reach these; a queryset .update() leaves the
+# cached state to expire after AUTH_STATE_CACHE_TIMEOUT seconds. The entry is written to
+# this process's cache, which other workers share only when it is a shared backend.
+@receiver(post_save, sender=User)
+def refresh_auth_state(sender, instance, **kwargs):
+    cache.set(auth_state_cache_key(instance.pk), auth_state(instance), settings.AUTH_STATE_CACHE_TIMEOUT)
+
+
+@receiver(post_delete, sender=User)
+def drop_auth_state(sender, instance, **kwargs):
+    cache.delete(auth_state_cache_key(instance.pk))
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import RegisterView, LoginView, UserListView
+from .views import RegisterView, LoginView, UserDetailView, UserListView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="auth-register"),
     path("login/", LoginView.as_view(), name="auth-login"),
     path("users/", UserListView.as_view(), name="user-list"),
+    path("users/<int:pk>/", UserDetailView.as_view(), name="user-detail"),
 ]
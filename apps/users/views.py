@@ -3,12 +3,15 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate, get_user_model
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .serializers import RegisterSerializer, UserSerializer
+from .authentication import tokens_for_user
+from apps.jobs.queue import enqueue
+from apps.jobs.views import accepted
 from apps.tasks.permissions import IsAdminRole
+from task_manager.throttling import LoginAccountThrottle, LoginRateThrottle, RegisterRateThrottle
 
 User = get_user_model()
 
@@ -31,9 +34,35 @@ class UserListView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
+class UserDetailView(generics.GenericAPIView):
+    """
+    Admin-only: delete a user. The account is deactivated and its tokens
+    revoked before the response (everywhere within AUTH_STATE_CACHE_TIMEOUT
+    seconds without a shared cache); the user and their tasks are deleted by
+    a background job.
+    """
+
+    permission_classes = [IsAdminRole]
+    queryset = User.objects.all()
+
+    @swagger_auto_schema(
+        operation_description="[Admin only] Delete a user and all of their tasks. The account is disabled before the response (within `AUTH_STATE_CACHE_TIMEOUT` seconds on other workers without a shared cache); the deletion runs in the background. Returns 202 with the job to poll.",
+        responses={202: "The queued job", 400: "Cannot delete yourself", 403: "Forbidden", 404: "Not Found"},
+        tags=["Users"],
+    )
+    def delete(self, request, *args, **kwargs):
+        user = self.get_object()
+        if user.pk == request.user.pk:
+            return Response({"detail": "You cannot delete your own account."}, status=status.HTTP_400_BAD_REQUEST)
+        user.is_active = False
+        user.token_version += 1
+        user.save(update_fields=["is_active", "token_version"])
+        return accepted(enqueue("users.delete", owner_id=request.user.pk, user_id=user.pk))
+
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [RegisterRateThrottle]
 
     @swagger_auto_schema(
         request_body=RegisterSerializer,
@@ -51,6 +80,7 @@ class RegisterView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginRateThrottle, LoginAccountThrottle]
 
     @swagger_auto_schema(
         request_body=openapi.Schema(
@@ -86,7 +116,7 @@ class LoginView(APIView):
         if user is None:
             return Response({"detail": "Invalid email or password."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         return Response(
             {
                 "access": str(refresh.access_token),
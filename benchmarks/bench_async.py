@@ -0,0 +1,118 @@
+"""
+Compare the sync DRF task endpoints with their async versions under ASGI.
+
+Requests are sent straight to Django's ASGI application (what uvicorn or
+daphne would call, minus the socket), `--concurrency` at a time, for the list
+page and a task detail. Reports throughput and per-request latency.
+
+    python -m benchmarks.bench_async --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from benchmarks.common import seed, setup_django
+
+
+def asgi_get(application, path, token):
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def call():
+        sent = False
+        status = None
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Keep the connection open; Django stops listening once it has responded.
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await application(scope, receive, send)
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+
+    return call
+
+
+async def load(call, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return {
+        "requests_per_s": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    try:
+        from django.conf import settings
+        from django.core.asgi import get_asgi_application
+        from apps.tasks.models import Task
+        from apps.users.authentication import tokens_for_user
+
+        # Compare the views themselves, not the sync list's page cache.
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        owners = seed(users=args.users, tasks=args.tasks)
+        token = str(tokens_for_user(owners[0]).access_token)
+        task_id = Task.objects.filter(owner=owners[0]).values_list("pk", flat=True).first()
+        application = get_asgi_application()
+
+        endpoints = {"list": "tasks/?page=2", "detail": f"tasks/{task_id}/"}
+        results = {"tasks": args.tasks, "requests": args.requests, "concurrency": args.concurrency, "endpoints": {}}
+        for name, path in endpoints.items():
+            results["endpoints"][name] = {}
+            for stack, prefix in (("sync", "/api/"), ("async", "/api/async/")):
+                call = asgi_get(application, prefix + path, token)
+                asyncio.run(load(call, min(args.requests, args.concurrency), args.concurrency))
+                results["endpoints"][name][stack] = asyncio.run(load(call, args.requests, args.concurrency))
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
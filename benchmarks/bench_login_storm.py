@@ -0,0 +1,101 @@
+"""
+Task detail latency while other threads hammer the login endpoint.
+
+Runs three phases of `--duration` seconds each: no logins, a login storm
+with an effectively unbounded hashing pool (every login hashes at once), and
+the same storm with the bounded pool. Each phase reports task detail latency
+and login status counts. Uses the default (PBKDF2) hasher profile.
+
+    python -m benchmarks.bench_login_storm --storm 16 --workers 2
+"""
+import argparse
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import seed, setup_django
+
+
+def latency_stats(samples):
+    samples = sorted(samples)
+    return {
+        "requests": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storm", type=int, default=16, help="concurrent login threads")
+    parser.add_argument("--workers", type=int, default=2, help="hashing pool size for the bounded phase")
+    parser.add_argument("--pending", type=int, default=8, help="max running+queued hashes for the bounded phase")
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    # Rejected logins are expected here; keep the 503 warnings out of the output.
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    try:
+        from django.db import connection
+        from django.test import Client
+        from django.test.utils import override_settings
+        from apps.tasks.models import Task
+        from apps.users.authentication import tokens_for_user
+
+        owner = seed(users=1, tasks=100)[0]
+        owner.set_password("benchpass123")
+        owner.save()
+        token = str(tokens_for_user(owner).access_token)
+        task_id = Task.objects.values_list("pk", flat=True).first()
+
+        def probe(stop, samples):
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    client.get(f"/api/tasks/{task_id}/")
+                    samples.append((time.perf_counter() - start) * 1000)
+            finally:
+                connection.close()
+
+        def storm(stop, statuses):
+            client = Client()
+            body = {"email": owner.email, "password": "benchpass123"}
+            try:
+                while not stop.is_set():
+                    statuses[client.post("/api/auth/login/", body, content_type="application/json").status_code] += 1
+            finally:
+                connection.close()
+
+        def phase(storm_threads):
+            stop, samples, statuses = threading.Event(), [], Counter()
+            threads = [threading.Thread(target=probe, args=(stop, samples))]
+            threads += [threading.Thread(target=storm, args=(stop, statuses)) for _ in range(storm_threads)]
+            for thread in threads:
+                thread.start()
+            time.sleep(args.duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            return {"task_detail": latency_stats(samples), "logins": dict(statuses)}
+
+        unbounded = {"PASSWORD_HASHING_WORKERS": args.storm, "PASSWORD_HASHING_MAX_PENDING": args.storm}
+        bounded = {"PASSWORD_HASHING_WORKERS": args.workers, "PASSWORD_HASHING_MAX_PENDING": args.pending}
+        results = {"storm_threads": args.storm, "duration_s": args.duration, "phases": {}}
+        results["phases"]["idle"] = phase(0)
+        with override_settings(**unbounded):
+            results["phases"]["unbounded_pool"] = phase(args.storm)
+        with override_settings(**bounded):
+            results["phases"]["bounded_pool"] = phase(args.storm)
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare the JSON backends and response compression on a 100-item task page.
+
+Rendering is timed on the page's data for each JSON_BACKEND. The page is
+then fetched through the full middleware stack once per Accept-Encoding,
+timing the request and recording the bytes sent.
+
+    python -m benchmarks.bench_rendering --page-size 100
+"""
+import argparse
+import json
+
+from benchmarks.common import measure, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    try:
+        from django.conf import settings
+        from django.test import Client
+        from django.test.utils import override_settings
+        from rest_framework_simplejwt.tokens import AccessToken
+        from task_manager import fastjson, middleware
+        from task_manager.renderers import TimedJSONRenderer
+
+        owners = seed(users=1, tasks=args.page_size)
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(owners[0])}")
+        path = f"/api/tasks/?page_size={args.page_size}"
+        data = client.get(path).data
+        renderer = TimedJSONRenderer()
+        backends = ["json"] + (["orjson"] if fastjson.orjson is not None else [])
+
+        rendering = {}
+        for backend in backends:
+            with override_settings(JSON_BACKEND=backend):
+                rendering[backend] = measure(lambda: renderer.render(data), repeat=args.repeat)
+        with override_settings(JSON_BACKEND="json"):
+            expected = renderer.render(data)
+        for backend in backends:
+            with override_settings(JSON_BACKEND=backend):
+                assert renderer.render(data) == expected, f"{backend} output differs"
+
+        encodings = {}
+        for coding in ["identity", "gzip"] + (["br"] if middleware.brotli is not None else []):
+            def fetch():
+                return client.get(path, HTTP_ACCEPT_ENCODING=coding)
+            encodings[coding] = {"bytes": len(fetch().content), **measure(fetch, repeat=max(1, args.repeat // 4))}
+
+        print(json.dumps({
+            "page_size": args.page_size,
+            "json_bytes": len(expected),
+            "json_backend": fastjson.backend(),
+            "compression_min_size": settings.COMPRESSION_MIN_SIZE,
+            "render": rendering,
+            "request": encodings,
+        }, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare DRF's `icontains` SearchFilter with the full-text TaskSearchFilter.
+
+Each sample is what a list page does: `COUNT(*)` for the paginator plus the
+first page of 10. Without `--term`, a very common, a mid-frequency and a rare
+word from the seeded vocabulary are benchmarked.
+
+    python -m benchmarks.bench_search --tasks 20000
+    python -m benchmarks.bench_search --tasks 20000 --term "invoice budg"
+"""
+import argparse
+import json
+
+from benchmarks.common import measure, seed, setup_django, vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--term", action="append", help="search string (repeatable)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    words = vocabulary()
+    terms = args.term or [words[0], words[100], words[3000]]
+
+    teardown = setup_django()
+    try:
+        from rest_framework import filters
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from apps.tasks.models import Task
+        from apps.tasks.search import TaskSearchFilter
+        from apps.tasks.views import TaskListCreateView
+
+        owners = seed(users=args.users, tasks=args.tasks)
+        view = TaskListCreateView()
+        base = Task.objects.filter(owner=owners[0])
+
+        def run(backend, request):
+            def page():
+                queryset = backend.filter_queryset(request, base, view)
+                return queryset.count(), list(queryset[:10])
+            return page
+
+        results = {"tasks": args.tasks, "users": args.users, "terms": {}}
+        for term in terms:
+            request = Request(APIRequestFactory().get("/api/tasks/", {"search": term}))
+            results["terms"][term] = {
+                "matches": run(TaskSearchFilter(), request)()[0],
+                "search_filter": measure(run(filters.SearchFilter(), request), repeat=args.repeat),
+                "full_text": measure(run(TaskSearchFilter(), request), repeat=args.repeat),
+            }
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
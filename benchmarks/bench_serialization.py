@@ -0,0 +1,51 @@
+"""
+Compare TaskSerializer with the fast read path on a full 100-item page.
+
+Each sample fetches the page from the database, builds the output and
+renders it to JSON, as TaskListCreateView.get does.
+
+    python -m benchmarks.bench_serialization --page-size 100
+"""
+import argparse
+import json
+
+from benchmarks.common import measure, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    teardown = setup_django()
+    try:
+        from rest_framework.renderers import JSONRenderer
+        from apps.tasks.models import Task
+        from apps.tasks.serializers import TASK_VALUE_FIELDS, TaskSerializer, task_rows_representation
+
+        owners = seed(users=1, tasks=args.page_size)
+        page = Task.objects.filter(owner=owners[0]).select_related("owner")[: args.page_size]
+        renderer = JSONRenderer()
+
+        def model_serializer():
+            return renderer.render(TaskSerializer(page.all(), many=True).data)
+
+        def fast_path():
+            return renderer.render(task_rows_representation(page.values(*TASK_VALUE_FIELDS)))
+
+        assert model_serializer() == fast_path()
+        serializer = measure(model_serializer, repeat=args.repeat)
+        fast = measure(fast_path, repeat=args.repeat)
+        print(json.dumps({
+            "page_size": args.page_size,
+            "task_serializer": serializer,
+            "fast_path": fast,
+            "speedup": round(serializer["p50_ms"] / fast["p50_ms"], 2),
+        }, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
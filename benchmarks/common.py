@@ -0,0 +1,121 @@
+"""
+Shared helpers for the standalone benchmark scripts.
+
+Each script boots Django against a throwaway test database (in-memory for the
+default SQLite profile), seeds it, and prints timings. Run from the repo root:
+
+    python -m benchmarks.bench_search --tasks 20000
+"""
+import itertools
+import os
+import random
+import statistics
+import time
+
+WORDS = (
+    "report invoice budget meeting review deploy release migrate design draft email call "
+    "customer finance roadmap sprint backlog bug fix refactor test docs onboarding audit "
+    "security backup server client payment contract schedule planning research hiring"
+).split()
+
+
+def setup_django():
+    """Configure Django and create an isolated test database; returns a teardown callable."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    settings.ALLOWED_HOSTS = ["*"]
+    # Each scenario repeats one client's request far past any rate limit.
+    settings.THROTTLE_ENABLED = False
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    return teardown
+
+
+def vocabulary(seed_value=42, size=5000):
+    """
+    Common words followed by a long tail of synthetic ones, in frequency-rank
+    order: `vocabulary()[0]` is the most frequent word in seeded text.
+    """
+    rng = random.Random(seed_value)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    tail = {"".join(rng.choice(letters) for _ in range(rng.randint(5, 9))) for _ in range(size)}
+    return WORDS + sorted(tail - set(WORDS))
+
+
+def seed(users=10, tasks=1000, seed_value=42, batch_size=2000):
+    """Bulk-create `users` users and `tasks` Zipf-worded tasks spread across them."""
+    from django.contrib.auth import get_user_model
+    from apps.tasks.models import Task
+
+    User = get_user_model()
+    rng = random.Random(seed_value)
+    words = vocabulary(seed_value)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+    def sentence(length):
+        return " ".join(rng.choices(words, cum_weights=cum_weights, k=length))
+
+    owners = User.objects.bulk_create(
+        [User(email=f"bench{i}@example.com", username=f"bench{i}", password="!") for i in range(users)]
+    )
+    Task.objects.bulk_create(
+        (
+            Task(
+                title=sentence(4),
+                description=sentence(30),
+                completed=rng.random() < 0.3,
+                owner=owners[i % users],
+            )
+            for i in range(tasks)
+        ),
+        batch_size=batch_size,
+    )
+    return owners
+
+
+def measure(fn, repeat=20, warmup=2):
+    """Call `fn` repeatedly and return latency stats in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "mean_ms": round(mean, 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        # Single-caller throughput implied by the mean latency.
+        "ops_per_s": round(1000 / mean, 1) if mean else None,
+    }
+
+
+def count_queries(fn):
+    """Run `fn` once and return the number of SQL statements it executed on the default database."""
+    from django.db import connection
+
+    executed = []
+
+    def record(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    # An execute wrapper rather than CaptureQueriesContext: the test client's
+    # request_started signal clears connection.queries mid-capture.
+    with connection.execute_wrapper(record):
+        fn()
+    return len(executed)
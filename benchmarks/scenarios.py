@@ -0,0 +1,190 @@
+"""
+API scenarios shared by the standalone suite runner (`benchmarks.suite`) and
+the pytest-benchmark module (`benchmarks/test_api.py`).
+
+Each scenario goes through the full Django stack with the test client
+(URL routing, middleware, authentication, view, rendering) and checks the
+response status, so a broken endpoint cannot pass as a fast one.
+"""
+from dataclasses import dataclass, field
+
+LOGIN_PASSWORD = "benchpass123"
+
+
+@dataclass
+class Context:
+    """Seeded data and authenticated clients the scenarios run against."""
+
+    owner: object
+    admin: object
+    user_client: object
+    admin_client: object
+    anonymous_client: object
+    task_ids: list
+    deep_page: int
+    search_term: str
+    sync_token: str
+    created_ids: list = field(default_factory=list)
+
+
+def prepare(users=10, tasks=10000):
+    """Seed `users` users and `tasks` tasks plus an admin; return a Context."""
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from apps.tasks import analytics
+    from apps.tasks.models import Task
+    from apps.tasks.pagination import TaskPagination
+    from apps.users.authentication import tokens_for_user
+    from benchmarks.common import seed, vocabulary
+
+    owners = seed(users=users, tasks=tasks)
+    owner = owners[0]
+    owner.set_password(LOGIN_PASSWORD)
+    owner.save()
+    admin = get_user_model().objects.create_user(
+        email="bench-admin@example.com", username="bench-admin", password=LOGIN_PASSWORD, role="admin"
+    )
+
+    def client_for(user):
+        return Client(HTTP_AUTHORIZATION=f"Bearer {tokens_for_user(user).access_token}")
+
+    task_ids = list(Task.objects.filter(owner=owner).order_by("pk").values_list("pk", flat=True)[:100])
+    owned = Task.objects.filter(owner=owner).count()
+    # Analytics requests then read current rollups rather than running the first full build.
+    analytics.backfill()
+    return Context(
+        owner=owner,
+        admin=admin,
+        user_client=client_for(owner),
+        admin_client=client_for(admin),
+        anonymous_client=Client(),
+        task_ids=task_ids,
+        deep_page=max(1, owned // TaskPagination.page_size),
+        # A mid-frequency word: selective, but with more than a page of matches.
+        search_term=vocabulary()[100],
+        # A token from before the last 100 changes, so each call returns a typical delta.
+        sync_token=sync_token_before(100),
+    )
+
+
+def sync_token_before(count):
+    from apps.tasks.changes import format_token
+    from apps.tasks.models import TaskChange
+
+    position = TaskChange.objects.order_by("-transaction_id", "-id").values_list("transaction_id", "id")[count:count + 1]
+    return format_token(position[0] if position else (0, 0))
+
+
+def request(client, method, path, expected, data=None):
+    def call():
+        if data is None:
+            response = getattr(client, method)(path)
+        else:
+            response = getattr(client, method)(path, data, content_type="application/json")
+        if response.status_code != expected:
+            raise AssertionError(f"{method.upper()} {path} returned {response.status_code}, expected {expected}")
+        return response
+
+    return call
+
+
+def list_first_page(ctx):
+    return request(ctx.user_client, "get", "/api/tasks/", 200)
+
+
+def list_deep_page(ctx):
+    return request(ctx.user_client, "get", f"/api/tasks/?page={ctx.deep_page}", 200)
+
+
+def list_cursor(ctx):
+    return request(ctx.user_client, "get", "/api/tasks/?pagination=cursor", 200)
+
+
+def list_search(ctx):
+    return request(ctx.user_client, "get", f"/api/tasks/?search={ctx.search_term}", 200)
+
+
+def list_completed(ctx):
+    return request(ctx.user_client, "get", "/api/tasks/?completed=true", 200)
+
+
+def list_admin_all(ctx):
+    return request(ctx.admin_client, "get", "/api/tasks/", 200)
+
+
+def list_page_100(ctx):
+    return request(ctx.user_client, "get", "/api/tasks/?page_size=100", 200)
+
+
+def list_compact(ctx):
+    return request(ctx.user_client, "get", "/api/tasks/?fields=id,title,completed&compact=true", 200)
+
+
+def detail(ctx):
+    return request(ctx.user_client, "get", f"/api/tasks/{ctx.task_ids[0]}/", 200)
+
+
+def create(ctx):
+    call = request(ctx.user_client, "post", "/api/tasks/", 201, {"title": "Benchmark task", "description": "created"})
+
+    def create_task():
+        ctx.created_ids.append(call().json()["id"])
+
+    return create_task
+
+
+def update(ctx):
+    path = f"/api/tasks/{ctx.task_ids[1]}/"
+    calls = [request(ctx.user_client, "patch", path, 200, {"completed": value}) for value in (True, False)]
+    state = {"i": 0}
+
+    def toggle():
+        state["i"] ^= 1
+        return calls[state["i"]]()
+
+    return toggle
+
+
+def changes(ctx):
+    return request(ctx.user_client, "get", f"/api/tasks/changes/?since={ctx.sync_token}", 200)
+
+
+def stats(ctx):
+    return request(ctx.user_client, "get", "/api/tasks/stats/", 200)
+
+
+def admin_stats(ctx):
+    return request(ctx.admin_client, "get", "/api/tasks/stats/all/", 200)
+
+
+def admin_analytics(ctx):
+    return request(ctx.admin_client, "get", "/api/tasks/analytics/", 200)
+
+
+def login(ctx):
+    return request(ctx.anonymous_client, "post", "/api/auth/login/", 200, {"email": ctx.owner.email, "password": LOGIN_PASSWORD})
+
+
+def admin_user_list(ctx):
+    return request(ctx.admin_client, "get", "/api/auth/users/", 200)
+
+
+SCENARIOS = {
+    "list_first_page": list_first_page,
+    "list_deep_page": list_deep_page,
+    "list_cursor": list_cursor,
+    "list_search": list_search,
+    "list_completed": list_completed,
+    "list_admin_all": list_admin_all,
+    "list_page_100": list_page_100,
+    "list_compact": list_compact,
+    "detail": detail,
+    "create": create,
+    "update": update,
+    "changes": changes,
+    "stats": stats,
+    "admin_stats": admin_stats,
+    "admin_analytics": admin_analytics,
+    "login": login,
+    "admin_user_list": admin_user_list,
+}
@@ -0,0 +1,110 @@
+"""
+Run every API scenario in `benchmarks.scenarios` and write the results as JSON.
+
+Each scenario reports latency (mean/p50/p99), single-client throughput and
+the number of SQL statements one request runs. With `--baseline`, results
+are compared against an earlier run. The exit status is 1 when a scenario's
+p50 grew by more than `--threshold` or its query count went up.
+
+    python -m benchmarks.suite --tasks 20000 --output bench.json
+    python -m benchmarks.suite --tasks 20000 --baseline bench.json
+
+The task list page cache is disabled unless `--list-cache` is given, so
+list scenarios measure the database path.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks.common import count_queries, measure, setup_django
+
+
+def compare(results, baseline, threshold):
+    """Return `{scenario: {...}}` deltas and a list of regression messages."""
+    deltas, regressions = {}, []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else 1.0
+        deltas[name] = {
+            "p50_ratio": round(ratio, 3),
+            "queries_delta": current["queries"] - previous["queries"],
+        }
+        if ratio > threshold:
+            regressions.append(f"{name}: p50 {previous['p50_ms']}ms -> {current['p50_ms']}ms ({ratio:.2f}x)")
+        if current["queries"] > previous["queries"]:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+    return deltas, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--scenario", action="append", help="run only these scenarios (repeatable)")
+    parser.add_argument("--list-cache", action="store_true", help="keep the task list page cache enabled")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p50 ratio that counts as a regression")
+    args = parser.parse_args()
+
+    regressions = []
+    teardown = setup_django()
+    try:
+        import django
+        from django.conf import settings
+        from django.db import connection
+        from benchmarks.scenarios import SCENARIOS, prepare
+
+        # One process does every write, so the in-process cache stays coherent here.
+        settings.TASK_LIST_CACHE_TIMEOUT = 300 if args.list_cache else 0
+        names = args.scenario or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+        ctx = prepare(users=args.users, tasks=args.tasks)
+        results = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "users": args.users,
+                "tasks": args.tasks,
+                "repeat": args.repeat,
+                "list_cache": args.list_cache,
+            },
+            "scenarios": {},
+        }
+        for name in names:
+            call = SCENARIOS[name](ctx)
+            queries = count_queries(call)
+            stats = measure(call, repeat=args.repeat)
+            stats["queries"] = queries
+            results["scenarios"][name] = stats
+            print(f"{name:<18} p50 {stats['p50_ms']:>9.3f}ms  p99 {stats['p99_ms']:>9.3f}ms  "
+                  f"{stats['ops_per_s']:>8.1f}/s  {stats['queries']} queries", file=sys.stderr)
+
+        if args.baseline:
+            with open(args.baseline) as handle:
+                results["comparison"], regressions = compare(results, json.load(handle), args.threshold)
+        output = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, "w") as handle:
+                handle.write(output + "\n")
+        else:
+            print(output)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+    finally:
+        teardown()
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
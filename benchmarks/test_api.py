@@ -0,0 +1,45 @@
+"""
+The `benchmarks.scenarios` API scenarios as pytest-benchmark tests.
+
+Requires `pip install pytest-benchmark`. Not collected by the regular test
+run; invoke it explicitly:
+
+    pytest benchmarks/test_api.py --benchmark-json=bench.json
+    pytest benchmarks/test_api.py --benchmark-compare --benchmark-compare-fail=median:25%
+
+Volumes come from BENCH_USERS / BENCH_TASKS (default 10 / 2000). It runs
+with the test settings, so `login` uses the fast test password hasher.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.common import count_queries  # noqa: E402
+from benchmarks.scenarios import SCENARIOS, prepare  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def bench_context(django_db_setup, django_db_blocker):
+    from django.contrib.auth import get_user_model
+
+    with django_db_blocker.unblock():
+        ctx = prepare(users=int(os.getenv("BENCH_USERS", "10")), tasks=int(os.getenv("BENCH_TASKS", "2000")))
+        yield ctx
+        # Tasks go with their owners.
+        get_user_model().objects.all().delete()
+
+
+@pytest.fixture(autouse=True)
+def measure_database_path(settings):
+    settings.TASK_LIST_CACHE_TIMEOUT = 0
+    settings.THROTTLE_ENABLED = False
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario(benchmark, bench_context, name):
+    call = SCENARIOS[name](bench_context)
+    benchmark.extra_info["queries"] = count_queries(call)
+    benchmark(call)
@@ -0,0 +1,133 @@
+"""
+A minimal async counterpart of DRF's APIView for ASGI deployments.
+
+DRF views are synchronous, so under an ASGI server every request is handed to
+a worker thread. `AsyncAPIView` is a plain Django class-based view with async
+handlers: it authenticates with `aauthenticate()`, checks the usual DRF
+permission classes (which must not do I/O), applies the throttles (awaiting
+`aallow_request()` where a throttle has one) and renders JSON with DRF's
+renderer, so responses and error bodies match the sync endpoints.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.users.authentication import StatelessJWTAuthentication
+from . import fastjson
+from .parsers import FastJSONParser
+from .renderers import TimedJSONRenderer
+
+
+class AsyncAPIView(View):
+    # Every authentication class must implement `aauthenticate(request)`.
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    renderer = TimedJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Token-authenticated like the DRF views, so no CSRF check.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        # A DRF Request wrapper lets filter backends, permissions and throttles
+        # read `query_params`, `user` and (JSON only) `data`; handlers parse
+        # the body with `get_data()`.
+        self.request = Request(request, parsers=[FastJSONParser()], authenticators=())
+        try:
+            user, auth = await self.aauthenticate(request)
+            self.request.user, self.request.auth = user, auth
+            self.check_permissions(self.request)
+            await self.check_throttles(self.request)
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            response = await handler(self.request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return response
+
+    async def aauthenticate(self, request):
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().aauthenticate(request)
+            if result is not None:
+                return result
+        return AnonymousUser(), None
+
+    def check_permissions(self, request):
+        for permission in [permission_class() for permission_class in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                self.permission_denied(request, getattr(permission, "message", None))
+
+    def check_object_permissions(self, request, obj):
+        for permission in [permission_class() for permission_class in self.permission_classes]:
+            if not permission.has_object_permission(request, self, obj):
+                self.permission_denied(request, getattr(permission, "message", None))
+
+    async def check_throttles(self, request):
+        waits = []
+        for throttle in [throttle_class() for throttle_class in self.throttle_classes]:
+            if hasattr(throttle, "aallow_request"):
+                allowed = await throttle.aallow_request(request, self)
+            else:
+                allowed = await sync_to_async(throttle.allow_request)(request, self)
+            if not allowed:
+                waits.append(throttle.wait())
+        if waits:
+            durations = [wait for wait in waits if wait is not None]
+            raise exceptions.Throttled(max(durations, default=None))
+
+    def permission_denied(self, request, message=None):
+        if not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(detail=message)
+
+    def get_data(self, request):
+        """Parse a JSON request body (an empty body is an empty object)."""
+        body = request.body
+        if not body:
+            return {}
+        content_type = request.content_type or ""
+        if content_type and not content_type.startswith("application/json"):
+            raise exceptions.UnsupportedMediaType(content_type)
+        try:
+            return fastjson.loads(body)
+        except ValueError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
+
+    def respond(self, data=None, status=200, headers=None):
+        content = b"" if data is None else self.renderer.render(data)
+        response = HttpResponse(content, status=status, content_type="application/json", headers=headers)
+        if data is None:
+            del response["Content-Type"]
+        return response
+
+    def handle_exception(self, exc):
+        """Same mapping as DRF's default exception handler."""
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*(exc.args))
+        elif isinstance(exc, PermissionDenied):
+            exc = exceptions.PermissionDenied(*(exc.args))
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+
+        headers = {}
+        status = exc.status_code
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            if self.authentication_classes:
+                headers["WWW-Authenticate"] = self.authentication_classes[0]().authenticate_header(self.request)
+            else:
+                status = 403
+        if getattr(exc, "wait", None):
+            headers["Retry-After"] = "%d" % exc.wait
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        return self.respond(data, status=status, headers=headers)
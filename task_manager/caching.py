@@ -0,0 +1,15 @@
+"""
+Whether a cache is visible to every process.
+
+Invalidation written to a process-local cache (`LocMemCache`) reaches only
+the process that wrote it: other web workers, the job worker and management
+commands keep reading their own copies. Features that rely on invalidating
+across processes check `is_shared()` before they turn themselves on.
+"""
+from django.conf import settings
+
+PROCESS_LOCAL_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def is_shared(alias="default"):
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
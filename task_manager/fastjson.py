@@ -0,0 +1,73 @@
+"""
+JSON encoding and decoding for the API renderer and parsers.
+
+`JSON_BACKEND` picks the library: "orjson" (when installed), "json" (the
+standard library), or "auto", which uses orjson if it imports. Output is
+kept the same as DRF's `JSONRenderer` with the default settings: compact,
+UTF-8, `\u2028`/`\u2029` escaped, and datetimes, Decimals, lazy strings and
+the rest formatted by DRF's encoder. Anything orjson cannot encode at all
+(integers past 64 bits, for example) goes through the standard library, and
+so do request bodies that may hold such integers, which orjson would parse
+as floats.
+"""
+import json
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.utils import json as drf_json
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKENDS = ("auto", "orjson", "json")
+
+# 20 digits: one more than the longest signed 64-bit integer.
+LONG_DIGITS = re.compile(r"[0-9]{20}")
+LONG_DIGITS_BYTES = re.compile(rb"[0-9]{20}")
+
+_drf_encoder = JSONEncoder()
+if orjson is not None:
+    # Datetimes go through DRF's encoder, which trims them to milliseconds and writes UTC as "Z".
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def backend():
+    """The library in use for the current JSON_BACKEND: "orjson" or "json"."""
+    choice = settings.JSON_BACKEND
+    if choice not in BACKENDS:
+        raise ImproperlyConfigured(f"JSON_BACKEND must be one of {', '.join(BACKENDS)}, not {choice!r}.")
+    if choice == "auto":
+        return "json" if orjson is None else "orjson"
+    if choice == "orjson" and orjson is None:
+        raise ImproperlyConfigured("JSON_BACKEND is 'orjson' but orjson is not installed.")
+    return choice
+
+
+def dumps(data):
+    """`data` as compact UTF-8 JSON bytes."""
+    if backend() == "orjson":
+        try:
+            content = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # Valid JSON either way, but not valid JavaScript; DRF escapes them too.
+            if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+                content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+            return content
+    content = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    return content.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode("utf-8")
+
+
+def loads(content):
+    """Parse JSON from UTF-8 `bytes` or a `str`. Raises ValueError on invalid input, NaN and Infinity included."""
+    # orjson reads integers past 64 bits as floats. Any run of 20+ digits may be
+    # one, so those bodies go to the standard library, which keeps them exact.
+    long_digits = LONG_DIGITS_BYTES if isinstance(content, bytes) else LONG_DIGITS
+    if backend() == "orjson" and not long_digits.search(content):
+        return orjson.loads(content)
+    return drf_json.loads(content)
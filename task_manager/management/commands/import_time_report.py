@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = "Report where a fresh worker spends its startup time, from `python -X importtime`."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--api-only", action="store_true", help="Profile the API_ONLY deployment profile")
+        parser.add_argument("--full", action="store_true", help="Profile the full profile even if API_ONLY is set")
+        parser.add_argument("--top", type=int, default=25, help="Number of modules to list (default 25)")
+
+    def handle(self, *args, **options):
+        api_only = True if options["api_only"] else False if options["full"] else None
+        timed = profile_startup(api_only=api_only)
+        profile = profile_startup(api_only=api_only, importtime=True)
+        top = options["top"]
+
+        self.stdout.write(f"Startup: {timed.seconds * 1000:.0f} ms, {timed.module_count} modules loaded "
+                          f"({len(profile.imports)} imported by the application)")
+        self.stdout.write("\nSlowest modules by self time (self ms, cumulative ms):")
+        for record in profile.slowest(top, key="self_us"):
+            self.stdout.write(f"  {record.self_us / 1000:8.1f} {record.cumulative_us / 1000:8.1f}  {record.module}")
+        self.stdout.write("\nSelf time by top-level package (ms):")
+        for package, self_us in list(profile.by_package().items())[:top]:
+            self.stdout.write(f"  {self_us / 1000:8.1f}  {package}")
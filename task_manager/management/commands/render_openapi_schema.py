@@ -0,0 +1,33 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager.schema import SPEC_RENDERERS, file_name, render
+
+
+class Command(BaseCommand):
+    help = "Pre-render the OpenAPI schema to static openapi.json / openapi.yaml files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            help="Directory to write to (default: OPENAPI_SCHEMA_DIR, else ./schema)",
+        )
+        parser.add_argument("--format", choices=sorted(SPEC_RENDERERS), action="append",
+                            help="Only write this format (repeatable; default: all)")
+        parser.add_argument("--url", help="Base URL baked into the schema, e.g. https://api.example.com "
+                                          "(default: none, clients use the host they fetched it from)")
+
+    def handle(self, *args, **options):
+        output_dir = options["output_dir"] or settings.OPENAPI_SCHEMA_DIR or "schema"
+        os.makedirs(output_dir, exist_ok=True)
+        for fmt in options["format"] or sorted(SPEC_RENDERERS):
+            renderer_class = SPEC_RENDERERS[fmt]
+            document = render(renderer_class, url=options["url"])
+            path = os.path.join(output_dir, file_name(renderer_class))
+            # Write then rename, so a web server never serves a half-written file.
+            with open(path + ".tmp", "wb") as handle:
+                handle.write(document.content)
+            os.replace(path + ".tmp", path)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path} ({len(document.content)} bytes, ETag {document.etag})"))
@@ -0,0 +1,191 @@
+"""
+In-process request metrics, exported in the Prometheus text format.
+
+`RequestMetricsMiddleware` (task_manager.middleware) opens a `RequestStats`
+for each request. While it is active, every SQL statement run by any
+connection is counted and timed by `record_query`, and code wrapped in
+`serialization_timer()` adds to the serialization time. When the response
+is ready, the totals go into per-view histograms keyed by URL name.
+
+Metrics are per process. With several workers, scrape each one or use a
+single worker per scrape target.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def format_labels(names, values, extra=""):
+    pairs = [
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{%s}" % ",".join(pairs) if pairs else ""
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, label_values=(), amount=1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{format_labels(self.labels, label_values)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._values = {}
+
+    def observe(self, label_values, value):
+        counts, total = self._values.get(label_values, (None, 0))
+        if counts is None:
+            # One slot per bucket plus +Inf; cumulated when rendered.
+            counts = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self._values[label_values] = (counts, total + value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = 'le="%s"' % (bound if bound == "+Inf" else format_value(float(bound)))
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, label_values, le)} {cumulative}")
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {format_value(float(total))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class RequestStats:
+    """Totals for the request being handled; see `activate`."""
+
+    __slots__ = ("queries", "sql_seconds", "serialization_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+
+# A context variable rather than a thread-local, so queries that the async ORM
+# runs in worker threads are still attributed to the request that made them.
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+def activate(stats):
+    return _current.set(stats)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper: counts and times statements made during a request."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(connection, **kwargs):
+    """Add `record_query` to a connection's execute wrappers (idempotent; `connection_created` receiver)."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serialization_timer():
+    """Count the time spent in the block as serialization for the current request."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serialization_seconds += time.perf_counter() - start
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collectors = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter(
+                "http_requests_total", "Requests handled, by URL name, method and status.", ("view", "method", "status")
+            )
+            self.latency = Histogram(
+                "http_request_duration_seconds", "Time to produce the response, by URL name.", ("view", "method")
+            )
+            self.queries = Histogram(
+                "http_request_db_queries", "SQL statements per request, by URL name.", ("view", "method"), QUERY_BUCKETS
+            )
+            self.sql_time = Histogram(
+                "http_request_db_duration_seconds", "Time spent in SQL per request, by URL name.", ("view", "method")
+            )
+            self.serialization_time = Histogram(
+                "http_request_serialization_duration_seconds",
+                "Time spent serializing and rendering response data per request, by URL name.",
+                ("view", "method"),
+            )
+
+    def register_collector(self, collector):
+        """Add a callable returning extra exposition lines (e.g. an app's own counters)."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def observe_request(self, view, method, status, duration, stats):
+        labels = (view, method)
+        with self._lock:
+            self.requests.inc((view, method, str(status)))
+            self.latency.observe(labels, duration)
+            self.queries.observe(labels, stats.queries)
+            self.sql_time.observe(labels, stats.sql_seconds)
+            self.serialization_time.observe(labels, stats.serialization_seconds)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.latency, self.queries, self.sql_time, self.serialization_time):
+                lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
@@ -0,0 +1,366 @@
+import cProfile
+import os
+import threading
+import time
+import uuid
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException
+
+from apps.users.authentication import StatelessJWTAuthentication
+from . import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/csv")
+# Brotli's top qualities are too slow per request; 4 still beats gzip's ratio.
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+# Uncompressed bytes between flushes of a streamed response.
+STREAM_FLUSH_SIZE = 64 * 1024
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL statement count and time, and serialization time per
+    URL name into `metrics.registry` (served at /api/metrics/). Put it first
+    in MIDDLEWARE so the timing includes the other middleware.
+
+    With REQUEST_PROFILING_ENABLED, an admin request carrying `X-Profile: 1`
+    is run under cProfile. The stats are written to REQUEST_PROFILE_DIR and
+    the file name is returned in the `X-Profile` response header. Under ASGI
+    the profile also includes other coroutines running on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        connection_created.connect(metrics.install_query_recorder, dispatch_uid="request-metrics")
+        for connection in connections.all(initialized_only=True):
+            metrics.install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats = metrics.RequestStats()
+        token = metrics.activate(stats)
+        start = time.perf_counter()
+        try:
+            if self.profiling_requested(request) and self.is_admin(request):
+                profiler = cProfile.Profile()
+                response = profiler.runcall(self.get_response, request)
+                self.save_profile(profiler, request, response)
+            else:
+                response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        self.observe(request, response, time.perf_counter() - start, stats)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        stats = metrics.RequestStats()
+        token = metrics.activate(stats)
+        start = time.perf_counter()
+        try:
+            if self.profiling_requested(request) and await self.ais_admin(request):
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    profiler.disable()
+                self.save_profile(profiler, request, response)
+            else:
+                response = await self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        self.observe(request, response, time.perf_counter() - start, stats)
+        return response
+
+    def observe(self, request, response, duration, stats):
+        match = request.resolver_match
+        # Unresolved paths share one label so scanners cannot grow the series count.
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        metrics.registry.observe_request(view, request.method, response.status_code, duration, stats)
+
+    def profiling_requested(self, request):
+        return settings.REQUEST_PROFILING_ENABLED and request.META.get(PROFILE_HEADER, "") not in ("", "0")
+
+    def is_admin(self, request):
+        try:
+            result = StatelessJWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+        return result is not None and result[0].role == "admin"
+
+    async def ais_admin(self, request):
+        try:
+            result = await StatelessJWTAuthentication().aauthenticate(request)
+        except APIException:
+            return False
+        return result is not None and result[0].role == "admin"
+
+    def save_profile(self, profiler, request, response):
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else "unmatched"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{view}-{uuid.uuid4().hex[:8]}.prof"
+        os.makedirs(settings.REQUEST_PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(settings.REQUEST_PROFILE_DIR, name))
+        response["X-Profile"] = name
+
+
+class InFlight:
+    """Requests being handled by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.shed = 0
+
+    def enter(self, limit):
+        """Count a request in; False (and counted as shed) if `limit` are already in flight."""
+        with self._lock:
+            if limit and self.current >= limit:
+                self.shed += 1
+                return False
+            self.current += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.current -= 1
+
+    def metrics_lines(self):
+        with self._lock:
+            current, shed = self.current, self.shed
+        return [
+            "# HELP http_requests_in_flight Requests being handled by this process.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {current}",
+            "# HELP http_requests_shed_total Requests rejected with 503 because too many were in flight.",
+            "# TYPE http_requests_shed_total counter",
+            f"http_requests_shed_total {shed}",
+        ]
+
+
+in_flight = InFlight()
+metrics.registry.register_collector(in_flight.metrics_lines)
+
+
+class LoadSheddingMiddleware:
+    """
+    Answers 503 with Retry-After, without running the view, while
+    LOAD_SHED_MAX_IN_FLIGHT requests are already in flight in this process.
+    Past that point, queueing more work only makes every request slower;
+    rejecting it at once lets clients back off and the rest finish.
+    Streaming responses count until the view returns, not until the body is
+    sent. Paths in LOAD_SHED_EXEMPT_PATHS are never shed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if self.exempt(request):
+            return self.get_response(request)
+        if not in_flight.enter(settings.LOAD_SHED_MAX_IN_FLIGHT):
+            return self.shed_response()
+        try:
+            return self.get_response(request)
+        finally:
+            in_flight.leave()
+
+    async def __acall__(self, request):
+        if self.exempt(request):
+            return await self.get_response(request)
+        if not in_flight.enter(settings.LOAD_SHED_MAX_IN_FLIGHT):
+            return self.shed_response()
+        try:
+            return await self.get_response(request)
+        finally:
+            in_flight.leave()
+
+    def exempt(self, request):
+        return request.path in settings.LOAD_SHED_EXEMPT_PATHS
+
+    def shed_response(self):
+        return JsonResponse(
+            {"detail": "The server is busy. Please retry shortly."},
+            status=503,
+            headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+        )
+
+
+def accepted_codings(header):
+    """Accept-Encoding -> `{coding: q-value}`."""
+    codings = {}
+    for part in header.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def new_compressor(coding):
+    """`(process, flush, finish)` for an incremental `coding` ("br" or "gzip") stream."""
+    if coding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits 31: gzip framing (with a zero mtime, so equal bodies compress identically).
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def stream_compressor(coding):
+    """
+    `(feed, finish)` for a streamed `coding` body. `feed(chunk)` returns what is
+    ready to send, flushing once STREAM_FLUSH_SIZE bytes have gone in since the
+    last flush: often enough that an export still arrives as it is produced,
+    rarely enough that each sync flush's block overhead and reset history
+    don't cost the ratio.
+    """
+    process, flush, finish = new_compressor(coding)
+    pending = 0
+
+    def feed(chunk):
+        nonlocal pending
+        pending += len(chunk)
+        data = process(chunk)
+        if pending >= STREAM_FLUSH_SIZE:
+            pending = 0
+            data += flush()
+        return data
+
+    return feed, finish
+
+
+def compress_stream(coding, chunks):
+    feed, finish = stream_compressor(coding)
+    for chunk in chunks:
+        data = feed(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_stream(coding, chunks):
+    feed, finish = stream_compressor(coding)
+    async for chunk in chunks:
+        data = feed(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses JSON, NDJSON and CSV responses of at least COMPRESSION_MIN_SIZE
+    bytes with brotli (if the `brotli` package is installed) or gzip, the
+    first of them the client's Accept-Encoding allows. Streamed responses are
+    compressed chunk by chunk whatever their size.
+
+    HTML is never compressed: the browsable API and admin pages carry CSRF
+    tokens, which compression would expose to BREACH-style attacks. Responses
+    with a strong ETag are sent as they are: a strong tag names one exact
+    body, and If-Match on task writes compares it strongly, so it can be
+    neither shared with a compressed body nor weakened the way Django's
+    GZipMiddleware does. Weak ETags (task lists, the schema) are kept as is.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        min_size = settings.COMPRESSION_MIN_SIZE
+        if not min_size or response.has_header("Content-Encoding") or not self.compressible(response):
+            return response
+        if not response.streaming and len(response.content) < min_size:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = self.negotiate(request)
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(coding, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(coding, response.streaming_content)
+            # The compressed size is not known until the stream ends.
+            del response.headers["Content-Length"]
+        else:
+            process, _, finish = new_compressor(coding)
+            content = process(response.content) + finish()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+        response.headers["Content-Encoding"] = coding
+        return response
+
+    def compressible(self, response):
+        if response.has_header("ETag") and not response["ETag"].startswith("W/"):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        return content_type in COMPRESSIBLE_TYPES
+
+    def negotiate(self, request):
+        codings = accepted_codings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+            if codings.get(coding, codings.get("*", 0)) > 0:
+                return coding
+        return None
@@ -0,0 +1,22 @@
+import codecs
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+
+from . import fastjson
+
+
+class FastJSONParser(JSONParser):
+    """DRF's JSONParser on the JSON_BACKEND library (see task_manager.fastjson)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if fastjson.backend() == "json" or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        encoding = get_encoding(parser_context or {})
+        try:
+            content = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                content = content.decode(encoding)
+            return fastjson.loads(content)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,34 @@
+"""
+Environment-driven password hasher profiles.
+
+`PASSWORD_HASHER_PROFILE` selects the hasher used for new passwords:
+
+    pbkdf2  Django's default PBKDF2-SHA256
+    argon2  Argon2id with ARGON2_* parameters (requires `argon2-cffi`)
+    scrypt  scrypt with SCRYPT_* parameters (stdlib, OpenSSL 1.1+)
+    fast    MD5, insecure; for the test suite only
+
+Every profile keeps the other real hashers in the list, so existing
+passwords still verify and are re-hashed with the preferred hasher on the
+user's next successful login.
+"""
+PBKDF2 = "django.contrib.auth.hashers.PBKDF2PasswordHasher"
+PBKDF2_SHA1 = "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"
+ARGON2 = "apps.users.hashers.TunedArgon2PasswordHasher"
+SCRYPT = "apps.users.hashers.TunedScryptPasswordHasher"
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+PROFILES = {
+    "pbkdf2": [PBKDF2, PBKDF2_SHA1, ARGON2, SCRYPT],
+    "argon2": [ARGON2, PBKDF2, PBKDF2_SHA1, SCRYPT],
+    "scrypt": [SCRYPT, PBKDF2, PBKDF2_SHA1, ARGON2],
+    "fast": [MD5, PBKDF2],
+}
+
+
+def password_hashers(profile):
+    """Return the PASSWORD_HASHERS list for a profile name."""
+    try:
+        return list(PROFILES[profile])
+    except KeyError:
+        raise ValueError(f"Unsupported PASSWORD_HASHER_PROFILE: {profile!r}") from None
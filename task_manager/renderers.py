@@ -0,0 +1,25 @@
+from rest_framework.renderers import JSONRenderer
+
+from . import fastjson
+from .metrics import serialization_timer
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    DRF's JSONRenderer on the JSON_BACKEND library (see task_manager.fastjson),
+    with its time counted as serialization in the request metrics. Indented
+    output (`Accept: application/json; indent=4`, the browsable API) and
+    non-default JSON settings stay on DRF's own encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serialization_timer():
+            if data is None:
+                return b""
+            if (
+                fastjson.backend() == "json"
+                or self.get_indent(accepted_media_type, renderer_context or {})
+                or not (self.compact and self.ensure_ascii is False and self.strict)
+            ):
+                return super().render(data, accepted_media_type, renderer_context)
+            return fastjson.dumps(data)
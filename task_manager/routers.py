@@ -0,0 +1,40 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Route ORM reads made inside this block to the read replica, if one is configured."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to `DATABASE_REPLICA_ALIAS` only inside `replica_reads()`
+    (the GET paths of the task views), everything else to `default`.
+    Reads during writes therefore always see the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = settings.DATABASE_REPLICA_ALIAS
+        if _use_replica.get() and alias in settings.DATABASES:
+            return alias
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes through replication.
+        return db != settings.DATABASE_REPLICA_ALIAS
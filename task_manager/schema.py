@@ -0,0 +1,125 @@
+"""
+OpenAPI schema views that generate the document once per process.
+
+drf-yasg rebuilds the schema on every request by introspecting every view,
+serializer and `swagger_auto_schema` decorator. Here the encoded JSON/YAML
+document is built on the first request and kept in memory. It is served
+with a content-hash ETag, so clients that poll it get a 304.
+
+With `OPENAPI_SCHEMA_DIR` set, documents pre-rendered by
+`manage.py render_openapi_schema` are read from that directory and nothing
+is generated. The same files can also be served directly by the web server.
+"""
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_yasg import openapi
+from drf_yasg.renderers import SwaggerJSONRenderer, SwaggerYAMLRenderer, _SpecRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+API_INFO = openapi.Info(
+    title="Task Manager API",
+    default_version="v1",
+    description="A RESTful API for managing tasks with user authentication, role-based access, pagination, and filtering.",
+    contact=openapi.Contact(email="admin@taskmanager.com"),
+)
+
+# File name stem used by `render_openapi_schema` and looked up in OPENAPI_SCHEMA_DIR.
+FILE_STEM = "openapi"
+
+
+@dataclass(frozen=True)
+class SchemaDocument:
+    content: bytes
+    media_type: str
+    etag: str
+
+    @classmethod
+    def from_content(cls, content, media_type):
+        # Weak: the same tag is served for the compressed body.
+        return cls(content, media_type, 'W/"%s"' % hashlib.sha256(content).hexdigest()[:32])
+
+
+BaseSchemaView = get_schema_view(API_INFO, public=True, permission_classes=[permissions.AllowAny])
+
+_documents = {}
+_lock = threading.Lock()
+
+
+def render(renderer_class, request=None, version="", url=None):
+    """Generate and encode the schema. Without a request or `url`, the document has no host."""
+    generator = BaseSchemaView.generator_class(API_INFO, version, url)
+    schema = generator.get_schema(request, public=True)
+    return SchemaDocument.from_content(renderer_class().render(schema), renderer_class.media_type)
+
+
+def file_name(renderer_class):
+    extension = "yaml" if issubclass(renderer_class, SwaggerYAMLRenderer) else "json"
+    return f"{FILE_STEM}.{extension}"
+
+
+def read_file(renderer_class):
+    path = os.path.join(settings.OPENAPI_SCHEMA_DIR, file_name(renderer_class))
+    try:
+        with open(path, "rb") as handle:
+            return SchemaDocument.from_content(handle.read(), renderer_class.media_type)
+    except FileNotFoundError:
+        return None
+
+
+def get_document(renderer_class, request, version=""):
+    """The encoded schema for this renderer, built once per process (or read from OPENAPI_SCHEMA_DIR)."""
+    # Generated documents embed the host and scheme of the request they were built for.
+    key = (renderer_class.format, version, request.build_absolute_uri("/"))
+    document = _documents.get(key)
+    if document is None:
+        # One build per key: concurrent first requests wait instead of all generating.
+        with _lock:
+            document = _documents.get(key)
+            if document is None:
+                if settings.OPENAPI_SCHEMA_DIR:
+                    document = read_file(renderer_class)
+                if document is None:
+                    document = render(renderer_class, request, version)
+                _documents[key] = document
+    return document
+
+
+def clear_cache():
+    _documents.clear()
+
+
+def _setting_changed(setting, **kwargs):
+    if setting == "OPENAPI_SCHEMA_DIR":
+        clear_cache()
+
+
+setting_changed.connect(_setting_changed)
+
+
+class SchemaView(BaseSchemaView):
+    """drf-yasg's schema view, serving spec formats from the per-process cache."""
+
+    def get(self, request, version="", format=None):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, _SpecRenderer):
+            # The UI pages only embed the schema URL; drf-yasg renders them without introspection.
+            return super().get(request, version, format)
+        document = get_document(type(renderer), request, request.version or version or "")
+        response = get_conditional_response(request, etag=document.etag)
+        if response is None:
+            response = HttpResponse(document.content, content_type=f"{document.media_type}; charset=utf-8")
+        response["ETag"] = document.etag
+        # Cacheable, but revalidated each time so a deploy is picked up at once.
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+SPEC_RENDERERS = {renderer.format: renderer for renderer in (SwaggerJSONRenderer, SwaggerYAMLRenderer)}
@@ -3,6 +3,9 @@ from datetime import timedelta
 from dotenv import load_dotenv
 import os
 
+from .database import database_config
+from .passwords import password_hashers
+
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -13,6 +16,12 @@ DEBUG = os.getenv("DEBUG", "True") == "True"
 
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
 
+# API-only workers do not install the admin, the API docs or the apps that only
+# those use, and do not register their URLs. Startup is about the same: DRF's
+# views import django.contrib.admin and PyYAML anyway. Run them next to a regular
+# deployment that serves /admin/ and /api/docs/.
+API_ONLY = os.getenv("API_ONLY", "False") == "True"
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -26,9 +35,18 @@ INSTALLED_APPS = [
     "django_filters",
     "apps.users",
     "apps.tasks",
+    "apps.jobs",
+    # Project-wide management commands (task_manager/management/commands).
+    "task_manager",
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack; see task_manager/metrics.py.
+    "task_manager.middleware.RequestMetricsMiddleware",
+    # Before any real work, so a shed request costs next to nothing.
+    "task_manager.middleware.LoadSheddingMiddleware",
+    # Compresses what every later middleware has produced.
+    "task_manager.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,15 +74,62 @@ TEMPLATES = [
     },
 ]
 
+if API_ONLY:
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS if app not in ("django.contrib.admin", "django.contrib.messages", "drf_yasg")
+    ]
+    MIDDLEWARE = [name for name in MIDDLEWARE if name != "django.contrib.messages.middleware.MessageMiddleware"]
+    TEMPLATES[0]["OPTIONS"]["context_processors"].remove("django.contrib.messages.context_processors.messages")
+
 WSGI_APPLICATION = "task_manager.wsgi.application"
 
+# See task_manager/database.py for the SQLite and PostgreSQL profiles.
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(os.getenv("DATABASE_URL", "sqlite:///db.sqlite3"), BASE_DIR),
 }
 
+# Optional read replica used by the GET paths of the task list/detail views.
+DATABASE_REPLICA_ALIAS = "replica"
+if os.getenv("DATABASE_REPLICA_URL"):
+    DATABASES[DATABASE_REPLICA_ALIAS] = database_config(os.getenv("DATABASE_REPLICA_URL"), BASE_DIR)
+    DATABASE_ROUTERS = ["task_manager.routers.PrimaryReplicaRouter"]
+
+# Local memory by default (and in tests); set REDIS_URL to share the cache across workers.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Hasher for new passwords; see task_manager/passwords.py for the profiles.
+PASSWORD_HASHERS = password_hashers(os.getenv("PASSWORD_HASHER_PROFILE", "pbkdf2"))
+
+# Cost parameters for the argon2 and scrypt profiles. Defaults are the OWASP password
+# storage minimums with the least memory per hash: Argon2id m=19 MiB, t=2, p=1 and
+# scrypt N=2^14, r=8, p=5 (16 MiB).
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", str(2**14)))
+SCRYPT_BLOCK_SIZE = int(os.getenv("SCRYPT_BLOCK_SIZE", "8"))
+SCRYPT_PARALLELISM = int(os.getenv("SCRYPT_PARALLELISM", "5"))
+
+# Login and registration hash passwords in a shared pool of this many threads.
+# With more than PASSWORD_HASHING_MAX_PENDING hashes running or queued, further
+# logins get an immediate 503 with Retry-After instead of piling up.
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "2"))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", "16"))
+
+AUTHENTICATION_BACKENDS = ["apps.users.backends.PooledModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -85,24 +150,131 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "task_manager.renderers.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "task_manager.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_THROTTLE_CLASSES": [
+        "task_manager.throttling.UserRateThrottle",
+        "task_manager.throttling.AnonRateThrottle",
+    ],
+    # Per scope: "<count>/<sec|min|hour|day>", optionally " burst <n>" (default: count).
+    # The login views use the login scopes instead of user/anon; see task_manager/throttling.py.
+    "DEFAULT_THROTTLE_RATES": {
+        scope: os.getenv(f"THROTTLE_RATE_{scope.upper()}", default)
+        for scope, default in {
+            "user": "600/min burst 120",
+            "anon": "60/min burst 20",
+            "login": "10/min burst 5",
+            "login_account": "5/min burst 5",
+            "register": "10/hour burst 5",
+        }.items()
+    },
+    # Proxies in front of the app that append to X-Forwarded-For. 0 means the client IP is
+    # REMOTE_ADDR, so clients cannot pick their throttle key with a forged header.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
+# Rate limits can be switched off (benchmarks do); THROTTLE_CACHE holds the buckets.
+# Only a Redis cache shares them across worker processes.
+THROTTLE_ENABLED = os.getenv("THROTTLE_ENABLED", "True") == "True"
+THROTTLE_CACHE = "default"
+
+# Past LOAD_SHED_MAX_IN_FLIGHT concurrent requests in one process (threads or ASGI),
+# new requests get an immediate 503 with Retry-After (0 disables). Exempt paths
+# (monitoring) are always served.
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "100"))
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "1"))
+LOAD_SHED_EXEMPT_PATHS = ["/api/metrics/"]
+
+# JSON library for API responses and request bodies: "auto" (orjson when installed),
+# "orjson" or "json" (standard library). Output is the same either way.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+# Responses of at least COMPRESSION_MIN_SIZE bytes are sent brotli- (when the brotli
+# package is installed) or gzip-compressed, as the client's Accept-Encoding allows.
+# Only JSON, NDJSON and CSV bodies are compressed; 0 disables compression.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Maximum number of tasks accepted by a single /api/tasks/bulk/ request.
+TASK_BULK_MAX_ITEMS = int(os.getenv("TASK_BULK_MAX_ITEMS", "500"))
+
+# Rows fetched per database round trip when streaming /api/tasks/export/.
+TASK_EXPORT_CHUNK_SIZE = int(os.getenv("TASK_EXPORT_CHUNK_SIZE", "2000"))
+
+# Valid rows inserted per transaction by /api/tasks/import/ and `manage.py import_tasks`,
+# and the maximum number of per-row errors kept in an import report.
+TASK_IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "1000"))
+TASK_IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("TASK_IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+# Seconds a rendered /api/tasks/ page stays cached; writes invalidate earlier. 0 disables.
+# Writes from any process (other workers, jobs, commands) must reach the cache, so it
+# is only on by default with a shared cache (REDIS_URL); see the tasks.W001 check.
+TASK_LIST_CACHE_TIMEOUT = int(os.getenv("TASK_LIST_CACHE_TIMEOUT", "300" if os.getenv("REDIS_URL") else "0"))
+
+# Maximum (and default) number of change entries read per /api/tasks/changes/ page.
+TASK_CHANGES_PAGE_SIZE = int(os.getenv("TASK_CHANGES_PAGE_SIZE", "500"))
+
+# /api/tasks/analytics/ reads per-day rollups. When the last refresh is older than
+# TASK_ANALYTICS_REFRESH_INTERVAL seconds (0: on every request), it queues a background
+# refresh job and serves the rollups as they are.
+TASK_ANALYTICS_REFRESH_INTERVAL = int(os.getenv("TASK_ANALYTICS_REFRESH_INTERVAL", "60"))
+TASK_ANALYTICS_MAX_DAYS = int(os.getenv("TASK_ANALYTICS_MAX_DAYS", "366"))
+
+# Background jobs (apps/jobs), run by `manage.py run_jobs`. Failed jobs are retried
+# up to JOBS_MAX_ATTEMPTS times in all, waiting JOBS_RETRY_BACKOFF seconds, doubled
+# after each attempt. A job running longer than JOBS_LEASE_SECONDS without reporting
+# progress is assumed lost and claimed again. Export files go to JOB_RESULT_DIR.
+JOBS_WORKER_PROCESSES = int(os.getenv("JOBS_WORKER_PROCESSES", "2"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_RETRY_BACKOFF = float(os.getenv("JOBS_RETRY_BACKOFF", "10"))
+JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS", "300"))
+# Rows written per transaction by batch jobs (bulk status changes, user deletion).
+JOBS_BATCH_SIZE = int(os.getenv("JOBS_BATCH_SIZE", "1000"))
+JOB_RESULT_DIR = os.getenv("JOB_RESULT_DIR", str(BASE_DIR / "job_results"))
+
+# Seconds a user's {is_active, role, token_version} stays cached for JWT checks. User
+# saves and deletes rewrite the entry in the cache of the process making them, which
+# reaches every worker only when the cache is shared (REDIS_URL). Otherwise other
+# processes, and queryset .update()s (which skip the signals) everywhere, take effect
+# after up to this many seconds, so the per-process default is short.
+AUTH_STATE_CACHE_TIMEOUT = int(os.getenv("AUTH_STATE_CACHE_TIMEOUT", "300" if os.getenv("REDIS_URL") else "5"))
+
+# Per-view latency, SQL and serialization metrics, served to admins at /api/metrics/.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+
+# When enabled, admins can send `X-Profile: 1` to have a request run under cProfile;
+# the stats file (open with `python -m pstats`) is written to REQUEST_PROFILE_DIR.
+REQUEST_PROFILING_ENABLED = os.getenv("REQUEST_PROFILING_ENABLED", "False") == "True"
+REQUEST_PROFILE_DIR = os.getenv("REQUEST_PROFILE_DIR", str(BASE_DIR / "profiles"))
+
+# Directory holding openapi.json / openapi.yaml pre-rendered by
+# `manage.py render_openapi_schema`. When set, the schema endpoints serve those
+# files instead of generating the schema on the first request.
+OPENAPI_SCHEMA_DIR = os.getenv("OPENAPI_SCHEMA_DIR", "")
+
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
         "Bearer": {
@@ -112,4 +284,6 @@ SWAGGER_SETTINGS = {
         }
     },
     "USE_SESSION_AUTH": False,
+    # Spec formats are `json` / `yaml` (as in /api/schema.json), not the legacy `.json`.
+    "USE_COMPAT_RENDERERS": False,
 }
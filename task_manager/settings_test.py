@@ -0,0 +1,18 @@
+"""
+Settings for the pytest suite: the SQLite profile from `settings`, plus a
+second SQLite database registered as the read replica so routing can be
+tested. The replica router is not installed globally; router tests enable it
+with `override_settings(DATABASE_ROUTERS=...)`. Passwords use the fast hasher
+profile.
+"""
+from .settings import *  # noqa: F401,F403
+from .database import database_config
+from .passwords import password_hashers
+
+DATABASES = {
+    "default": database_config("sqlite:///db.sqlite3", BASE_DIR),  # noqa: F405
+    DATABASE_REPLICA_ALIAS: database_config("sqlite:///db-replica.sqlite3", BASE_DIR),  # noqa: F405
+}
+DATABASE_ROUTERS = []
+
+PASSWORD_HASHERS = password_hashers("fast")
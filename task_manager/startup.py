@@ -0,0 +1,78 @@
+"""
+Measure what a worker process imports before it can serve its first request.
+
+`profile_startup` runs the startup path in a fresh interpreter: load the WSGI
+application (settings, app registry, middleware) and the URLconf. It returns
+the wall time and, when asked, the `python -X importtime` records.
+Used by `manage.py import_time_report` and the startup-time test.
+"""
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+STARTUP_CODE = """
+import os, sys, time
+start = time.perf_counter()
+from task_manager.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(time.perf_counter() - start, len(sys.modules))
+"""
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class StartupProfile:
+    seconds: float
+    module_count: int
+    imports: list
+
+    def slowest(self, count, key="cumulative_us"):
+        return sorted(self.imports, key=lambda record: getattr(record, key), reverse=True)[:count]
+
+    def by_package(self):
+        """`{top-level package: self time in microseconds}`, largest first."""
+        totals = {}
+        for record in self.imports:
+            package = record.module.split(".", 1)[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def parse_importtime(text):
+    """Parse the `import time: self | cumulative | module` lines written to stderr by `-X importtime`."""
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        records.append(ImportRecord(
+            module=stripped.strip(),
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return records
+
+
+def profile_startup(api_only=None, settings_module=None, importtime=False):
+    """Start a fresh interpreter, load the application and return a StartupProfile."""
+    env = dict(os.environ)
+    env["DJANGO_SETTINGS_MODULE"] = settings_module or env.get("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+    if api_only is not None:
+        env["API_ONLY"] = "True" if api_only else "False"
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [base_dir, env.get("PYTHONPATH")]))
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", STARTUP_CODE]
+    result = subprocess.run(command, env=env, cwd=base_dir, capture_output=True, text=True, check=True)
+    seconds, module_count = result.stdout.split()[-2:]
+    return StartupProfile(float(seconds), int(module_count), parse_importtime(result.stderr) if importtime else [])
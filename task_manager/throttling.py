@@ -0,0 +1,278 @@
+"""
+Token-bucket rate limits for the API.
+
+Each scope has a rate like `"600/min burst 120"`. A bucket holds up to
+`burst` tokens (default: the full count) and refills continuously at
+count/period. Every request takes one token, and a request that finds the
+bucket empty gets a 429 with Retry-After. The Retry-After is the time until
+a token is back.
+
+Buckets live in the `THROTTLE_CACHE` cache. On Redis, one Lua script reads
+and updates a bucket atomically in a single round trip, and every worker
+shares it. With any other cache backend (local memory in development and
+tests), buckets are kept in this process, so each worker process limits on
+its own. Either way a check is O(1) and never touches the database.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+RATE_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*([a-z]+)\s*(?:burst\s+(\d+))?\s*$")
+
+
+def parse_rate(rate):
+    """`"<count>/<period>[ burst <n>]"` -> `(capacity, tokens per second)`."""
+    match = RATE_PATTERN.match(rate)
+    if not match or match.group(2) not in PERIODS:
+        raise ValueError(f"Invalid throttle rate {rate!r}; expected e.g. '600/min' or '600/min burst 100'.")
+    count, period, burst = int(match.group(1)), PERIODS[match.group(2)], match.group(3)
+    return int(burst) if burst else count, count / period
+
+
+class LocalTokenBuckets:
+    """Buckets in this process's memory, least recently used dropped past `max_keys`."""
+
+    def __init__(self, max_keys=100_000):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+        self.max_keys = max_keys
+
+    def take(self, key, capacity, refill_rate, cost=1):
+        """Take `cost` tokens; returns 0 if they were there, else the seconds until they will be."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * refill_rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    async def atake(self, key, capacity, refill_rate, cost=1):
+        return self.take(key, capacity, refill_rate, cost)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# KEYS[1] = bucket; ARGV = capacity, refill rate, cost. Uses the Redis clock so
+# workers with skewed clocks agree. Returns the wait as a string (Lua numbers
+# come back from Redis truncated to integers).
+TAKE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local capacity, rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(state[1]) or capacity
+local stamp = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - stamp) * rate)
+local wait = 0
+if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'stamp', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisTokenBuckets:
+    """Buckets in a Redis cache, shared by every worker process."""
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._script = None
+
+    def take(self, key, capacity, refill_rate, cost=1):
+        try:
+            # Django's RedisCache has no scripting API; run the script on its client.
+            client = self._cache._cache.get_client(key, write=True)
+            if self._script is None:
+                self._script = client.register_script(TAKE_SCRIPT)
+            cache_key = self._cache.make_and_validate_key(key)
+            return float(self._script(keys=[cache_key], args=[capacity, refill_rate, cost], client=client))
+        except Exception:
+            # Fail open: an unreachable rate limiter must not take the API down with it.
+            logger.warning("Throttle check for %s failed; allowing the request", key, exc_info=True)
+            return 0.0
+
+    async def atake(self, key, capacity, refill_rate, cost=1):
+        return await sync_to_async(self.take, thread_sensitive=False)(key, capacity, refill_rate, cost)
+
+    def clear(self):
+        pass
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets():
+    global _buckets
+    if _buckets is None:
+        with _buckets_lock:
+            if _buckets is None:
+                cache = caches[settings.THROTTLE_CACHE]
+                if type(cache).__module__ == "django.core.cache.backends.redis":
+                    _buckets = RedisTokenBuckets(cache)
+                else:
+                    _buckets = LocalTokenBuckets()
+    return _buckets
+
+
+@receiver(setting_changed)
+def reset_buckets(setting, **kwargs):
+    global _buckets
+    if setting in ("THROTTLE_CACHE", "CACHES"):
+        with _buckets_lock:
+            _buckets = None
+
+
+class ThrottleStats:
+    """Process-local count of throttled requests per scope."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.throttled = {}
+
+    def record(self, scope):
+        with self._lock:
+            self.throttled[scope] = self.throttled.get(scope, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.throttled)
+
+
+stats = ThrottleStats()
+
+
+def metrics_lines():
+    lines = ["# HELP http_requests_throttled_total Requests rejected by a rate limit, by scope.",
+             "# TYPE http_requests_throttled_total counter"]
+    for scope, count in sorted(stats.snapshot().items()):
+        lines.append(f'http_requests_throttled_total{{scope="{scope}"}} {count}')
+    return lines
+
+
+registry.register_collector(metrics_lines)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle backed by a token bucket. Subclasses set `scope` (a key of
+    DEFAULT_THROTTLE_RATES) and return the bucket's key from `get_ident_key`,
+    or None to leave the request unthrottled.
+    """
+
+    scope = None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def bucket(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return None
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return None
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return None
+        return (f"throttle:{self.scope}:{ident}", *parse_rate(rate))
+
+    def allow_request(self, request, view):
+        bucket = self.bucket(request, view)
+        self._wait = get_buckets().take(*bucket) if bucket else 0.0
+        return self._allowed()
+
+    async def aallow_request(self, request, view):
+        bucket = self.bucket(request, view)
+        self._wait = await get_buckets().atake(*bucket) if bucket else 0.0
+        return self._allowed()
+
+    def _allowed(self):
+        if self._wait > 0:
+            stats.record(self.scope)
+            return False
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+class UserRateThrottle(TokenBucketThrottle):
+    """Per authenticated user."""
+
+    scope = "user"
+
+    def get_ident_key(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+class AnonRateThrottle(TokenBucketThrottle):
+    """Per client IP, for unauthenticated requests."""
+
+    scope = "anon"
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    """Login attempts per client IP."""
+
+    scope = "login"
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginAccountThrottle(TokenBucketThrottle):
+    """Login attempts per target account, whichever IPs they come from."""
+
+    scope = "login_account"
+
+    def get_ident_key(self, request, view):
+        data = request.data
+        email = data.get("email") if isinstance(data, dict) else None
+        if not isinstance(email, str) or not email:
+            return None
+        # Hashed: cache keys must not carry raw addresses (or characters memcached rejects).
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+class RegisterRateThrottle(TokenBucketThrottle):
+    """Sign-ups per client IP."""
+
+    scope = "register"
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+def reset():
+    """Forget every locally held bucket (between tests)."""
+    get_buckets().clear()
@@ -1,26 +1,44 @@
-from django.contrib import admin
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from django.views.generic import RedirectView
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Task Manager API",
-        default_version="v1",
-        description="A RESTful API for managing tasks with user authentication, role-based access, pagination, and filtering.",
-        contact=openapi.Contact(email="admin@taskmanager.com"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+from .views import MetricsView
+
+
+def lazy_schema_view(factory, *args, **kwargs):
+    """
+    A view that builds `SchemaView.<factory>(*args, **kwargs)` on its first
+    request, so drf-yasg's renderers and generator are only imported by
+    processes that actually serve the docs.
+    """
+    view = None
+
+    def schema_view(request, *view_args, **view_kwargs):
+        nonlocal view
+        if view is None:
+            from .schema import SchemaView
+            view = getattr(SchemaView, factory)(*args, **kwargs)
+        return view(request, *view_args, **view_kwargs)
+
+    schema_view.csrf_exempt = True
+    return schema_view
+
 
 urlpatterns = [
-    path("", RedirectView.as_view(url="/api/docs/", permanent=False), name="root"),
-    path("admin/", admin.site.urls),
     path("api/auth/", include("apps.users.urls")),
     path("api/", include("apps.tasks.urls")),
-    path("api/docs/", schema_view.with_ui("swagger", cache_timeout=0), name="swagger-ui"),
-    path("api/redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="redoc"),
+    path("api/", include("apps.jobs.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
+    path("api/async/auth/", include("apps.users.async_urls")),
+    path("api/async/", include("apps.tasks.async_urls")),
 ]
+
+if not settings.API_ONLY:
+    from django.contrib import admin
+
+    urlpatterns += [
+        path("", RedirectView.as_view(url="/api/docs/", permanent=False), name="root"),
+        path("admin/", admin.site.urls),
+        re_path(r"^api/schema\.(?P<format>json|yaml)$", lazy_schema_view("without_ui"), name="schema"),
+        path("api/docs/", lazy_schema_view("with_ui", "swagger"), name="swagger-ui"),
+        path("api/redoc/", lazy_schema_view("with_ui", "redoc"), name="redoc"),
+    ]
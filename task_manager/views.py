@@ -0,0 +1,34 @@
+import json
+
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.tasks.permissions import IsAdminRole
+from .metrics import registry
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            # Error responses (e.g. 403) carry a dict.
+            data = json.dumps(data)
+        return data.encode(self.charset)
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminRole]
+    renderer_classes = [PrometheusRenderer]
+
+    @swagger_auto_schema(
+        operation_description="[Admin only] Request metrics for this process in the Prometheus text format: per-view latency, SQL statement count and time, serialization time, and task list cache hits/misses.",
+        responses={200: "Prometheus text exposition", 403: "Forbidden"},
+        tags=["Monitoring"],
+    )
+    def get(self, request):
+        return Response(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
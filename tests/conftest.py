@@ -1,9 +1,30 @@
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient
+from apps.tasks.models import Task
+from task_manager import throttling
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached per-user state and rate-limit buckets must not leak between tests."""
+    cache.clear()
+    throttling.reset()
+    yield
+    cache.clear()
+    throttling.reset()
+
+
+@pytest.fixture
+def list_cache_enabled(settings):
+    """The task list page cache is off without a shared cache; tests run in one process."""
+    settings.TASK_LIST_CACHE_TIMEOUT = 300
+
+
 @pytest.fixture
 def api_client():
     from rest_framework.test import APIClient
@@ -34,6 +55,21 @@ def create_admin(db):
     return make_admin
 
 
+@pytest.fixture
+def create_tasks(create_user):
+    """Create `count` tasks spread round-robin across `owners` distinct users."""
+    def make_tasks(count=10, owners=1):
+        users = [
+            create_user(email=f"owner{i}@example.com", username=f"owner{i}")
+            for i in range(owners)
+        ]
+        return [
+            Task.objects.create(title=f"Task {i}", owner=users[i % owners])
+            for i in range(count)
+        ]
+    return make_tasks
+
+
 @pytest.fixture
 def auth_client(api_client, create_user):
     user = create_user()
@@ -60,3 +96,23 @@ def admin_client(api_client, create_admin):
     api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
     api_client._user = admin
     return api_client
+
+
+@pytest.fixture
+def async_client():
+    """Drives requests through Django's ASGI handler, like an ASGI server would."""
+    client = AsyncClient()
+
+    def call(method, path, data=None, token=None, headers=None):
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        kwargs = {"headers": headers}
+        if method in ("post", "put", "patch"):
+            kwargs["content_type"] = "application/json"
+        request = getattr(client, method)
+        if data is not None:
+            return async_to_sync(request)(path, data, **kwargs)
+        return async_to_sync(request)(path, **kwargs)
+
+    return call
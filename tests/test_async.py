@@ -0,0 +1,208 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.tasks.models import Task
+from apps.users import hashing
+
+
+def token_for(client):
+    return client._credentials["HTTP_AUTHORIZATION"].split()[1]
+
+
+@pytest.mark.django_db
+class TestAsyncTaskList:
+    def test_requires_authentication(self, async_client):
+        response = async_client("get", "/api/async/tasks/")
+        assert response.status_code == 401
+        assert response["WWW-Authenticate"].startswith("Bearer")
+
+    def test_matches_sync_list(self, auth_client, async_client, create_user):
+        for i in range(12):
+            Task.objects.create(title=f"Task {i}", completed=i % 2 == 0, owner=auth_client._user)
+        Task.objects.create(title="Other", owner=create_user(email="other@example.com", username="other"))
+        for query in ("", "?page=2", "?completed=true&ordering=created_at", "?page_size=5&page=3"):
+            sync = auth_client.get(f"/api/tasks/{query}")
+            response = async_client("get", f"/api/async/tasks/{query}", token=token_for(auth_client))
+            assert response.status_code == 200
+            data = response.json()
+            assert data["count"] == sync.data["count"]
+            assert data["results"] == sync.json()["results"]
+            assert [link and link.replace("/api/async/", "/api/") for link in (data["next"], data["previous"])] == [
+                sync.data["next"],
+                sync.data["previous"],
+            ]
+
+    def test_list_etag(self, auth_client, async_client):
+        Task.objects.create(title="Mine", owner=auth_client._user)
+        token = token_for(auth_client)
+        etag = async_client("get", "/api/async/tasks/", token=token)["ETag"]
+        assert async_client("get", "/api/async/tasks/", token=token, headers={"If-None-Match": etag}).status_code == 304
+        Task.objects.create(title="Another", owner=auth_client._user)
+        assert async_client("get", "/api/async/tasks/", token=token, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_list_counts_once(self, auth_client, async_client, django_assert_num_queries):
+        Task.objects.create(title="Mine", owner=auth_client._user)
+        token = token_for(auth_client)
+        # ETag MAX/COUNT (reused as the page count) + page query
+        with django_assert_num_queries(2):
+            response = async_client("get", "/api/async/tasks/", token=token)
+        assert response.json()["count"] == 1
+
+    def test_invalid_page(self, auth_client, async_client):
+        response = async_client("get", "/api/async/tasks/?page=5", token=token_for(auth_client))
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Invalid page."}
+
+    def test_search(self, auth_client, async_client):
+        Task.objects.create(title="Quarterly budget", owner=auth_client._user)
+        Task.objects.create(title="Team lunch", owner=auth_client._user)
+        response = async_client("get", "/api/async/tasks/?search=budg", token=token_for(auth_client))
+        assert [task["title"] for task in response.json()["results"]] == ["Quarterly budget"]
+
+    def test_invalid_ordering_is_ignored_like_sync(self, auth_client, async_client):
+        Task.objects.create(title="Mine", owner=auth_client._user)
+        response = async_client("get", "/api/async/tasks/?ordering=owner__password", token=token_for(auth_client))
+        assert response.status_code == 200
+        assert response.json()["results"] == auth_client.get("/api/tasks/?ordering=owner__password").json()["results"]
+
+    def test_create(self, auth_client, async_client):
+        response = async_client("post", "/api/async/tasks/", {"title": "New"}, token=token_for(auth_client))
+        assert response.status_code == 201
+        assert response.json()["owner"] == auth_client._user.email
+        assert Task.objects.get(pk=response.json()["id"]).owner == auth_client._user
+
+    def test_create_invalid(self, auth_client, async_client):
+        response = async_client("post", "/api/async/tasks/", {"title": ""}, token=token_for(auth_client))
+        assert response.status_code == 400
+        assert "title" in response.json()
+
+
+@pytest.mark.django_db
+class TestAsyncTaskDetail:
+    def test_retrieve_matches_sync(self, auth_client, async_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        sync = auth_client.get(f"/api/tasks/{task.pk}/")
+        response = async_client("get", f"/api/async/tasks/{task.pk}/", token=token_for(auth_client))
+        assert response.status_code == 200
+        assert response.json() == sync.json()
+        assert response["ETag"] == sync["ETag"]
+
+    def test_not_modified(self, auth_client, async_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        etag = auth_client.get(f"/api/tasks/{task.pk}/")["ETag"]
+        response = async_client(
+            "get", f"/api/async/tasks/{task.pk}/", token=token_for(auth_client), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_other_users_task_is_hidden(self, auth_client, async_client, create_user):
+        other = create_user(email="other@example.com", username="other")
+        task = Task.objects.create(title="Theirs", owner=other)
+        response = async_client("get", f"/api/async/tasks/{task.pk}/", token=token_for(auth_client))
+        assert response.status_code == 404
+
+    def test_patch_with_stale_etag(self, auth_client, async_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        token = token_for(auth_client)
+        etag = async_client("get", f"/api/async/tasks/{task.pk}/", token=token)["ETag"]
+        response = async_client("patch", f"/api/async/tasks/{task.pk}/", {"completed": True}, token=token, headers={"If-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["completed"] is True
+        stale = async_client("patch", f"/api/async/tasks/{task.pk}/", {"title": "X"}, token=token, headers={"If-Match": etag})
+        assert stale.status_code == 412
+
+    def test_put_validates(self, auth_client, async_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        response = async_client("put", f"/api/async/tasks/{task.pk}/", {"title": ""}, token=token_for(auth_client))
+        assert response.status_code == 400
+
+    def test_delete(self, auth_client, async_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        response = async_client("delete", f"/api/async/tasks/{task.pk}/", token=token_for(auth_client))
+        assert response.status_code == 204
+        assert not Task.objects.filter(pk=task.pk).exists()
+
+    def test_admin_can_access_any_task(self, admin_client, async_client, create_user):
+        task = Task.objects.create(title="Theirs", owner=create_user())
+        response = async_client("get", f"/api/async/tasks/{task.pk}/", token=token_for(admin_client))
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestAsyncAuth:
+    def test_register_and_login(self, async_client):
+        response = async_client(
+            "post",
+            "/api/async/auth/register/",
+            {"email": "new@example.com", "username": "new", "password": "strongpass123"},
+        )
+        assert response.status_code == 201
+        assert response.json()["email"] == "new@example.com"
+
+        response = async_client("post", "/api/async/auth/login/", {"email": "new@example.com", "password": "strongpass123"})
+        assert response.status_code == 200
+        token = response.json()["access"]
+        assert async_client("get", "/api/async/tasks/", token=token).status_code == 200
+
+    def test_register_duplicate_email(self, async_client, create_user):
+        create_user()
+        response = async_client(
+            "post",
+            "/api/async/auth/register/",
+            {"email": "user@example.com", "username": "someone", "password": "strongpass123"},
+        )
+        assert response.status_code == 400
+        assert "email" in response.json()
+
+    def test_login_wrong_password(self, async_client, create_user):
+        create_user()
+        response = async_client("post", "/api/async/auth/login/", {"email": "user@example.com", "password": "wrong"})
+        assert response.status_code == 401
+
+    def test_concurrent_logins_overlap(self, create_user, monkeypatch, settings):
+        settings.PASSWORD_HASHING_WORKERS = 2
+        for i in range(2):
+            create_user(email=f"user{i}@example.com", username=f"user{i}")
+        # Each check waits for the other, so this only passes if both hash at once.
+        barrier = threading.Barrier(2, timeout=5)
+        check_password = hashing.hashers.check_password
+
+        def check_together(password, encoded):
+            barrier.wait()
+            return check_password(password, encoded)
+
+        monkeypatch.setattr(hashing.hashers, "check_password", check_together)
+
+        async def login_both():
+            client = AsyncClient()
+            return await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/async/auth/login/",
+                        {"email": f"user{i}@example.com", "password": "strongpass123"},
+                        content_type="application/json",
+                    )
+                    for i in range(2)
+                )
+            )
+
+        assert [response.status_code for response in async_to_sync(login_both)()] == [200, 200]
+
+    def test_revoked_token_is_rejected(self, auth_client, async_client):
+        token = token_for(auth_client)
+        auth_client._user.revoke_tokens()
+        response = async_client("get", "/api/async/tasks/", token=token)
+        assert response.status_code == 401
+
+    def test_token_without_claims_falls_back_to_database(self, async_client, create_user):
+        user = create_user()
+        response = async_client("get", "/api/async/tasks/", token=str(AccessToken.for_user(user)))
+        assert response.status_code == 200
+        user.is_active = False
+        user.save()
+        response = async_client("get", "/api/async/tasks/", token=str(AccessToken.for_user(user)))
+        assert response.status_code == 401
@@ -1,4 +1,14 @@
+import threading
+
 import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from apps.users import hashing
+from task_manager.passwords import password_hashers
 
 
 @pytest.mark.django_db
@@ -63,3 +73,131 @@ class TestLogin:
             format="json",
         )
         assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestStatelessAuth:
+    def test_login_token_carries_role_claims(self, api_client, create_user):
+        create_user(email="claims@example.com", username="claims", password="claimspass123")
+        response = api_client.post(
+            "/api/auth/login/",
+            {"email": "claims@example.com", "password": "claimspass123"},
+            format="json",
+        )
+        token = AccessToken(response.data["access"])
+        assert token["role"] == "user"
+        assert token["ver"] == 0
+
+    def test_authenticated_request_skips_user_query(self, auth_client):
+        # List pages join users_user for the owner's email; leave `owner` out so
+        # any mention of the table would be the authentication lookup.
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get("/api/tasks/?fields=id,title")
+        assert response.status_code == 200
+        assert not any("users_user" in q["sql"] for q in queries.captured_queries)
+
+    def test_deactivated_user_is_rejected(self, auth_client):
+        user = auth_client._user
+        user.is_active = False
+        user.save()
+        assert auth_client.get("/api/tasks/").status_code == 401
+
+    def test_role_change_invalidates_token(self, auth_client):
+        user = auth_client._user
+        user.role = "admin"
+        user.save()
+        assert auth_client.get("/api/tasks/").status_code == 401
+
+    def test_revoke_tokens(self, auth_client):
+        auth_client._user.revoke_tokens()
+        assert auth_client.get("/api/tasks/").status_code == 401
+
+    def test_state_reloaded_after_cache_expiry(self, auth_client):
+        cache.clear()
+        assert auth_client.get("/api/tasks/").status_code == 200
+
+    def test_token_without_claims_falls_back_to_database(self, api_client, create_user):
+        user = create_user()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        assert api_client.get("/api/tasks/").status_code == 200
+
+
+class TestPasswordHasherProfiles:
+    def test_profiles_prefer_their_hasher_and_keep_pbkdf2(self):
+        for profile, preferred in (("pbkdf2", "PBKDF2PasswordHasher"), ("scrypt", "TunedScryptPasswordHasher")):
+            hashers = password_hashers(profile)
+            assert hashers[0].endswith(preferred)
+            assert "django.contrib.auth.hashers.PBKDF2PasswordHasher" in hashers
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            password_hashers("rot13")
+
+    def test_tuned_scrypt_uses_settings(self, settings):
+        settings.PASSWORD_HASHERS = password_hashers("scrypt")
+        settings.SCRYPT_WORK_FACTOR = 2**10
+        settings.SCRYPT_PARALLELISM = 1
+        encoded = make_password("strongpass123")
+        assert encoded.startswith("scrypt$1024$")
+        assert check_password("strongpass123", encoded)
+        settings.SCRYPT_WORK_FACTOR = 2**11
+        assert hashing.needs_rehash(encoded)
+
+
+class TestHashingPool:
+    def test_rejects_when_saturated(self):
+        pool = hashing.HashingPool(workers=1, max_pending=2)
+        release = threading.Event()
+        try:
+            running = [pool.submit(release.wait) for _ in range(2)]
+            with pytest.raises(hashing.HashingUnavailable):
+                pool.submit(release.wait)
+            release.set()
+            assert all(future.result() for future in running)
+            assert pool.run(lambda: 42) == 42
+        finally:
+            release.set()
+            pool.shutdown()
+
+
+@pytest.mark.django_db
+class TestPooledLogin:
+    def test_saturated_pool_returns_503(self, api_client, create_user, monkeypatch):
+        create_user()
+        monkeypatch.setattr(hashing, "get_pool", lambda: hashing.HashingPool(workers=1, max_pending=0))
+        response = api_client.post(
+            "/api/auth/login/", {"email": "user@example.com", "password": "strongpass123"}, format="json"
+        )
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"
+
+    def test_outdated_hash_is_upgraded_on_login(self, api_client, create_user):
+        user = create_user()
+        user.password = make_password("strongpass123", hasher="pbkdf2_sha256")
+        user.save()
+        response = api_client.post(
+            "/api/auth/login/", {"email": "user@example.com", "password": "strongpass123"}, format="json"
+        )
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.password.startswith("md5$")
+
+    def test_inactive_user_cannot_login(self, api_client, create_user):
+        user = create_user()
+        user.is_active = False
+        user.save()
+        response = api_client.post(
+            "/api/auth/login/", {"email": "user@example.com", "password": "strongpass123"}, format="json"
+        )
+        assert response.status_code == 401
+
+    def test_registered_password_verifies(self, api_client):
+        response = api_client.post(
+            "/api/auth/register/",
+            {"email": "New@Example.com", "username": "new", "password": "strongpass123"},
+            format="json",
+        )
+        assert response.status_code == 201
+        user = get_user_model().objects.get(username="new")
+        assert user.email == "New@example.com"
+        assert user.check_password("strongpass123")
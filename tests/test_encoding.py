@@ -0,0 +1,158 @@
+import datetime
+import decimal
+import gzip
+import json
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+
+from apps.tasks.models import Task
+from task_manager import fastjson
+from task_manager.middleware import STREAM_FLUSH_SIZE, accepted_codings, compress_stream
+from task_manager.renderers import TimedJSONRenderer
+
+PAYLOAD = {
+    "text": "naïve \u2028 line \u2029 para \"quoted\" </script>",
+    "when": datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    "day": datetime.date(2026, 1, 2),
+    "amount": decimal.Decimal("1.10"),
+    "lazy": gettext_lazy("Not found."),
+    "error": [ErrorDetail("This field is required.", code="required")],
+    "keys": {1: "int key"},
+    "nested": [None, True, 1.5, (1, 2)],
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, settings):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    settings.JSON_BACKEND = request.param
+    return request.param
+
+
+class TestJSON:
+    # Integers past 64 bits are beyond orjson and take the fallback.
+    @pytest.mark.parametrize("payload", [PAYLOAD, {"huge": 2 ** 70}])
+    def test_output_matches_drf(self, backend, payload):
+        assert TimedJSONRenderer().render(payload) == JSONRenderer().render(payload)
+
+    def test_indent_is_honored(self, backend):
+        rendered = TimedJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        assert rendered == b'{\n  "a": 1\n}'
+
+    def test_loads_rejects_nan(self, backend):
+        assert fastjson.loads(b'{"title": "caf\xc3\xa9"}') == {"title": "café"}
+        with pytest.raises(ValueError):
+            fastjson.loads(b'{"n": NaN}')
+
+    @pytest.mark.parametrize("content", [b'{"id": 18446744073709551617, "n": 1.5}', '{"id": 18446744073709551617, "n": 1.5}'])
+    def test_loads_keeps_huge_integers_exact(self, backend, content):
+        assert fastjson.loads(content) == {"id": 2 ** 64 + 1, "n": 1.5}
+        assert fastjson.loads(b"[-9223372036854775808]") == [-(2 ** 63)]
+
+    def test_unknown_backend(self, settings):
+        settings.JSON_BACKEND = "simdjson"
+        with pytest.raises(Exception, match="JSON_BACKEND"):
+            fastjson.dumps({})
+
+
+@pytest.mark.django_db
+class TestJSONEndpoints:
+    def test_list_page_matches_drf(self, auth_client, backend):
+        for i in range(5):
+            Task.objects.create(title=f"Täsk {i}", description="x\u2028y", owner=auth_client._user)
+        response = auth_client.get("/api/tasks/")
+        assert response.content == JSONRenderer().render(response.data)
+
+    def test_request_body_is_parsed(self, auth_client, backend):
+        response = auth_client.post("/api/tasks/", '{"title": "Café"}', content_type="application/json")
+        assert response.status_code == 201
+        assert response.json()["title"] == "Café"
+        response = auth_client.post("/api/tasks/", '{"title": ', content_type="application/json")
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("JSON parse error")
+
+    def test_async_request_body_is_parsed(self, auth_client, async_client, backend):
+        token = auth_client._credentials["HTTP_AUTHORIZATION"].split()[1]
+        response = async_client("post", "/api/async/tasks/", {"title": "Café"}, token=token)
+        assert response.status_code == 201
+        assert response.json()["title"] == "Café"
+
+
+@pytest.mark.django_db
+class TestCompression:
+    @pytest.fixture
+    def tasks(self, auth_client):
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", description="A description " * 10, owner=auth_client._user) for i in range(20)
+        )
+
+    def test_accepted_codings(self):
+        assert accepted_codings("gzip;q=0.5, br , identity;q=0, *;q=bad") == {"gzip": 0.5, "br": 1.0, "identity": 0.0, "*": 0.0}
+
+    def test_large_json_is_gzipped(self, auth_client, tasks):
+        plain = auth_client.get("/api/tasks/?page_size=20")
+        assert "Content-Encoding" not in plain
+        assert "Accept-Encoding" in plain["Vary"]
+
+        response = auth_client.get("/api/tasks/?page_size=20", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        assert response["Content-Encoding"] == "gzip"
+        assert int(response["Content-Length"]) == len(response.content) < len(plain.content)
+        assert gzip.decompress(response.content) == plain.content
+        # Compression leaves conditional requests alone.
+        assert response["ETag"] == plain["ETag"]
+        cached = auth_client.get("/api/tasks/?page_size=20", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=plain["ETag"])
+        assert cached.status_code == 304
+
+    def test_small_or_refused_bodies_are_sent_as_is(self, auth_client, tasks, settings):
+        small = auth_client.get("/api/tasks/?page_size=1", HTTP_ACCEPT_ENCODING="gzip")
+        assert "Content-Encoding" not in small
+        refused = auth_client.get("/api/tasks/?page_size=20", HTTP_ACCEPT_ENCODING="gzip;q=0, br;q=0")
+        assert "Content-Encoding" not in refused
+        settings.COMPRESSION_MIN_SIZE = 0
+        assert "Content-Encoding" not in auth_client.get("/api/tasks/?page_size=20", HTTP_ACCEPT_ENCODING="gzip")
+
+    def test_html_is_not_compressed(self, auth_client, tasks):
+        response = auth_client.get("/api/tasks/?page_size=20", HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Type"].startswith("text/html")
+        assert "Content-Encoding" not in response
+
+    def test_strong_etag_bodies_are_not_compressed(self, auth_client, api_client):
+        task = Task.objects.create(title="Long", description="x" * 5000, owner=auth_client._user)
+        response = auth_client.get(f"/api/tasks/{task.id}/", HTTP_ACCEPT_ENCODING="gzip")
+        assert not response["ETag"].startswith("W/")
+        assert "Content-Encoding" not in response
+        # The schema's tag is weak, so it is still compressed.
+        schema = api_client.get("/api/schema.json", HTTP_ACCEPT_ENCODING="gzip")
+        assert schema["ETag"].startswith("W/")
+        assert schema["Content-Encoding"] == "gzip"
+
+    def test_streamed_export_is_gzipped(self, auth_client, tasks):
+        response = auth_client.get("/api/tasks/export/?format=ndjson", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response
+        rows = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        assert len(rows) == 20
+        assert json.loads(rows[0])["description"] == "A description " * 10
+
+    def test_streams_flush_per_block_not_per_chunk(self):
+        rows = [b'{"id": %d, "title": "Task"}\n' % i for i in range(2 * STREAM_FLUSH_SIZE // 20)]
+        parts = list(compress_stream("gzip", iter(rows)))
+        assert gzip.decompress(b"".join(parts)) == b"".join(rows)
+        # One part per 64 KiB of input (plus whatever zlib emits on its own), not one per row.
+        assert len(parts) < 10 < len(rows)
+
+    def test_async_responses_are_compressed(self, auth_client, async_client, tasks):
+        token = auth_client._credentials["HTTP_AUTHORIZATION"].split()[1]
+        response = async_client("get", "/api/async/tasks/?page_size=20", token=token, headers={"Accept-Encoding": "gzip"})
+        assert response["Content-Encoding"] == "gzip"
+        assert len(json.loads(gzip.decompress(response.content))["results"]) == 20
+
+    def test_brotli_is_preferred(self, auth_client, tasks):
+        brotli = pytest.importorskip("brotli")
+        response = auth_client.get("/api/tasks/?page_size=20", HTTP_ACCEPT_ENCODING="gzip, br")
+        assert response["Content-Encoding"] == "br"
+        assert json.loads(brotli.decompress(response.content))["count"] == 20
@@ -0,0 +1,195 @@
+import multiprocessing
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from apps.jobs import queue
+from apps.jobs.worker import work
+from apps.jobs.models import Job
+from apps.tasks import counters
+from apps.tasks.models import Task
+
+
+@pytest.fixture
+def flaky_handler():
+    calls = []
+
+    @queue.register("tests.flaky")
+    def flaky(context, fail_times):
+        calls.append(context.job.attempts)
+        if len(calls) <= fail_times:
+            raise RuntimeError("boom")
+        context.progress(1, 1)
+        return {"calls": len(calls)}
+
+    yield calls
+    queue._handlers.pop("tests.flaky")
+
+
+def run_jobs():
+    call_command("run_jobs", once=True)
+
+
+@pytest.mark.django_db
+class TestJobQueue:
+    def test_success(self, flaky_handler):
+        job = queue.enqueue("tests.flaky", fail_times=0)
+        run_jobs()
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+        assert job.result == {"calls": 1}
+        assert (job.progress_done, job.progress_total) == (1, 1)
+        assert job.finished_at is not None
+
+    def test_retries_then_succeeds(self, flaky_handler, settings):
+        settings.JOBS_RETRY_BACKOFF = 0
+        job = queue.enqueue("tests.flaky", max_attempts=3, fail_times=2)
+        run_jobs()
+        job.refresh_from_db()
+        assert job.status == Job.SUCCEEDED
+        assert flaky_handler == [1, 2, 3]
+
+    def test_fails_after_max_attempts(self, flaky_handler, settings):
+        settings.JOBS_RETRY_BACKOFF = 0
+        job = queue.enqueue("tests.flaky", max_attempts=2, fail_times=5)
+        run_jobs()
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert job.attempts == 2
+        assert job.error == "RuntimeError: boom"
+
+    def test_retry_waits_for_backoff(self, flaky_handler, settings):
+        settings.JOBS_RETRY_BACKOFF = 60
+        job = queue.enqueue("tests.flaky", max_attempts=2, fail_times=1)
+        run_jobs()
+        job.refresh_from_db()
+        assert job.status == Job.QUEUED
+        assert job.run_after > timezone.now() + timedelta(seconds=50)
+
+    def test_a_job_is_claimed_once(self, flaky_handler):
+        queue.enqueue("tests.flaky", fail_times=0)
+        assert queue.claim("a") is not None
+        assert queue.claim("b") is None
+
+    def test_expired_lease_is_reclaimed(self, flaky_handler):
+        job = queue.enqueue("tests.flaky", max_attempts=2, fail_times=0)
+        claimed = queue.claim("lost-worker")
+        Job.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        reclaimed = queue.claim("new-worker")
+        assert reclaimed.pk == claimed.pk
+        assert (reclaimed.attempts, reclaimed.worker) == (2, "new-worker")
+
+        # The lost worker can no longer record a result for it.
+        queue.finish(claimed, Job.SUCCEEDED)
+        assert Job.objects.get(pk=job.pk).status == Job.RUNNING
+
+        Job.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        assert queue.claim("third-worker") is None
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert "lost" in job.error
+
+    def test_unknown_kind_cannot_be_enqueued(self):
+        with pytest.raises(LookupError):
+            queue.enqueue("tests.missing")
+
+    def test_work_stops_when_idle_with_once(self):
+        from apps.jobs.worker import work
+        assert work(threading.Event(), once=True) == 0
+
+
+@pytest.mark.django_db
+class TestJobEndpoints:
+    def test_bulk_status_change(self, auth_client, create_user):
+        for i in range(5):
+            Task.objects.create(title=f"Report {i}" if i < 3 else f"Other {i}", owner=auth_client._user)
+        theirs = Task.objects.create(title="Report theirs", owner=create_user(email="o@example.com", username="o"))
+
+        response = auth_client.post("/api/tasks/bulk/status/", {"completed": True, "search": "report"}, format="json")
+        assert response.status_code == 202
+        assert response["Location"] == f"/api/jobs/{response.data['id']}/"
+        assert response.data["status"] == Job.QUEUED
+        run_jobs()
+
+        job = auth_client.get(response["Location"]).data
+        assert job["status"] == Job.SUCCEEDED
+        assert job["result"] == {"updated": 3}
+        assert job["progress"] == {"done": 3, "total": 3}
+        assert Task.objects.filter(owner=auth_client._user, completed=True).count() == 3
+        assert not Task.objects.get(pk=theirs.pk).completed
+        assert counters.counts_for(auth_client._user.pk)["completed"] == 3
+
+    def test_job_in_another_process_invalidates_list_pages(self, auth_client, settings, tmp_path, list_cache_enabled):
+        # A file cache is shared between processes, like Redis.
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}}
+        Task.objects.create(title="Report", owner=auth_client._user)
+        auth_client.post("/api/tasks/bulk/status/", {"completed": True}, format="json")
+        auth_client.get("/api/tasks/")
+        assert auth_client.get("/api/tasks/")["X-Cache"] == "HIT"
+
+        # Forked like `run_jobs` workers. The child works on a copy of the in-memory
+        # test database, so only the shared cache carries its writes back here.
+        worker = multiprocessing.get_context("fork").Process(target=work, args=(threading.Event(),), kwargs={"once": True})
+        worker.start()
+        worker.join(30)
+        assert worker.exitcode == 0
+        assert auth_client.get("/api/tasks/")["X-Cache"] == "MISS"
+
+    def test_worker_refuses_page_cache_without_shared_cache(self, list_cache_enabled):
+        with pytest.raises(CommandError, match="local to each process"):
+            run_jobs()
+
+    def test_export_job_and_download(self, auth_client, settings, tmp_path):
+        settings.JOB_RESULT_DIR = str(tmp_path)
+        Task.objects.create(title="Done", completed=True, owner=auth_client._user)
+        Task.objects.create(title="Open", owner=auth_client._user)
+        response = auth_client.post("/api/tasks/export/jobs/", {"format": "csv", "completed": True}, format="json")
+        assert response.status_code == 202
+        result_url = response["Location"] + "result/"
+        assert auth_client.get(result_url).status_code == 409
+        run_jobs()
+
+        assert auth_client.get(response["Location"]).data["result"]["rows"] == 1
+        download = auth_client.get(result_url)
+        assert download.status_code == 200
+        assert download["Content-Type"].startswith("text/csv")
+        lines = b"".join(download.streaming_content).decode().splitlines()
+        assert lines[0].startswith("id,title") and len(lines) == 2 and ",Done," in lines[1]
+
+    def test_jobs_are_private(self, auth_client, create_user):
+        other = create_user(email="o@example.com", username="o")
+        job = Job.objects.create(kind="tasks.export", owner=other)
+        assert auth_client.get(f"/api/jobs/{job.pk}/").status_code == 404
+        assert auth_client.get("/api/jobs/").data["count"] == 0
+
+    def test_admin_deletes_user_in_background(self, admin_client, api_client, create_user):
+        user = create_user()
+        for i in range(3):
+            Task.objects.create(title=f"T{i}", owner=user)
+        token = api_client.post("/api/auth/login/", {"email": user.email, "password": "strongpass123"}, format="json").data["access"]
+
+        response = admin_client.delete(f"/api/auth/users/{user.pk}/")
+        assert response.status_code == 202
+        user.refresh_from_db()
+        assert not user.is_active
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert api_client.get("/api/tasks/").status_code == 401
+        api_client.credentials(HTTP_AUTHORIZATION=admin_client._credentials["HTTP_AUTHORIZATION"])
+
+        run_jobs()
+        job = Job.objects.get(pk=response.data["id"])
+        assert job.status == Job.SUCCEEDED
+        assert job.result == {"deleted_tasks": 3}
+        assert not Task.objects.filter(owner_id=user.pk).exists()
+        assert not type(user).objects.filter(pk=user.pk).exists()
+
+    def test_user_deletion_rules(self, admin_client):
+        assert admin_client.delete(f"/api/auth/users/{admin_client._user.pk}/").status_code == 400
+        assert admin_client.delete("/api/auth/users/999999/").status_code == 404
+
+    def test_user_deletion_is_admin_only(self, auth_client, create_user):
+        other = create_user(email="o@example.com", username="o")
+        assert auth_client.delete(f"/api/auth/users/{other.pk}/").status_code == 403
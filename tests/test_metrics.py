@@ -0,0 +1,101 @@
+import pstats
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from apps.tasks.models import Task
+from task_manager.metrics import Histogram, registry
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def sample(text, line_prefix):
+    """Value of the first exposition line starting with `line_prefix`."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix!r} not found in metrics")
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram("x", "X.", ("view",), buckets=(1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(("a",), value)
+        lines = histogram.render()
+        assert 'x_bucket{view="a",le="1.0"} 2' in lines
+        assert 'x_bucket{view="a",le="5.0"} 3' in lines
+        assert 'x_bucket{view="a",le="+Inf"} 4' in lines
+        assert 'x_sum{view="a"} 14.5' in lines
+        assert 'x_count{view="a"} 4' in lines
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_requires_admin(self, auth_client):
+        assert auth_client.get("/api/metrics/").status_code == 403
+
+    def test_anonymous_is_rejected(self, api_client):
+        assert api_client.get("/api/metrics/").status_code == 401
+
+    def test_records_requests_per_view(self, admin_client, list_cache_enabled):
+        Task.objects.create(title="Mine", owner=admin_client._user)
+        admin_client.get("/api/tasks/")
+        admin_client.get("/api/tasks/")
+        response = admin_client.get("/api/metrics/")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.content.decode()
+        labels = '{view="task-list-create",method="GET"}'
+        assert sample(text, 'http_requests_total{view="task-list-create",method="GET",status="200"}') == 2
+        assert sample(text, f"http_request_duration_seconds_count{labels}") == 2
+        # The first page render runs 2 statements; the second is a cache hit.
+        assert sample(text, f"http_request_db_queries_sum{labels}") == 2
+        assert sample(text, f"http_request_db_duration_seconds_sum{labels}") > 0
+        assert sample(text, f"http_request_serialization_duration_seconds_sum{labels}") > 0
+        assert sample(text, 'http_requests_total{view="auth-login",method="POST",status="200"}') == 1
+        assert sample(text, "task_list_cache_hits_total") >= 1
+
+    def test_unresolved_paths_share_a_label(self, admin_client):
+        admin_client.get("/no/such/path/")
+        text = admin_client.get("/api/metrics/").content.decode()
+        assert sample(text, 'http_requests_total{view="unmatched",method="GET",status="404"}') == 1
+
+    def test_async_view_queries_are_attributed(self, admin_client):
+        token = admin_client._credentials["HTTP_AUTHORIZATION"]
+        async_to_sync(AsyncClient().get)("/api/async/tasks/", headers={"Authorization": token})
+        text = admin_client.get("/api/metrics/").content.decode()
+        assert sample(text, 'http_request_db_queries_sum{view="async-task-list-create",method="GET"}') == 2
+
+    def test_disabled(self, admin_client, settings):
+        settings.METRICS_ENABLED = False
+        admin_client.get("/api/tasks/")
+        assert "task-list-create" not in admin_client.get("/api/metrics/").content.decode()
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    def test_admin_request_is_profiled(self, admin_client, settings, tmp_path):
+        settings.REQUEST_PROFILING_ENABLED = True
+        settings.REQUEST_PROFILE_DIR = str(tmp_path)
+        response = admin_client.get("/api/tasks/", HTTP_X_PROFILE="1")
+        assert response.status_code == 200
+        name = response["X-Profile"]
+        assert "task-list-create" in name
+        assert pstats.Stats(str(tmp_path / name)).total_calls > 0
+
+    def test_regular_user_is_not_profiled(self, auth_client, settings, tmp_path):
+        settings.REQUEST_PROFILING_ENABLED = True
+        settings.REQUEST_PROFILE_DIR = str(tmp_path)
+        response = auth_client.get("/api/tasks/", HTTP_X_PROFILE="1")
+        assert "X-Profile" not in response
+        assert not list(tmp_path.iterdir())
+
+    def test_off_by_default(self, admin_client, tmp_path, settings):
+        settings.REQUEST_PROFILE_DIR = str(tmp_path)
+        assert "X-Profile" not in admin_client.get("/api/tasks/", HTTP_X_PROFILE="1")
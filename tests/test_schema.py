@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from task_manager import schema
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache():
+    schema.clear_cache()
+    yield
+    schema.clear_cache()
+
+
+@pytest.mark.django_db
+class TestCachedSchema:
+    def test_schema_is_generated_once(self, api_client, monkeypatch):
+        calls = []
+        render = schema.render
+        monkeypatch.setattr(schema, "render", lambda *args, **kwargs: calls.append(1) or render(*args, **kwargs))
+        first = api_client.get("/api/docs/?format=openapi")
+        second = api_client.get("/api/docs/?format=openapi")
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert len(calls) == 1
+        assert "/tasks/stats/" in json.loads(first.content)["paths"]
+
+    def test_etag_and_not_modified(self, api_client):
+        response = api_client.get("/api/schema.json")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("application/json")
+        assert "no-cache" in response["Cache-Control"]
+        etag = response["ETag"]
+        cached = api_client.get("/api/schema.json", HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == 304
+        assert cached["ETag"] == etag
+
+    def test_yaml(self, api_client):
+        response = api_client.get("/api/schema.yaml")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("application/yaml")
+        assert b"swagger: '2.0'" in response.content
+
+    def test_ui_pages(self, api_client):
+        assert api_client.get("/api/docs/").status_code == 200
+        assert api_client.get("/api/redoc/").status_code == 200
+
+    def test_prerendered_files(self, api_client, settings, tmp_path, capsys):
+        call_command("render_openapi_schema", output_dir=str(tmp_path), url="https://api.example.com")
+        assert "openapi.json" in capsys.readouterr().out
+        assert json.loads((tmp_path / "openapi.json").read_text())["host"] == "api.example.com"
+        assert (tmp_path / "openapi.yaml").exists()
+
+        (tmp_path / "openapi.json").write_text('{"swagger": "2.0", "marker": true}')
+        settings.OPENAPI_SCHEMA_DIR = str(tmp_path)
+        response = api_client.get("/api/schema.json")
+        assert json.loads(response.content)["marker"] is True
+        assert response["ETag"] == schema.SchemaDocument.from_content(response.content, "").etag
@@ -0,0 +1,57 @@
+import importlib
+import os
+
+import pytest
+from django.urls import clear_url_caches
+from task_manager.startup import parse_importtime, profile_startup
+
+# Seconds a fresh API-only worker may take to load the application and URLconf.
+# Generous for shared CI runners; override with STARTUP_BUDGET_SECONDS.
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "2.0"))
+
+# Only needed to generate the schema, or by the admin site.
+DEFERRED_MODULES = ("drf_yasg.generators", "drf_yasg.renderers", "swagger_spec_validator", "jsonschema")
+
+
+class TestStartup:
+    def test_api_only_startup_is_within_budget(self):
+        profile = profile_startup(api_only=True)
+        assert profile.seconds < STARTUP_BUDGET_SECONDS
+
+    @pytest.mark.parametrize("api_only", [True, False])
+    def test_schema_generation_is_not_imported(self, api_only):
+        modules = {record.module for record in profile_startup(api_only=api_only, importtime=True).imports}
+        assert "apps.tasks.views" in modules
+        assert not modules.intersection(DEFERRED_MODULES)
+
+    def test_parse_importtime(self):
+        text = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     encodings.idna",
+            "import time:       300 |        420 |   encodings",
+            "import time:        50 |        470 | task_manager",
+        ])
+        records = parse_importtime(text)
+        assert [(r.module, r.depth, r.self_us, r.cumulative_us) for r in records] == [
+            ("encodings.idna", 2, 120, 120),
+            ("encodings", 1, 300, 420),
+            ("task_manager", 0, 50, 470),
+        ]
+
+
+class TestApiOnlyUrls:
+    def reload_urls(self):
+        module = importlib.reload(importlib.import_module("task_manager.urls"))
+        clear_url_caches()
+        return {pattern.name for pattern in module.urlpatterns if getattr(pattern, "name", None)}
+
+    def test_docs_and_admin_are_not_registered(self, settings):
+        settings.API_ONLY = True
+        try:
+            names = self.reload_urls()
+        finally:
+            settings.API_ONLY = False
+            full = self.reload_urls()
+        assert "metrics" in names
+        assert not names & {"swagger-ui", "redoc", "schema", "root"}
+        assert {"swagger-ui", "redoc", "schema", "root"} <= full
@@ -1,5 +1,31 @@
+import base64
+import csv
+import datetime
+import io
+import json
+
 import pytest
-from apps.tasks.models import Task
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import OuterRef, Subquery
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from django.core.management.base import CommandError
+from apps.jobs.models import Job
+from apps.tasks import analytics
+from apps.tasks import cache as list_cache
+from apps.tasks import counters
+from apps.tasks.models import Task, TaskChange, TaskCounter, TaskDailyRollup
+from apps.tasks.search import search_tasks
+from apps.tasks.serializers import (
+    TASK_VALUE_FIELDS,
+    TaskSerializer,
+    task_representation,
+    task_rows_representation,
+)
 
 
 @pytest.mark.django_db
@@ -115,3 +141,1060 @@ class TestAdminAccess:
         task_id = created.data["id"]
         response = admin_client.delete(f"/api/tasks/{task_id}/")
         assert response.status_code == 204
+
+
+@pytest.mark.django_db
+class TestTaskKeysetPagination:
+    def _titles(self, response):
+        return [t["title"] for t in response.data["results"]]
+
+    def test_cursor_mode_has_no_count(self, auth_client):
+        for i in range(3):
+            auth_client.post("/api/tasks/", {"title": f"Task {i}"}, format="json")
+        response = auth_client.get("/api/tasks/?pagination=cursor")
+        assert response.status_code == 200
+        assert "count" not in response.data
+        assert self._titles(response) == ["Task 2", "Task 1", "Task 0"]
+        assert response.data["next"] is None
+
+    def test_walk_all_pages_forward_and_back(self, auth_client):
+        for i in range(7):
+            auth_client.post("/api/tasks/", {"title": f"Task {i}"}, format="json")
+        seen = []
+        url = "/api/tasks/?pagination=cursor&page_size=3"
+        pages = []
+        while url:
+            response = auth_client.get(url)
+            assert response.status_code == 200
+            pages.append(self._titles(response))
+            seen.extend(self._titles(response))
+            url = response.data["next"]
+        assert seen == [f"Task {i}" for i in reversed(range(7))]
+        assert len(pages) == 3
+
+        previous = auth_client.get(response.data["previous"])
+        assert self._titles(previous) == pages[1]
+
+    def test_ordering_and_completed_filter(self, auth_client):
+        for i in range(4):
+            auth_client.post("/api/tasks/", {"title": f"Task {i}", "completed": i % 2 == 0}, format="json")
+        first = auth_client.get("/api/tasks/?pagination=cursor&ordering=created_at&completed=true&page_size=1")
+        assert self._titles(first) == ["Task 0"]
+        second = auth_client.get(first.data["next"])
+        assert self._titles(second) == ["Task 2"]
+        assert second.data["next"] is None
+
+    def test_invalid_cursor(self, auth_client):
+        response = auth_client.get("/api/tasks/?cursor=not-a-cursor")
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"v": "2024-13-45T00:00:00", "id": 1},
+            {"v": "2024-01-01T00:00:00Z", "id": 2 ** 64},
+            {"v": "2024-01-01T00:00:00Z", "id": -1},
+            {"v": "2024-01-01T00:00:00Z", "id": True},
+            {"v": "2024-01-01T00:00:00Z", "id": "1"},
+            {"v": 20240101, "id": 1},
+        ],
+    )
+    def test_well_formed_cursor_with_bad_values(self, auth_client, payload):
+        Task.objects.create(title="Task", owner=auth_client._user)
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        response = auth_client.get(f"/api/tasks/?cursor={cursor}")
+        assert response.status_code == 404
+        assert response.data["detail"] == "Invalid cursor"
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="query plan assertions are written for SQLite")
+class TestTaskQueryPlans:
+    """The hot list queries must be served by a composite index, without a temp sort."""
+
+    def _assert_indexed(self, client, path, *index_names):
+        """EXPLAIN every task query the list view runs for `path`; the ordered page query must use `index_names`."""
+        Task.objects.bulk_create(Task(title=f"Task {i}", owner=client._user, completed=i % 2 == 0) for i in range(5))
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(path)
+        assert response.status_code == 200
+        plans = {}
+        with connection.cursor() as cursor:
+            for query in ctx.captured_queries:
+                if 'FROM "tasks_task"' in query["sql"]:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                    plans[query["sql"]] = "\n".join(row[-1] for row in cursor.fetchall())
+        for plan in plans.values():
+            assert "SCAN tasks_task" not in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
+        page_plans = [plan for sql, plan in plans.items() if "ORDER BY" in sql]
+        assert page_plans, plans
+        for plan in page_plans:
+            assert any(f"USING INDEX {name}" in plan for name in index_names), plan
+
+    def test_owner_list_uses_index(self, auth_client):
+        self._assert_indexed(auth_client, "/api/tasks/", "task_owner_created_idx")
+
+    def test_owner_completed_list_uses_index(self, auth_client):
+        # Without ANALYZE statistics SQLite may prefer the narrower index; either avoids the sort.
+        self._assert_indexed(
+            auth_client,
+            "/api/tasks/?completed=true",
+            "task_owner_done_created_idx",
+            "task_owner_created_idx",
+        )
+
+    def test_owner_updated_ordering_uses_index(self, auth_client):
+        self._assert_indexed(auth_client, "/api/tasks/?ordering=-updated_at", "task_owner_updated_idx")
+
+    def test_owner_keyset_page_uses_index(self, auth_client):
+        # The keyset page adds an id tiebreak to the ordering; the index's trailing rowid serves it.
+        self._assert_indexed(auth_client, "/api/tasks/?pagination=cursor&ordering=-updated_at", "task_owner_updated_idx")
+
+
+@pytest.mark.django_db
+class TestTaskQueryCount:
+    """Regression guard: list/detail query counts must not grow with the number of rows or owners."""
+
+    # ETag MAX/COUNT (reused as the paginator's count) + page query (authentication is served from token claims)
+    LIST_QUERIES = 2
+    # task lookup
+    DETAIL_QUERIES = 1
+
+    def test_admin_list_constant_queries(self, admin_client, create_tasks, django_assert_max_num_queries):
+        create_tasks(count=20, owners=10)
+        with django_assert_max_num_queries(self.LIST_QUERIES):
+            response = admin_client.get("/api/tasks/?page_size=20")
+        assert len(response.data["results"]) == 20
+        assert response.data["results"][0]["owner"].startswith("owner")
+
+    def test_admin_keyset_list_constant_queries(self, admin_client, create_tasks, django_assert_max_num_queries):
+        create_tasks(count=20, owners=10)
+        with django_assert_max_num_queries(self.LIST_QUERIES - 1):
+            response = admin_client.get("/api/tasks/?pagination=cursor&page_size=20")
+        assert len(response.data["results"]) == 20
+
+    def test_detail_constant_queries(self, auth_client, django_assert_max_num_queries):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        with django_assert_max_num_queries(self.DETAIL_QUERIES):
+            response = auth_client.get(f"/api/tasks/{task.id}/")
+        assert response.data["owner"] == auth_client._user.email
+
+
+@pytest.mark.django_db
+class TestTaskFieldSelection:
+    def _page_sql(self, client, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        return response, [q["sql"] for q in queries.captured_queries if "LIMIT" in q["sql"]][-1]
+
+    def test_list_returns_and_reads_only_requested_fields(self, auth_client):
+        Task.objects.create(title="Mine", description="x" * 500, completed=True, owner=auth_client._user)
+        response, sql = self._page_sql(auth_client, "/api/tasks/?fields=completed,title")
+        assert response.data["results"] == [{"title": "Mine", "completed": True}]
+        assert "description" not in sql
+        assert "users" not in sql
+        response, sql = self._page_sql(auth_client, "/api/tasks/?fields=owner")
+        assert response.data["results"] == [{"owner": auth_client._user.email}]
+
+    def test_unknown_field_is_rejected(self, auth_client):
+        response = auth_client.get("/api/tasks/?fields=title,password")
+        assert response.status_code == 400
+        assert "password" in response.data["fields"][0]
+
+    def test_compact_list(self, auth_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        response = auth_client.get("/api/tasks/?compact=true&fields=id,title,created_at")
+        assert list(response.data) == ["count", "next", "previous", "columns", "results"]
+        assert response.data["columns"] == ["id", "title", "created_at"]
+        assert response.data["results"] == [[task.id, "Mine", auth_client.get(f"/api/tasks/{task.id}/").data["created_at"]]]
+        full = auth_client.get("/api/tasks/?compact=1")
+        assert dict(zip(full.data["columns"], full.data["results"][0])) == auth_client.get("/api/tasks/").data["results"][0]
+
+    def test_keyset_pages_with_fields(self, auth_client):
+        for i in range(3):
+            Task.objects.create(title=f"Task {i}", owner=auth_client._user)
+        first = auth_client.get("/api/tasks/?pagination=cursor&page_size=2&fields=title&compact=true")
+        assert first.data["results"] == [["Task 2"], ["Task 1"]]
+        assert auth_client.get(first.data["next"]).data["results"] == [["Task 0"]]
+
+    def test_detail_defers_unrequested_columns(self, auth_client, create_user):
+        task = Task.objects.create(title="Mine", description="x" * 500, owner=auth_client._user)
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(f"/api/tasks/{task.id}/?fields=title")
+        assert response.data == {"title": "Mine"}
+        assert len(queries.captured_queries) == 1
+        assert "description" not in queries.captured_queries[0]["sql"]
+        assert "users" not in queries.captured_queries[0]["sql"]
+        assert auth_client.get(f"/api/tasks/{task.id}/?fields=owner,id").data == {"id": task.id, "owner": auth_client._user.email}
+        # Field selection does not get around ownership.
+        other = Task.objects.create(title="Other", owner=create_user(email="other@example.com", username="other"))
+        assert auth_client.get(f"/api/tasks/{other.id}/?fields=title").status_code == 404
+
+    def test_detail_etag_names_the_field_set(self, auth_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        url = f"/api/tasks/{task.id}/"
+        full = auth_client.get(url)["ETag"]
+        sparse = auth_client.get(f"{url}?fields=title,id")["ETag"]
+        assert sparse != full
+        assert auth_client.get(f"{url}?fields=id,title")["ETag"] == sparse
+        every_field = ",".join(auth_client.get(url).data)
+        assert auth_client.get(f"{url}?fields={every_field}")["ETag"] == full
+        # The sparse tag only revalidates the sparse body.
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=sparse).status_code == 200
+        assert auth_client.get(f"{url}?fields=id,title", HTTP_IF_NONE_MATCH=sparse).status_code == 304
+        assert auth_client.patch(url, {"title": "New"}, format="json", HTTP_IF_MATCH=sparse).status_code == 412
+        assert auth_client.patch(url, {"title": "New"}, format="json", HTTP_IF_MATCH=full).status_code == 200
+
+    def test_async_views_match(self, auth_client, async_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        token = auth_client._credentials["HTTP_AUTHORIZATION"].split()[1]
+        for query in ("?fields=title,completed", "?compact=true&fields=id,owner"):
+            response = async_client("get", f"/api/async/tasks/{query}", token=token)
+            assert response.json() == auth_client.get(f"/api/tasks/{query}").json()
+        response = async_client("get", f"/api/async/tasks/{task.id}/?fields=title", token=token)
+        assert response.json() == {"title": "Mine"}
+        assert async_client("get", "/api/async/tasks/?fields=nope", token=token).status_code == 400
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    def _titles(self, response):
+        return [t["title"] for t in response.data["results"]]
+
+    def test_search_title_and_description(self, auth_client):
+        auth_client.post("/api/tasks/", {"title": "Quarterly report"}, format="json")
+        auth_client.post("/api/tasks/", {"title": "Email", "description": "send the report to finance"}, format="json")
+        auth_client.post("/api/tasks/", {"title": "Groceries"}, format="json")
+        response = auth_client.get("/api/tasks/?search=report")
+        assert response.status_code == 200
+        assert response.data["count"] == 2
+        assert set(self._titles(response)) == {"Quarterly report", "Email"}
+
+    def test_search_requires_every_term_and_matches_prefixes(self, auth_client):
+        auth_client.post("/api/tasks/", {"title": "Write API documentation"}, format="json")
+        auth_client.post("/api/tasks/", {"title": "Write tests"}, format="json")
+        response = auth_client.get("/api/tasks/?search=wri docu")
+        assert self._titles(response) == ["Write API documentation"]
+
+    def test_search_ranks_best_match_first(self, auth_client):
+        auth_client.post("/api/tasks/", {"title": "Budget", "description": "one mention of invoice among many other words here"}, format="json")
+        auth_client.post("/api/tasks/", {"title": "Invoice invoice", "description": "invoice"}, format="json")
+        response = auth_client.get("/api/tasks/?search=invoice")
+        assert self._titles(response) == ["Invoice invoice", "Budget"]
+
+    def test_search_index_follows_updates_and_deletes(self, auth_client):
+        created = auth_client.post("/api/tasks/", {"title": "Old name"}, format="json")
+        task_id = created.data["id"]
+        auth_client.patch(f"/api/tasks/{task_id}/", {"title": "Renamed"}, format="json")
+        assert auth_client.get("/api/tasks/?search=old").data["count"] == 0
+        assert auth_client.get("/api/tasks/?search=renamed").data["count"] == 1
+        auth_client.delete(f"/api/tasks/{task_id}/")
+        assert auth_client.get("/api/tasks/?search=renamed").data["count"] == 0
+
+    def test_search_respects_ownership(self, auth_client, create_user):
+        other = create_user(email="other@example.com", username="otheruser")
+        Task.objects.create(title="Secret plan", owner=other)
+        assert auth_client.get("/api/tasks/?search=secret").data["count"] == 0
+
+    def test_rank_follows_the_task_table_alias(self, auth_client):
+        mine = auth_client._user
+        best = Task.objects.create(title="report report report", owner=mine)
+        Task.objects.create(title="report", description="and more words besides", owner=mine)
+        Task.objects.create(title="Groceries", owner=mine)
+        # As a subquery the ranked tasks are aliased, and the rank must be the inner row's.
+        ranked = search_tasks(Task.objects.all(), "report").filter(owner=OuterRef("owner"))
+        rows = Task.objects.annotate(
+            best_match=Subquery(ranked.values("pk")[:1]),
+            best_rank=Subquery(ranked.values("search_rank")[:1]),
+        )
+        assert {row.best_match for row in rows} == {best.pk}
+        assert all(row.best_rank is not None for row in rows)
+
+    def test_search_ignores_query_syntax(self, auth_client):
+        auth_client.post("/api/tasks/", {"title": "Fix bug"}, format="json")
+        response = auth_client.get('/api/tasks/?search="bug* (fix')
+        assert response.status_code == 200
+        assert self._titles(response) == ["Fix bug"]
+
+
+@pytest.mark.django_db
+class TestTaskBulk:
+    URL = "/api/tasks/bulk/"
+
+    def test_bulk_create(self, auth_client):
+        payload = [{"title": "A"}, {"title": "B", "completed": True}]
+        response = auth_client.post(self.URL, payload, format="json")
+        assert response.status_code == 201
+        assert [r["data"]["title"] for r in response.data["results"]] == ["A", "B"]
+        assert all(r["data"]["owner"] == auth_client._user.email for r in response.data["results"])
+        assert Task.objects.filter(owner=auth_client._user).count() == 2
+
+    def test_bulk_create_reports_invalid_items(self, auth_client):
+        payload = [{"title": "Good"}, {"description": "no title"}, {"title": "Also good"}]
+        response = auth_client.post(self.URL, payload, format="json")
+        assert response.status_code == 207
+        assert [r["status"] for r in response.data["results"]] == [201, 400, 201]
+        assert "title" in response.data["results"][1]["errors"]
+        assert Task.objects.count() == 2
+
+    def test_bulk_create_constant_queries(self, auth_client, django_assert_max_num_queries):
+        payload = [{"title": f"Task {i}"} for i in range(50)]
+        # owner lookup + INSERT, plus savepoint bookkeeping
+        with django_assert_max_num_queries(4):
+            response = auth_client.post(self.URL, payload, format="json")
+        assert response.status_code == 201
+
+    def test_bulk_rejects_oversized_or_empty_payload(self, auth_client, settings):
+        settings.TASK_BULK_MAX_ITEMS = 2
+        response = auth_client.post(self.URL, [{"title": "x"}] * 3, format="json")
+        assert response.status_code == 400
+        assert auth_client.post(self.URL, [], format="json").status_code == 400
+        assert auth_client.post(self.URL, {"title": "x"}, format="json").status_code == 400
+
+    def test_bulk_update(self, auth_client, create_user):
+        mine = Task.objects.create(title="Mine", owner=auth_client._user)
+        other = Task.objects.create(title="Theirs", owner=create_user(email="o@example.com", username="o"))
+        payload = [
+            {"id": mine.id, "completed": True, "title": "Mine, done"},
+            {"id": other.id, "completed": True},
+            {"id": 999999, "title": "ghost"},
+        ]
+        response = auth_client.patch(self.URL, payload, format="json")
+        assert response.status_code == 207
+        assert [r["status"] for r in response.data["results"]] == [200, 404, 404]
+        mine.refresh_from_db()
+        other.refresh_from_db()
+        assert mine.completed and mine.title == "Mine, done"
+        assert mine.updated_at > mine.created_at
+        assert not other.completed
+
+    def test_bulk_update_rejects_malformed_ids(self, auth_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        payload = [
+            {"id": [task.id], "title": "list"},
+            {"id": {"x": task.id}, "title": "dict"},
+            {"id": True, "title": "bool"},
+            {"id": str(task.id), "title": "string"},
+            {"title": "no id"},
+            "not an object",
+            {"id": 2 ** 63, "title": "past bigint"},
+        ]
+        response = auth_client.patch(self.URL, payload, format="json")
+        assert response.status_code == 207
+        assert [r["status"] for r in response.data["results"]] == [400, 400, 400, 400, 400, 400, 404]
+        assert "id" in response.data["results"][0]["errors"]
+        task.refresh_from_db()
+        assert task.title == "Mine"
+
+    def test_bulk_delete(self, auth_client, create_user):
+        mine = [Task.objects.create(title=f"Mine {i}", owner=auth_client._user) for i in range(2)]
+        other = Task.objects.create(title="Theirs", owner=create_user(email="o@example.com", username="o"))
+        response = auth_client.delete(self.URL, {"ids": [mine[0].id, mine[1].id, other.id]}, format="json")
+        assert response.status_code == 207
+        assert [r["status"] for r in response.data["results"]] == [204, 204, 404]
+        assert list(Task.objects.values_list("id", flat=True)) == [other.id]
+
+    def test_bulk_delete_reports_out_of_range_ids(self, auth_client, settings):
+        # orjson decodes integers past 64 bits as floats; the standard library keeps them.
+        settings.JSON_BACKEND = "json"
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        response = auth_client.delete(self.URL, {"ids": [task.id, 2 ** 63, 2 ** 64]}, format="json")
+        assert response.status_code == 207
+        assert [r["status"] for r in response.data["results"]] == [204, 404, 404]
+        assert not Task.objects.exists()
+
+    def test_bulk_update_reads_rows_in_the_write_transaction(self, auth_client):
+        task = Task.objects.create(title="Mine", owner=auth_client._user)
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.patch(self.URL, [{"id": task.id, "completed": True}], format="json")
+        assert response.status_code == 200
+        sql = [query["sql"] for query in queries.captured_queries]
+        select = next(i for i, q in enumerate(sql) if q.startswith("SELECT") and '"tasks_task"."id" IN' in q)
+        update = next(i for i, q in enumerate(sql) if q.startswith("UPDATE"))
+        begin = max(i for i, q in enumerate(sql[:select]) if "SAVEPOINT" in q or q.startswith("BEGIN"))
+        assert begin < select < update
+
+    def test_admin_bulk_delete_any(self, admin_client, create_user):
+        task = Task.objects.create(title="User task", owner=create_user())
+        response = admin_client.delete(self.URL, {"ids": [task.id]}, format="json")
+        assert response.status_code == 200
+        assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+class TestTaskConditionalRequests:
+    def test_detail_etag_and_not_modified(self, auth_client, django_assert_max_num_queries):
+        task = Task.objects.create(title="Cached", owner=auth_client._user)
+        response = auth_client.get(f"/api/tasks/{task.id}/")
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert "Last-Modified" in response
+
+        with django_assert_max_num_queries(1):
+            cached = auth_client.get(f"/api/tasks/{task.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        cached = auth_client.get(f"/api/tasks/{task.id}/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        assert cached.status_code == 304
+
+    def test_detail_etag_changes_after_update(self, auth_client):
+        task = Task.objects.create(title="Before", owner=auth_client._user)
+        etag = auth_client.get(f"/api/tasks/{task.id}/")["ETag"]
+        auth_client.patch(f"/api/tasks/{task.id}/", {"title": "After"}, format="json")
+        response = auth_client.get(f"/api/tasks/{task.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["title"] == "After"
+
+    def test_if_match_optimistic_concurrency(self, auth_client):
+        task = Task.objects.create(title="Shared", owner=auth_client._user)
+        etag = auth_client.get(f"/api/tasks/{task.id}/")["ETag"]
+
+        first = auth_client.patch(f"/api/tasks/{task.id}/", {"title": "First"}, format="json", HTTP_IF_MATCH=etag)
+        assert first.status_code == 200
+        assert first["ETag"] != etag
+
+        stale = auth_client.patch(f"/api/tasks/{task.id}/", {"title": "Second"}, format="json", HTTP_IF_MATCH=etag)
+        assert stale.status_code == 412
+        task.refresh_from_db()
+        assert task.title == "First"
+
+        fresh = auth_client.put(
+            f"/api/tasks/{task.id}/", {"title": "Second"}, format="json", HTTP_IF_MATCH=first["ETag"]
+        )
+        assert fresh.status_code == 200
+
+    def test_list_etag_tracks_creates_updates_and_deletes(self, auth_client):
+        task = Task.objects.create(title="One", owner=auth_client._user)
+        etag = auth_client.get("/api/tasks/")["ETag"]
+        assert auth_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        other = Task.objects.create(title="Two", owner=auth_client._user)
+        created = auth_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert created.status_code == 200
+
+        other.delete()
+        deleted = auth_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=created["ETag"])
+        assert deleted.status_code == 200
+
+        task.completed = True
+        task.save()
+        updated = auth_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=deleted["ETag"])
+        assert updated.status_code == 200
+
+    def test_cursor_page_etag_tracks_its_rows(self, auth_client, django_assert_num_queries):
+        task = Task.objects.create(title="One", owner=auth_client._user)
+        url = "/api/tasks/?pagination=cursor"
+        etag = auth_client.get(url)["ETag"]
+        with django_assert_num_queries(1):
+            assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        task.title = "Renamed"
+        task.save()
+        updated = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert updated.status_code == 200
+
+        Task.objects.create(title="Two", owner=auth_client._user)
+        created = auth_client.get(url, HTTP_IF_NONE_MATCH=updated["ETag"])
+        assert created.status_code == 200
+
+    def test_cursor_page_etag_tracks_the_next_link(self, auth_client):
+        older = Task.objects.create(title="Older", owner=auth_client._user)
+        Task.objects.create(title="Newer", owner=auth_client._user)
+        url = "/api/tasks/?pagination=cursor&page_size=1"
+        etag = auth_client.get(url)["ETag"]
+        older.delete()
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["next"] is None
+
+    def test_list_etag_depends_on_query(self, auth_client):
+        Task.objects.create(title="One", owner=auth_client._user)
+        etag = auth_client.get("/api/tasks/")["ETag"]
+        response = auth_client.get("/api/tasks/?search=one", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert "Authorization" in response["Vary"]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("list_cache_enabled")
+class TestTaskListCache:
+    def test_repeat_request_is_served_from_cache(self, auth_client, django_assert_num_queries):
+        Task.objects.create(title="One", owner=auth_client._user)
+        first = auth_client.get("/api/tasks/?page_size=5")
+        assert first["X-Cache"] == "MISS"
+        with django_assert_num_queries(0):
+            second = auth_client.get("/api/tasks/?page_size=5")
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert second["ETag"] == first["ETag"]
+
+    def test_cached_page_answers_conditional_request(self, auth_client):
+        etag = auth_client.get("/api/tasks/")["ETag"]
+        response = auth_client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["X-Cache"] == "HIT"
+
+    def test_query_params_are_part_of_the_key(self, auth_client):
+        auth_client.get("/api/tasks/?completed=true&page_size=5")
+        assert auth_client.get("/api/tasks/?page_size=5&completed=true")["X-Cache"] == "HIT"
+        assert auth_client.get("/api/tasks/?completed=false")["X-Cache"] == "MISS"
+
+    def test_writes_invalidate_owner_and_admin_pages(self, admin_client, create_user):
+        owner = create_user(email="owner@example.com", username="owner")
+        admin_client.get("/api/tasks/")
+        assert admin_client.get("/api/tasks/")["X-Cache"] == "HIT"
+        task = Task.objects.create(title="New", owner=owner)
+        response = admin_client.get("/api/tasks/")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 1
+
+        task.delete()
+        response = admin_client.get("/api/tasks/")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 0
+
+    def test_bulk_writes_invalidate(self, auth_client):
+        auth_client.get("/api/tasks/")
+        auth_client.post("/api/tasks/bulk/", [{"title": "A"}, {"title": "B"}], format="json")
+        response = auth_client.get("/api/tasks/")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 2
+
+        task_id = response.data["results"][0]["id"]
+        auth_client.patch("/api/tasks/bulk/", [{"id": task_id, "completed": True}], format="json")
+        response = auth_client.get("/api/tasks/")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["completed"] is True
+
+    def test_other_owners_writes_keep_cache(self, auth_client, create_user):
+        auth_client.get("/api/tasks/")
+        Task.objects.create(title="Theirs", owner=create_user(email="o@example.com", username="o"))
+        assert auth_client.get("/api/tasks/")["X-Cache"] == "HIT"
+
+    def test_hit_miss_stats(self, auth_client):
+        list_cache.stats.reset()
+        auth_client.get("/api/tasks/")
+        auth_client.get("/api/tasks/")
+        assert list_cache.stats.snapshot() == {"hits": 1, "misses": 1}
+
+    def test_generation_bumped_elsewhere_invalidates(self, auth_client, settings, tmp_path):
+        # A file cache is shared between processes, like Redis. A second instance over the
+        # same directory stands in for another worker's (or the job worker's) connection.
+        location = str(tmp_path)
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}}
+        Task.objects.create(title="Mine", owner=auth_client._user)
+        auth_client.get("/api/tasks/")
+        assert auth_client.get("/api/tasks/")["X-Cache"] == "HIT"
+        other_process = FileBasedCache(location, {})
+        other_process.incr(list_cache.generation_key(list_cache.scope_for(auth_client._user)))
+        assert auth_client.get("/api/tasks/")["X-Cache"] == "MISS"
+
+    def test_warns_without_shared_cache(self, settings):
+        assert [warning.id for warning in list_cache.check_shared_cache(None)] == ["tasks.W001"]
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        assert list_cache.check_shared_cache(None) == []
+
+    def test_disabled_by_zero_timeout(self, auth_client, settings):
+        settings.TASK_LIST_CACHE_TIMEOUT = 0
+        response = auth_client.get("/api/tasks/")
+        assert response.status_code == 200
+        assert "X-Cache" not in response
+
+
+@pytest.mark.django_db
+class TestTaskFastSerialization:
+    """The fast read path must render byte-identical JSON to TaskSerializer."""
+
+    def _make_tasks(self, owner):
+        Task.objects.create(title="Plain", owner=owner)
+        Task.objects.create(title="Ünïcødé ✓", description="line\nbreak \"quoted\"", completed=True, owner=owner)
+        whole_second = Task.objects.create(title="No micros", owner=owner)
+        stamp = datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        Task.objects.filter(pk=whole_second.pk).update(created_at=stamp, updated_at=stamp)
+
+    def test_row_and_instance_parity(self, create_user):
+        self._make_tasks(create_user())
+        tasks = Task.objects.select_related("owner")
+        expected = JSONRenderer().render(TaskSerializer(tasks, many=True).data)
+        rows = task_rows_representation(tasks.values(*TASK_VALUE_FIELDS))
+        assert JSONRenderer().render(rows) == expected
+        assert JSONRenderer().render([task_representation(task) for task in tasks]) == expected
+
+    def test_endpoints_render_serializer_output(self, auth_client):
+        self._make_tasks(auth_client._user)
+        tasks = Task.objects.select_related("owner")
+        response = auth_client.get("/api/tasks/?page_size=100")
+        expected = TaskSerializer(tasks, many=True).data
+        assert JSONRenderer().render(response.data["results"]) == JSONRenderer().render(expected)
+
+        task = tasks.first()
+        response = auth_client.get(f"/api/tasks/{task.id}/")
+        assert response.content == JSONRenderer().render(TaskSerializer(task).data)
+
+
+@pytest.mark.django_db
+class TestTaskExport:
+    URL = "/api/tasks/export/"
+
+    def _body(self, response):
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_ndjson_export_matches_api_representation(self, auth_client, settings):
+        settings.TASK_EXPORT_CHUNK_SIZE = 2
+        for i in range(5):
+            Task.objects.create(title=f"Task {i}", completed=i % 2 == 0, owner=auth_client._user)
+        response = auth_client.get(self.URL)
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in self._body(response).splitlines()]
+        expected = json.loads(JSONRenderer().render(TaskSerializer(Task.objects.all(), many=True).data))
+        assert lines == expected
+
+    def test_csv_export(self, auth_client):
+        Task.objects.create(title="Comma, quoted", description='say "hi"', owner=auth_client._user)
+        response = auth_client.get(self.URL + "?format=csv")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        assert 'filename="tasks.csv"' in response["Content-Disposition"]
+        rows = list(csv.DictReader(io.StringIO(self._body(response))))
+        assert len(rows) == 1
+        assert rows[0]["title"] == "Comma, quoted"
+        assert rows[0]["description"] == 'say "hi"'
+        assert rows[0]["completed"] == "false"
+        assert rows[0]["owner"] == auth_client._user.email
+
+    def test_csv_by_accept_header(self, auth_client):
+        response = auth_client.get(self.URL, HTTP_ACCEPT="text/csv")
+        assert self._body(response).startswith("id,title,description")
+
+    def test_export_applies_filters_and_ownership(self, auth_client, create_user):
+        other = create_user(email="o@example.com", username="o")
+        Task.objects.create(title="Mine done", completed=True, owner=auth_client._user)
+        Task.objects.create(title="Mine open", owner=auth_client._user)
+        Task.objects.create(title="Theirs done", completed=True, owner=other)
+        body = self._body(auth_client.get(self.URL + "?completed=true"))
+        assert [json.loads(line)["title"] for line in body.splitlines()] == ["Mine done"]
+        body = self._body(auth_client.get(self.URL + "?search=open"))
+        assert [json.loads(line)["title"] for line in body.splitlines()] == ["Mine open"]
+
+    def test_admin_exports_everything(self, admin_client, create_user):
+        Task.objects.create(title="Theirs", owner=create_user())
+        body = self._body(admin_client.get(self.URL))
+        assert len(body.splitlines()) == 1
+
+    def test_export_requires_authentication(self, api_client):
+        assert api_client.get(self.URL).status_code == 401
+
+
+@pytest.mark.django_db
+class TestTaskImport:
+    URL = "/api/tasks/import/"
+
+    def _upload(self, client, name, content, **extra):
+        return client.post(self.URL, {"file": SimpleUploadedFile(name, content), **extra}, format="multipart")
+
+    def test_ndjson_import_reports_bad_rows(self, auth_client, settings):
+        settings.TASK_IMPORT_BATCH_SIZE = 2
+        content = b"\n".join([
+            b'{"title": "One"}',
+            b'{"title": "Two", "completed": true, "description": "d"}',
+            b"not json",
+            b'{"description": "missing title"}',
+            b"",
+            b'["not", "an", "object"]',
+            b'{"title": "Three"}',
+        ])
+        response = self._upload(auth_client, "tasks.ndjson", content)
+        assert response.status_code == 200
+        assert response.data["total"] == 6
+        assert response.data["created"] == 3
+        assert [e["row"] for e in response.data["errors"]] == [3, 4, 6]
+        assert "title" in response.data["errors"][1]["errors"]
+        assert set(Task.objects.filter(owner=auth_client._user).values_list("title", flat=True)) == {"One", "Two", "Three"}
+
+    def test_csv_import(self, auth_client):
+        content = b"title,description,completed\nFirst,,false\n\"Second, with comma\",note,true\n"
+        response = self._upload(auth_client, "tasks.csv", content)
+        assert response.data["created"] == 2
+        assert Task.objects.get(title="Second, with comma").completed is True
+
+    def test_export_then_import_round_trip(self, auth_client):
+        Task.objects.create(title="Exported", description="x", completed=True, owner=auth_client._user)
+        exported = b"".join(auth_client.get("/api/tasks/export/?format=csv").streaming_content)
+        response = self._upload(auth_client, "export.txt", exported, format="csv")
+        assert response.data["created"] == 1
+        assert Task.objects.filter(title="Exported", completed=True).count() == 2
+
+    @pytest.mark.parametrize("name, header, row", [("tasks.ndjson", b"", b'{"title": "Row %d"}'), ("tasks.csv", b"title\n", b"Row %d")])
+    def test_bad_bytes_only_fail_their_row(self, auth_client, settings, name, header, row):
+        settings.TASK_IMPORT_BATCH_SIZE = 20
+        good = [row % i for i in range(100)]
+        content = header + b"\n".join([*good[:50], b"bad \xff byte", *good[50:]]) + b"\n"
+        response = self._upload(auth_client, name, content)
+        assert response.data["total"] == 101
+        assert response.data["created"] == 100
+        assert [error["row"] for error in response.data["errors"]] == [51]
+        assert "UTF-8" in response.data["errors"][0]["errors"]["non_field_errors"][0]
+        assert Task.objects.filter(owner=auth_client._user).count() == 100
+
+    def test_utf8_bom_and_malformed_csv(self, auth_client):
+        # Past csv.field_size_limit(), the reader raises csv.Error for that record.
+        content = "\ufefftitle,description\nCafé,ok\nHuge,{}\nLast,ok\n".format("x" * 200_000).encode()
+        response = self._upload(auth_client, "tasks.csv", content)
+        assert response.data["created"] == 2
+        assert [error["row"] for error in response.data["errors"]] == [2]
+        assert Task.objects.filter(title="Café").exists()
+
+    def test_reported_errors_are_capped(self, auth_client, settings):
+        settings.TASK_IMPORT_MAX_REPORTED_ERRORS = 2
+        response = self._upload(auth_client, "bad.ndjson", b"{}\n" * 5)
+        assert response.data["failed"] == 5
+        assert len(response.data["errors"]) == 2
+        assert response.data["errors_truncated"] is True
+
+    def test_import_requires_file(self, auth_client):
+        assert auth_client.post(self.URL, {}, format="multipart").status_code == 400
+
+    def test_import_requires_authentication(self, api_client):
+        assert self._upload(api_client, "tasks.ndjson", b'{"title": "x"}').status_code == 401
+
+    def test_management_command(self, create_user, tmp_path, capsys):
+        user = create_user()
+        path = tmp_path / "tasks.csv"
+        path.write_text("title,completed\nFrom CLI,true\n,false\n")
+        call_command("import_tasks", str(path), owner=user.email, batch_size=1)
+        out = capsys.readouterr()
+        assert "Imported 1 of 2 rows (1 failed)." in out.out
+        assert "row 2" in out.err
+        assert Task.objects.filter(owner=user, title="From CLI", completed=True).exists()
+
+
+@pytest.mark.django_db
+class TestTaskCounters:
+    def _counts(self, user):
+        return counters.counts_for(user.pk)
+
+    def test_single_row_writes(self, create_user):
+        user = create_user()
+        task = Task.objects.create(title="One", owner=user)
+        Task.objects.create(title="Two", completed=True, owner=user)
+        assert self._counts(user) == {"open": 1, "completed": 1, "total": 2}
+        task.completed = True
+        task.save()
+        assert self._counts(user) == {"open": 0, "completed": 2, "total": 2}
+        task.delete()
+        assert self._counts(user) == {"open": 0, "completed": 1, "total": 1}
+
+    def test_bulk_and_queryset_writes(self, create_user):
+        user, other = create_user(), create_user(email="o@example.com", username="o")
+        Task.objects.bulk_create([Task(title=f"T{i}", owner=user) for i in range(5)])
+        Task.objects.filter(owner=user).update(completed=True)
+        Task.objects.filter(pk__in=Task.objects.filter(owner=user).values("pk")[:2]).update(owner=other)
+        assert self._counts(user) == {"open": 0, "completed": 3, "total": 3}
+        assert self._counts(other) == {"open": 0, "completed": 2, "total": 2}
+        Task.objects.filter(owner=user).delete()
+        assert self._counts(user)["total"] == 0
+        assert not counters.find_drift()
+
+    def test_unrelated_updates_leave_counters_alone(self, create_user):
+        user = create_user()
+        task = Task.objects.create(title="One", owner=user)
+        Task.objects.filter(pk=task.pk).update(title="Renamed")
+        assert self._counts(user) == {"open": 1, "completed": 0, "total": 1}
+
+    def test_user_deletion_cascades(self, create_user):
+        user = create_user()
+        Task.objects.create(title="One", owner=user)
+        user.delete()
+        assert not TaskCounter.objects.exists()
+        assert not counters.find_drift()
+
+    def test_stats_endpoint(self, auth_client, create_user):
+        Task.objects.create(title="Mine", owner=auth_client._user)
+        Task.objects.create(title="Mine done", completed=True, owner=auth_client._user)
+        Task.objects.create(title="Theirs", owner=create_user(email="o@example.com", username="o"))
+        response = auth_client.get("/api/tasks/stats/")
+        assert response.status_code == 200
+        assert response.data == {"open": 1, "completed": 1, "total": 2}
+
+    def test_stats_without_tasks(self, auth_client):
+        assert auth_client.get("/api/tasks/stats/").data == {"open": 0, "completed": 0, "total": 0}
+
+    def test_stats_requires_authentication(self, api_client):
+        assert api_client.get("/api/tasks/stats/").status_code == 401
+
+    def test_admin_aggregate(self, admin_client, create_tasks):
+        tasks = create_tasks(count=6, owners=3)
+        Task.objects.filter(pk=tasks[0].pk).update(completed=True)
+        response = admin_client.get("/api/tasks/stats/all/")
+        assert response.status_code == 200
+        assert response.data == {"open": 5, "completed": 1, "total": 6, "owners": 3}
+
+    def test_admin_aggregate_is_admin_only(self, auth_client):
+        assert auth_client.get("/api/tasks/stats/all/").status_code == 403
+
+    def test_rebuild_command_repairs_drift(self, create_user, capsys):
+        user = create_user()
+        Task.objects.create(title="One", owner=user)
+        TaskCounter.objects.filter(owner=user).update(open_count=7)
+        with pytest.raises(CommandError, match="1 owner"):
+            call_command("rebuild_task_counters", check=True)
+        assert f"owner {user.pk}: stored 7 open" in capsys.readouterr().err
+        call_command("rebuild_task_counters")
+        assert "fixed 1 owner(s)" in capsys.readouterr().out
+        assert self._counts(user) == {"open": 1, "completed": 0, "total": 1}
+        call_command("rebuild_task_counters", check=True)
+        assert "match" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestTaskChangeFeed:
+    URL = "/api/tasks/changes/"
+
+    def _token(self, client):
+        response = client.get(self.URL)
+        assert response.status_code == 200
+        assert response.data["changes"] == [] and response.data["deleted"] == []
+        return response.data["sync_token"]
+
+    def test_reports_creates_updates_and_deletes(self, auth_client):
+        kept = Task.objects.create(title="Kept", owner=auth_client._user)
+        removed = Task.objects.create(title="Removed", owner=auth_client._user)
+        token = self._token(auth_client)
+        assert auth_client.get(self.URL, {"since": token}).data["changes"] == []
+
+        created = auth_client.post("/api/tasks/", {"title": "New"}, format="json").data
+        auth_client.patch(f"/api/tasks/{kept.pk}/", {"completed": True}, format="json")
+        auth_client.delete(f"/api/tasks/{removed.pk}/")
+        response = auth_client.get(self.URL, {"since": token})
+        assert response.status_code == 200
+        assert {task["id"]: task["completed"] for task in response.data["changes"]} == {kept.pk: True, created["id"]: False}
+        assert response.data["deleted"] == [removed.pk]
+        assert response.data["has_more"] is False
+
+        again = auth_client.get(self.URL, {"since": response.data["sync_token"]}).data
+        assert again["changes"] == [] and again["deleted"] == []
+        assert again["sync_token"] == response.data["sync_token"]
+
+    def test_bulk_and_queryset_writes_are_recorded(self, auth_client):
+        token = self._token(auth_client)
+        Task.objects.bulk_create([Task(title=f"T{i}", owner=auth_client._user) for i in range(3)])
+        Task.objects.filter(owner=auth_client._user).update(completed=True)
+        data = auth_client.get(self.URL, {"since": token}).data
+        assert len(data["changes"]) == 3
+        assert all(task["completed"] for task in data["changes"])
+
+    def test_scoped_to_owner(self, auth_client, create_user):
+        other = create_user(email="o@example.com", username="o")
+        token = self._token(auth_client)
+        theirs = Task.objects.create(title="Theirs", owner=other)
+        mine = Task.objects.create(title="Mine", owner=auth_client._user)
+        data = auth_client.get(self.URL, {"since": token}).data
+        assert [task["id"] for task in data["changes"]] == [mine.pk]
+
+        token = data["sync_token"]
+        Task.objects.filter(pk=mine.pk).update(owner=other)
+        Task.objects.filter(pk=theirs.pk).update(title="Still theirs")
+        data = auth_client.get(self.URL, {"since": token}).data
+        assert data["changes"] == []
+        assert data["deleted"] == [mine.pk]
+
+    def test_admin_sees_every_owner(self, admin_client, create_user):
+        token = self._token(admin_client)
+        task = Task.objects.create(title="Theirs", owner=create_user())
+        Task.objects.filter(pk=task.pk).update(owner=admin_client._user)
+        data = admin_client.get(self.URL, {"since": token}).data
+        assert [t["id"] for t in data["changes"]] == [task.pk]
+        assert data["deleted"] == []
+
+    def test_paging_with_limit(self, auth_client):
+        token = self._token(auth_client)
+        tasks = [Task.objects.create(title=f"T{i}", owner=auth_client._user) for i in range(5)]
+        seen = []
+        while True:
+            data = auth_client.get(self.URL, {"since": token, "limit": 2}).data
+            seen.extend(task["id"] for task in data["changes"])
+            token = data["sync_token"]
+            if not data["has_more"]:
+                break
+        assert seen == [task.pk for task in tasks]
+
+    def test_invalid_token(self, auth_client):
+        for token in ("abc", "1", "1.-2"):
+            response = auth_client.get(self.URL, {"since": token})
+            assert response.status_code == 400
+            assert "since" in response.data
+
+    def test_requires_authentication(self, api_client):
+        assert api_client.get(self.URL).status_code == 401
+
+    def test_compaction_keeps_latest_entries(self, auth_client):
+        token = self._token(auth_client)
+        task = Task.objects.create(title="One", owner=auth_client._user)
+        for i in range(3):
+            Task.objects.filter(pk=task.pk).update(title=f"Edit {i}")
+        assert TaskChange.objects.filter(task_id=task.pk).count() == 4
+        call_command("compact_task_changes")
+        assert TaskChange.objects.filter(task_id=task.pk).count() == 1
+        data = auth_client.get(self.URL, {"since": token}).data
+        assert [t["title"] for t in data["changes"]] == ["Edit 2"]
+
+
+@pytest.mark.django_db
+class TestTaskAnalytics:
+    URL = "/api/tasks/analytics/"
+    DAY = datetime.date(2026, 3, 10)
+
+    def _at(self, day, hours=0):
+        return datetime.datetime.combine(day, datetime.time(9), tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=hours)
+
+    def _task(self, owner, created, updated=None, completed=False):
+        task = Task.objects.create(title="T", owner=owner, completed=completed)
+        Task.objects.filter(pk=task.pk).update(created_at=created, updated_at=updated or created)
+        return task
+
+    def _report(self, first=None, last=None, users=50):
+        return analytics.report(first or self.DAY, last or self.DAY + datetime.timedelta(days=2), users=users)
+
+    def test_backfill_counts_created_completed_and_completion_time(self, create_user):
+        user, other = create_user(), create_user(email="o@example.com", username="o")
+        next_day = self.DAY + datetime.timedelta(days=1)
+        self._task(user, self._at(self.DAY))
+        self._task(user, self._at(self.DAY), self._at(self.DAY, hours=0.5), completed=True)
+        self._task(user, self._at(self.DAY), self._at(next_day, hours=-1), completed=True)
+        self._task(other, self._at(self.DAY, hours=-24 * 40), self._at(next_day), completed=True)
+
+        analytics.backfill()
+        report = self._report()
+        assert report["totals"] == {"created": 3, "completed": 3}
+        assert report["per_day"][:2] == [
+            {"day": self.DAY, "created": 3, "completed": 1},
+            {"day": next_day, "created": 0, "completed": 2},
+        ]
+        assert report["per_day"][2]["created"] == 0
+        assert report["per_user"][0] == {"owner_id": user.pk, "owner": user.email, "created": 3, "completed": 2}
+        assert report["per_user"][1]["owner_id"] == other.pk
+        assert {entry["bucket"]: entry["count"] for entry in report["completion_time"]} == {
+            "within_hour": 1, "within_day": 1, "within_week": 0, "within_month": 0, "after_month": 1,
+        }
+
+    def test_refresh_recomputes_only_touched_days(self, create_user):
+        user = create_user()
+        old = self._task(user, self._at(self.DAY))
+        analytics.refresh()
+        assert self._report()["totals"] == {"created": 1, "completed": 0}
+
+        # Completing an old task counts on today's row and leaves its created day intact.
+        old.refresh_from_db()
+        old.completed = True
+        old.save()
+        Task.objects.create(title="New", owner=user)
+        days = analytics.refresh()
+        today = timezone.now().date()
+        assert days == [self.DAY, today]
+        assert self._report()["totals"] == {"created": 1, "completed": 0}
+        assert analytics.report(today, today)["totals"] == {"created": 1, "completed": 1}
+
+    def test_refresh_drops_deleted_tasks_from_touched_days(self, create_user):
+        user = create_user()
+        gone = self._task(user, self._at(self.DAY))
+        kept = self._task(user, self._at(self.DAY))
+        analytics.refresh()
+        gone.delete()
+        assert self.DAY in analytics.refresh()
+        assert TaskDailyRollup.objects.get(day=self.DAY).created == 1
+        Task.objects.filter(pk=kept.pk).delete()
+        analytics.refresh()
+        assert not TaskDailyRollup.objects.filter(day=self.DAY).exists()
+
+    def test_completed_task_edited_later_moves_to_its_new_day(self, create_user):
+        user = create_user()
+        task = self._task(user, self._at(self.DAY), self._at(self.DAY, hours=2), completed=True)
+        analytics.refresh()
+        assert self._report()["totals"] == {"created": 1, "completed": 1}
+
+        task.refresh_from_db()
+        task.title = "Edited"
+        task.save()
+        analytics.refresh()
+        today = timezone.now().date()
+        assert self._report()["per_day"][0] == {"day": self.DAY, "created": 1, "completed": 0}
+        assert analytics.report(self.DAY, today)["totals"] == {"created": 1, "completed": 1}
+
+    def test_backfill_matches_incremental_refreshes(self, create_user):
+        user = create_user()
+        analytics.refresh()
+        for hours in (0, 5, 30, 60):
+            self._task(user, self._at(self.DAY, hours=hours), timezone.now(), completed=hours % 2 == 0)
+        analytics.refresh()
+        fields = ("day", "owner_id", *analytics.COUNT_FIELDS)
+        incremental = list(TaskDailyRollup.objects.order_by("day").values_list(*fields))
+        call_command("backfill_task_rollups", stdout=io.StringIO())
+        assert list(TaskDailyRollup.objects.order_by("day").values_list(*fields)) == incremental
+
+    def test_backfill_command_range_and_incremental(self, create_user):
+        user = create_user()
+        self._task(user, self._at(self.DAY))
+        self._task(user, self._at(self.DAY + datetime.timedelta(days=5)))
+        out = io.StringIO()
+        call_command("backfill_task_rollups", since=str(self.DAY), until=str(self.DAY), stdout=out)
+        assert "wrote 1 row(s)" in out.getvalue()
+        assert list(TaskDailyRollup.objects.values_list("day", flat=True)) == [self.DAY]
+        out = io.StringIO()
+        call_command("backfill_task_rollups", incremental=True, stdout=out)
+        # Today: `_task` moved the tasks' created_at off it, which marks it stale.
+        assert "Refreshed 1 day(s)" in out.getvalue()
+        assert list(TaskDailyRollup.objects.values_list("day", flat=True)) == [self.DAY]
+        with pytest.raises(CommandError):
+            call_command("backfill_task_rollups", since="2026-03-10", until="2026-03-01")
+
+    def test_endpoint_queues_refresh_for_stale_rollups(self, admin_client, create_user, settings):
+        settings.TASK_ANALYTICS_REFRESH_INTERVAL = 0
+        today = timezone.now().date()
+        Task.objects.create(title="T", owner=create_user(), completed=True)
+        response = admin_client.get(self.URL)
+        assert response.status_code == 200
+        assert response.data["since"] == today - datetime.timedelta(days=29)
+        assert len(response.data["per_day"]) == 30
+        # The request only reads; the refresh runs in the background.
+        assert response.data["totals"] == {"created": 0, "completed": 0}
+        assert response.data["refreshed_through"] is None
+        assert not TaskDailyRollup.objects.exists()
+        admin_client.get(self.URL)
+        assert Job.objects.filter(kind="tasks.refresh_rollups", status=Job.QUEUED).count() == 1
+
+        call_command("run_jobs", once=True)
+        response = admin_client.get(self.URL)
+        assert response.data["totals"] == {"created": 1, "completed": 1}
+        assert response.data["refreshed_through"] is not None
+
+        Task.objects.create(title="T2", owner=create_user(email="x@example.com", username="x"))
+        assert admin_client.get(self.URL).data["totals"]["created"] == 1
+        call_command("run_jobs", once=True)
+        assert admin_client.get(self.URL).data["totals"]["created"] == 2
+
+    def test_endpoint_serves_fresh_rollups_without_refreshing(self, admin_client, create_user, settings):
+        settings.TASK_ANALYTICS_REFRESH_INTERVAL = 3600
+        user = create_user()
+        Task.objects.create(title="T", owner=user)
+        analytics.refresh()
+        Task.objects.create(title="Not yet", owner=user)
+        assert admin_client.get(self.URL).data["totals"]["created"] == 1
+        assert not Job.objects.exists()
+
+    def test_endpoint_validates_range(self, admin_client, settings):
+        assert admin_client.get(self.URL, {"since": "2026-03-10", "until": "2026-03-01"}).status_code == 400
+        settings.TASK_ANALYTICS_MAX_DAYS = 7
+        assert admin_client.get(self.URL, {"since": "2026-03-01", "until": "2026-03-10"}).status_code == 400
+        response = admin_client.get(self.URL, {"since": "2026-03-01", "until": "2026-03-07", "users": 0})
+        assert response.status_code == 200
+        assert len(response.data["per_day"]) == 7
+        assert response.data["per_user"] == []
+
+    def test_endpoint_is_admin_only(self, auth_client):
+        assert auth_client.get(self.URL).status_code == 403
@@ -0,0 +1,165 @@
+import pytest
+
+from task_manager import throttling
+from task_manager.middleware import in_flight
+from task_manager.throttling import LocalTokenBuckets, parse_rate
+
+
+@pytest.fixture
+def rates(settings):
+    """Replace the throttle rates for one test: `rates(user="2/min")`."""
+    def set_rates(**scopes):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {**settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], **scopes},
+        }
+    return set_rates
+
+
+def login(client, email="user@example.com", password="wrong", ip="10.0.0.1"):
+    return client.post("/api/auth/login/", {"email": email, "password": password}, format="json", REMOTE_ADDR=ip)
+
+
+class TestTokenBucket:
+    def test_parse_rate(self):
+        assert parse_rate("600/min") == (600, 10.0)
+        assert parse_rate("10/hour burst 2") == (2, 10 / 3600)
+        for rate in ("600", "10/fortnight", "ten/min", "5/min burst"):
+            with pytest.raises(ValueError):
+                parse_rate(rate)
+
+    def test_burst_then_refill(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(throttling.time, "monotonic", lambda: now[0])
+        buckets = LocalTokenBuckets()
+        assert [buckets.take("k", 3, 1.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert buckets.take("k", 3, 1.0) == pytest.approx(1.0)
+        now[0] += 0.5
+        assert buckets.take("k", 3, 1.0) == pytest.approx(0.5)
+        now[0] += 0.5
+        assert buckets.take("k", 3, 1.0) == 0.0
+        # Refills never exceed the burst size.
+        now[0] += 60
+        assert [buckets.take("k", 3, 1.0) for _ in range(4)][-1] > 0
+        assert buckets.take("other", 3, 1.0) == 0.0
+
+    def test_least_recently_used_keys_are_dropped(self):
+        buckets = LocalTokenBuckets(max_keys=2)
+        for key in ("a", "b", "c"):
+            buckets.take(key, 1, 0.001)
+        assert buckets.take("a", 1, 0.001) == 0.0
+        assert buckets.take("c", 1, 0.001) > 0
+
+
+@pytest.mark.django_db
+class TestThrottles:
+    def test_login_is_limited_per_ip(self, api_client, create_user, rates):
+        create_user()
+        rates(login="3/min")
+        assert [login(api_client, email=f"u{i}@example.com").status_code for i in range(3)] == [401] * 3
+        response = login(api_client, password="strongpass123")
+        assert response.status_code == 429
+        assert int(response["Retry-After"]) >= 1
+        assert login(api_client, password="strongpass123", ip="10.0.0.2").status_code == 200
+
+    def test_login_is_limited_per_account(self, api_client, create_user, rates):
+        create_user()
+        rates(login_account="2/min")
+        assert login(api_client, ip="10.0.0.1").status_code == 401
+        assert login(api_client, email=" USER@example.com", ip="10.0.0.2").status_code == 401
+        assert login(api_client, ip="10.0.0.3").status_code == 429
+        assert login(api_client, email="other@example.com", ip="10.0.0.3").status_code == 401
+
+    def test_forwarded_for_is_ignored_without_proxies(self, api_client, rates):
+        rates(login="1/min")
+        login(api_client)
+        response = api_client.post(
+            "/api/auth/login/", {"email": "x@example.com", "password": "x"}, format="json",
+            REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.7",
+        )
+        assert response.status_code == 429
+
+    def test_register_is_limited_per_ip(self, api_client, rates):
+        rates(register="1/hour")
+        payload = {"username": "new", "email": "new@example.com", "password": "strongpass123"}
+        assert api_client.post("/api/auth/register/", payload, format="json").status_code == 201
+        payload = {"username": "new2", "email": "new2@example.com", "password": "strongpass123"}
+        assert api_client.post("/api/auth/register/", payload, format="json").status_code == 429
+
+    def test_authenticated_requests_are_limited_per_user(self, auth_client, api_client, create_admin, rates):
+        rates(user="2/min")
+        assert [auth_client.get("/api/tasks/").status_code for _ in range(3)] == [200, 200, 429]
+        # Another user has a bucket of their own.
+        create_admin()
+        token = login(api_client, email="admin@example.com", password="adminpass123", ip="10.0.0.9").data["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert api_client.get("/api/tasks/").status_code == 200
+
+    def test_anonymous_requests_are_limited_per_ip(self, api_client, rates):
+        # Protected endpoints answer anonymous requests with 401 before throttling;
+        # the anon scope covers the public ones.
+        rates(anon="2/min")
+        assert [api_client.get("/api/schema.json").status_code for _ in range(3)] == [200, 200, 429]
+
+    def test_can_be_disabled(self, auth_client, rates, settings):
+        rates(user="1/min")
+        settings.THROTTLE_ENABLED = False
+        assert [auth_client.get("/api/tasks/").status_code for _ in range(3)] == [200] * 3
+
+    def test_async_login_is_limited(self, async_client, rates):
+        rates(login="1/min")
+        payload = {"email": "user@example.com", "password": "wrong"}
+        assert async_client("post", "/api/async/auth/login/", payload).status_code == 401
+        response = async_client("post", "/api/async/auth/login/", payload)
+        assert response.status_code == 429
+        assert int(response["Retry-After"]) >= 1
+
+    def test_throttled_requests_are_counted(self, auth_client, rates):
+        rates(user="1/min")
+        before = throttling.stats.snapshot().get("user", 0)
+        auth_client.get("/api/tasks/")
+        auth_client.get("/api/tasks/")
+        assert throttling.stats.snapshot()["user"] == before + 1
+        assert any(line.startswith('http_requests_throttled_total{scope="user"}') for line in throttling.metrics_lines())
+
+
+@pytest.mark.django_db
+class TestLoadShedding:
+    @pytest.fixture
+    def busy(self, settings):
+        settings.LOAD_SHED_MAX_IN_FLIGHT = 1
+        # Another request is being handled.
+        assert in_flight.enter(1)
+        yield
+        in_flight.leave()
+
+    def test_sheds_past_the_limit(self, auth_client, busy):
+        response = auth_client.get("/api/tasks/")
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"
+        assert response.json() == {"detail": "The server is busy. Please retry shortly."}
+
+    def test_metrics_are_exempt(self, admin_client, settings):
+        settings.LOAD_SHED_MAX_IN_FLIGHT = 1
+        assert in_flight.enter(1)
+        try:
+            response = admin_client.get("/api/metrics/")
+        finally:
+            in_flight.leave()
+        assert response.status_code == 200
+        assert "http_requests_in_flight 1" in response.content.decode()
+        assert "http_requests_shed_total" in response.content.decode()
+
+    def test_serves_again_once_requests_finish(self, auth_client, settings):
+        settings.LOAD_SHED_MAX_IN_FLIGHT = 1
+        assert [auth_client.get("/api/tasks/").status_code for _ in range(3)] == [200] * 3
+        assert in_flight.current == 0
+
+    def test_zero_disables(self, auth_client, busy, settings):
+        settings.LOAD_SHED_MAX_IN_FLIGHT = 0
+        assert auth_client.get("/api/tasks/").status_code == 200
+
+    def test_async_requests_are_shed(self, async_client, busy):
+        response = async_client("get", "/api/async/tasks/")
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"